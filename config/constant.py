@@ -56,10 +56,9 @@ CREDENTIALS = {
         "invalid_voucher": "abc",
     },
     "image_url": "https://picsum.photos/200/300",
-    "BO_base_url": "https://staging.sosyokmy.com/whitelabel-staging-2/public",
+    "BO_base_url": BO_base_url,
     "image_path": "test_deposit.jpg",
     "BO_testing_url": "https://staging.sosyokmy.com/whitelabel-test/public",
-    "BO_base_url": "https://staging.sosyokmy.com/whitelabel-staging-2/public",
     "Get4dHistory": "{BO_base_url}/api/user-4d-records-history",
     "Add4dCards": "{BO_base_url}/api/qa-redeem-fourd-card",
     "Bet4d": "{BO_base_url}/api/qa-bet-fourd",
@@ -621,3 +620,327 @@ LIVE_AGENT_URL = {
 }
 
 FOUR_D_PRIZES = [3400, 1200, 600, 210, 80]
+
+BROWSER_POOL = {
+    "enabled": True,
+    "max_idle": 1,
+    "max_leases": 50,
+}
+
+WAIT_SETTINGS = {
+    "dom_quiet_ms": 300,
+    "stable_ms": 150,
+    "poll_interval": 0.1,
+    "default_timeout": 10,
+}
+
+HTTP_CLIENT = {
+    "pool_connections": 10,
+    "pool_maxsize": 25,
+    "max_retries": 3,
+    "backoff_factor": 1,
+    # Only statuses that mean the request was never processed; a 500/504/524 may arrive after the change was made
+    "status_forcelist": [429, 503],
+    # GETs and QA hooks that change data. They are never re-sent once the request went out (read errors, timeouts,
+    # error statuses), only when the connection could not be made, so an approval or bet is never applied twice
+    "no_retry_paths": [
+        "/api/recharge/approve",
+        "/api/recharge/refuse",
+        "/api/recharge/process",
+        "/api/withdraw/approve",
+        "/api/withdraw/refuse",
+        "/api/withdraw/process",
+        "/api/qa-generate-user",
+        "/api/qa-calculate-rebate",
+        "/api/qa-approve-rebate",
+        "/api/qa-redeem-fourd-card",
+        "/api/qa-bet-fourd",
+        "/api/qa-update-bet-result",
+        "/api/simulate-game-records",
+        "/api/simulate-checkin",
+        "/api/simulate-daily-mission",
+        "/api/modify-turnover",
+    ],
+    "default_timeout": 30,
+    "timeouts": {
+        "/api/v2/login": 15,
+        "/api/recharge": 60,
+        "/api/qa-generate-user": 120,
+        "/api/qa-calculate-rebate": 120,
+        "/api/simulate-game-records": 60,
+    },
+}
+
+TOKEN_CACHE = {
+    "enabled": True,
+    "path": ".cache/auth_tokens.json",
+    "default_ttl": 3600,
+    "refresh_margin": 300,
+}
+
+ACCOUNT_POOL = {
+    "enabled": True,
+    "path": ".cache/account_pool.db",
+    "max_age_days": 7,
+    "lease_history_days": 3,
+    # Tops the pool up to targets before each run; only the shortfall is created, so a full pool costs one query
+    "prefill_on_start": True,
+    "provision_workers": 4,
+    "targets": {
+        "fresh": 20,
+        "deposited": 10,
+        "promo": 5,
+        "vip": 2,
+    },
+    "deposit_amount": (5001, 10000),
+    "vip_level": 1,
+}
+
+SCHEDULER = {
+    "workers": 4,
+    "default_duration": 60,
+    "poll_interval": 5,
+}
+
+TIMING = {
+    "enabled": True,
+    "path": ".cache/test_durations.db",
+    "history_runs": 5,
+    "regression_ratio": 1.5,
+    "regression_min_seconds": 10,
+    "helper_window_days": 14,
+}
+
+APPROVAL_BATCH = {
+    "max_batch_size": 50,
+}
+
+TRANSFER_ENGINE = {
+    "concurrency": 8,
+}
+
+SESSION_LOGIN = {
+    # Off until storage_keys/cookie_names are checked against the web app (DevTools > Application after a form
+    # login); with the wrong keys every login pays an extra page load before falling back to the form
+    "enabled": False,
+    # Where the web app keeps its bearer token; the token from /api/v2/login is written to each of these
+    "storage_keys": ["token"],
+    "cookie_names": ["token"],
+}
+
+POPUP_DISMISSER = {
+    "enabled": True,
+    # name -> CSS selector of the close button the watcher clicks as soon as it renders
+    "rules": {
+        "announcement": "#announcement-close-button",
+        "daily_checkin": "[role='presentation']:has(#check-in-button) #close-modal-button",
+        "daily_mission": "#not-yet-check-in-close",
+    },
+}
+
+PROFILER = {
+    # Opt-in: records every WebDriver wire command with its duration and the BaseTest helper that sent it
+    "enabled": False,
+    "top_helpers": 5,
+}
+
+TRACING = {
+    # Spans around BaseTest/TestInit/TransferBase helpers, HTTP calls and sleeps, written per test; needs TIMING
+    "enabled": False,
+    "directory": "test_results/traces",
+    # "chrome" -> <test>_<language>_<browser>_<run>.trace.json (chrome://tracing, Perfetto); "collapsed" -> .folded
+    # (flamegraph.pl)
+    "formats": ["chrome", "collapsed"],
+}
+
+LOGGING = {
+    "default_level": "INFO",
+    # Longer messages (payload and response dumps) are cut on the writer thread
+    "max_message_chars": 2000,
+    # Logger name prefix -> level. Test loggers are named after their class (e.g. "TestInit_firefox_bm"),
+    # module loggers after their module (e.g. "utils.http_client")
+    "levels": {
+        "TestInit": "INFO",
+        "utils.http_client": "INFO",
+    },
+}
+
+REFERENCE_CACHE = {
+    # Catalog endpoints fetched once per run and shared by all workers (see BaseTest.cached_reference)
+    "enabled": True,
+    "path": ".cache/reference_data.db",
+    "default_ttl": 900,
+    # Catalog name -> TTL in seconds
+    "ttl": {
+        "vip_levels": 1800,
+        "rebate_percentages": 900,
+        "promotions": 600,
+        "wheel_probabilities": 600,
+        "wheel_tnc": 3600,
+        "gifts": 300,
+        "contact_us": 3600,
+        "leaderboard_tnc": 3600,
+    },
+}
+
+FIXTURES = {
+    # Images loaded once per process (see utils/fixtures.py); downloads are kept here for later workers and runs
+    "directory": ".cache/fixtures",
+    "images": {
+        # Deposit receipts for the recharge API; falls back to a generated PNG when offline
+        "receipt": {
+            "urls": [CREDENTIALS["image_url"], PROFILE_URL["replace_image_url"]],
+            "filename": CREDENTIALS["image_path"],
+            "content_type": "image/jpeg",
+        },
+        "gallery_valid": {"urls": [PROFILE_URL["valid_image_url"]], "fallback": False},
+        "gallery_replace": {"urls": [PROFILE_URL["replace_image_url"]], "fallback": False},
+        "gallery_large": {"urls": [PROFILE_URL["large_image_url"]], "fallback": False},
+    },
+}
+
+LOAD_TEST = {
+    # Opt-in: TestSpamDeposit.test_deposit_load drives register/login/deposit journeys at an open-loop rate
+    "enabled": False,
+    # Arrivals per second at steady state, and the phase lengths in seconds
+    "rate": 5,
+    "ramp_up": 30,
+    "steady": 120,
+    "ramp_down": 30,
+    # "poisson" (random gaps) or "uniform" (evenly spaced)
+    "arrivals": "poisson",
+    # Journeys running at once; later arrivals wait for a slot and the wait counts as latency
+    "max_in_flight": 200,
+    "percentiles": [50, 95, 99],
+}
+
+SCENARIOS = {
+    # Opt-in: TestWalletLoad.test_mixed_workload replays weighted user journeys (see utils/scenarios.py)
+    "enabled": False,
+    # Users started evenly over ramp_up seconds; each runs journeys back to back until duration is up
+    "population": 50,
+    "ramp_up": 60,
+    "duration": 600,
+    # Seconds a user waits between two actions, [min, max]
+    "think_time": [2, 8],
+    "percentiles": [50, 95, 99],
+    # Amount ranges of the wallet actions, in RM
+    "deposit_amount": [30, 2000],
+    "transfer_amount": [10, 200],
+    "withdraw_amount": [50, 300],
+    # Journey -> weight, first state and {state: {next state: weight}}; "end" finishes the journey.
+    # login registers first when the user has no account yet, so every journey may start there
+    "journeys": {
+        "new_player": {
+            "weight": 15,
+            "start": "register",
+            "transitions": {
+                "register": {"login": 1},
+                "login": {"deposit": 7, "checkin": 2, "end": 1},
+                "deposit": {"approve": 1},
+                "approve": {"transfer": 1},
+                "checkin": {"end": 1},
+            },
+        },
+        "slots_player": {
+            "weight": 45,
+            "start": "login",
+            "transitions": {
+                "login": {"transfer": 6, "deposit": 3, "mission": 1},
+                "deposit": {"approve": 1},
+                "approve": {"transfer": 1},
+                "transfer": {"transfer": 4, "withdraw": 1, "end": 5},
+                "withdraw": {"approve_withdraw": 1},
+                "mission": {"transfer": 1},
+            },
+        },
+        "lotto_player": {
+            "weight": 20,
+            "start": "login",
+            "transitions": {
+                "login": {"bet_4d": 7, "deposit": 3},
+                "deposit": {"approve": 1},
+                "approve": {"bet_4d": 1},
+                "bet_4d": {"bet_4d": 4, "end": 6},
+            },
+        },
+        "casual": {
+            "weight": 20,
+            "start": "login",
+            "transitions": {
+                "login": {"checkin": 6, "mission": 4},
+                "checkin": {"mission": 5, "end": 5},
+                "mission": {"end": 1},
+            },
+        },
+    },
+}
+
+CASSETTE = {
+    # "record" saves every back-office request/response (see utils/cassette.py), "replay" answers from the
+    # recordings without touching the network, "off" disables both
+    "mode": "off",
+    "path": ".cache/cassettes/back_office.db",
+    # Replay delay as a fraction of the recorded response time: 0 answers at once, 1 reproduces staging timing
+    "replay_timing": 0,
+    # In replay, send requests that were never recorded to the network instead of failing them
+    "allow_passthrough": False,
+    # Query parameters that do not change the response and are left out of matching
+    "ignore_params": ["refresh", "_"],
+    # Headers that change the response (lower case) and are part of matching
+    "match_headers": ["language"],
+}
+
+API_LATENCY = {
+    # Every call through utils/http_client.py goes into a per-endpoint histogram (see utils/latency.py);
+    # run_tests logs the merged numbers and writes test_results/api_latency_<language>_<browser>.xlsx
+    "enabled": True,
+    "path": ".cache/api_latency.db",
+    "history_days": 7,
+    "percentiles": [50, 90, 95, 99],
+    # Endpoint ("METHOD /api/path", ids as {id}) -> limits in ms for "pNN" or "max"; a breach marks the run degraded
+    "slo": {
+        "POST /api/v2/login": {"p95": 2000},
+        "GET /api/user": {"p95": 1500},
+        "GET /api/transfers": {"p95": 2500},
+        "POST /api/transfers": {"p95": 3000},
+        "POST /api/recharge": {"p95": 5000},
+        "GET /api/recharge/approve": {"p95": 5000},
+        "POST /api/withdraw": {"p95": 5000},
+    },
+    # Endpoints called fewer times than this in a run are not judged
+    "min_samples": 20,
+}
+
+STANDIN = {
+    # Opt-in: a local, stateful stand-in for the back-office API (utils/standin.py). main.py starts it, every
+    # API helper is pointed at it and only API-only suites run, since the web app itself still talks to staging
+    "enabled": False,
+    "host": "127.0.0.1",
+    "port": 8765,
+    # Users, wallets and tokens survive restarts, so pooled accounts and cached tokens stay valid
+    "state_path": ".cache/standin_state.json",
+    # Seconds between saves of changed state, so an interrupted run keeps the accounts it registered
+    "save_interval": 5,
+    # Transfers to these providers fail, like a provider under maintenance
+    "maintenance_providers": [32],
+    # Injected delay in milliseconds, [min, max]; routes are path prefixes, the longest match wins
+    "latency": {
+        "default": [20, 80],
+        "routes": {
+            "/api/v2/login": [80, 200],
+            "/api/recharge": [150, 400],
+            "/api/transfers": [50, 150],
+            "/api/qa-generate-user": [500, 1500],
+            "/api/qa-calculate-rebate": [500, 1500],
+        },
+    },
+}
+
+if STANDIN["enabled"]:
+    API_URL = BO_base_url = CREDENTIALS["BO_base_url"] = f"http://{STANDIN['host']}:{STANDIN['port']}"
+
+# Resolve {BO_base_url} in the URL templates once; helpers only fill in their own placeholders
+for _name, _value in CREDENTIALS.items():
+    if isinstance(_value, str):
+        CREDENTIALS[_name] = _value.replace("{BO_base_url}", CREDENTIALS["BO_base_url"])
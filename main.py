@@ -3,8 +3,6 @@ import multiprocessing
 import os
 import unittest
 from datetime import datetime
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Font
 from tests.authentication_test.test_login import TestLogin
 from tests.authentication_test.test_register import TestRegister
 #from tests.authentication_test.test_setting import TestSetting
@@ -18,34 +16,91 @@ from tests.withdraw_test.test_withdrawtransfer import TestWithdrawTransfer
 #from tests.transaction_history_test.test_history import TestHistory
 #from tests.test_profile import TestProfile
 from tests.deposit_test.test_spamdeposit import TestSpamDeposit
+from tests.load_test.test_wallet_load import TestWalletLoad
 from tests.transfer_test.test_transfer import TestTransfer
 from tests.transfer_test.test_main_provider import TestMainProvider
 from tests.transfer_test.test_provider_to_provider import TestProviderToProvider
 from tests.revert_test.revert_test import TestRevert
+from tests.test_init import TestInit
+from tests.api_base import requires_browser
+from config.constant import ACCOUNT_POOL, SCHEDULER, TIMING, PROFILER, STANDIN, API_LATENCY
+from utils.scheduler import ParallelScheduler, ParallelSuite
+from utils.timing import get_duration_store
+from utils.profiler import format_helpers
+from utils.results import RecordingResultMixin
+from utils.report import ExcelReportWriter, recover_reports
+from utils.logs import configure_root, stop_logging
+from utils.browser_pool import close_browser_pool
+from utils.standin import start_standin
+from utils.latency import set_scope, flush_api_latency, report_api_latency
 
 
-class CustomTestResult(unittest.TextTestResult):
+RESULT_HEADERS = ["Test Class", "Test Name", "Status", "Error Message"]
+PROFILE_HEADERS = ["WebDriver Commands", "Wire Time (s)", "Chattiest Helpers"]
 
-    def __init__(self, stream, descriptions, verbosity):
+
+class ExcelResultReport:
+    """Writes one workbook per test class, appending each result as soon as it is reported."""
+
+    def __init__(self, language, browser):
+        self.language = language
+        self.browser = browser
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.results_dir = os.path.join(current_dir, "test_results")
+        self.writers = {}
+
+    def add(self, record):
+        test_class = record.test_class
+        writer = self.writers.get(test_class)
+        if writer is None:
+            filepath = os.path.join(self.results_dir, f"{test_class}.xlsx")
+            headers = RESULT_HEADERS + PROFILE_HEADERS if PROFILER["enabled"] else RESULT_HEADERS
+            # Every (language, browser) process reports each class to the same workbook; each keeps its own journal
+            writer = ExcelReportWriter(
+                filepath, {f"{test_class}_{self.language}_{self.browser}": headers},
+                journal_tag=f"{self.language}_{self.browser}"
+            )
+            self.writers[test_class] = writer
+        sheet = next(iter(writer.sheets))
+
+        row = [test_class, record.method, record.status, record.message]
+        if PROFILER["enabled"]:
+            profile = record.profile
+            if profile:
+                row += [profile["commands"], profile["wire_time"], format_helpers(profile)]
+                logging.info(
+                    f"{test_class}.{record.method}: {profile['commands']} WebDriver commands, "
+                    f"{profile['wire_time']}s on the wire; by helper: {profile['helpers']}"
+                )
+        writer.add_row(sheet, row, style="pass" if record.status == "PASS" else "fail")
+
+    def close(self):
+        for test_class, writer in self.writers.items():
+            writer.close()
+            if os.path.exists(writer.filepath):
+                logging.info(f"Excel file successfully created: {test_class}.xlsx")
+            else:
+                logging.error(f"Failed to create Excel file: {test_class}.xlsx")
+
+
+class CustomTestResult(RecordingResultMixin, unittest.TextTestResult):
+    """Keeps a TestRecord per test instead of the TestCase and its traceback, so memory stays flat on long runs."""
+
+    def __init__(self, stream, descriptions, verbosity, report=None):
         super().__init__(stream, descriptions, verbosity)
         self.successes = []
         self.errors_and_failures = []
         self.test_results = []
+        self.report = report
 
-    def addSuccess(self, test):
-        super().addSuccess(test)
-        self.successes.append(test)
-        self.test_results.append(("PASS", test, None))
-
-    def addError(self, test, err):
-        super().addError(test, err)
-        self.errors_and_failures.append(("ERROR", test, err))
-        self.test_results.append(("ERROR", test, err))
-
-    def addFailure(self, test, err):
-        super().addFailure(test, err)
-        self.errors_and_failures.append(("FAILURE", test, err))
-        self.test_results.append(("FAILURE", test, err))
+    def on_record(self, record):
+        self.test_results.append(record)
+        if record.status == "PASS":
+            self.successes.append(record)
+        elif record.status in ("ERROR", "FAILURE"):
+            self.errors_and_failures.append(record)
+        if self.report and record.status != "SKIP":
+            self.report.add(record)
 
 
 class CustomTestRunner(unittest.TextTestRunner):
@@ -54,103 +109,28 @@ class CustomTestRunner(unittest.TextTestRunner):
         super().__init__(**kwargs)
         self.language = language
         self.browser = browser
+        self.report = None
 
     def _makeResult(self):
-        return CustomTestResult(self.stream, self.descriptions, self.verbosity)
+        return CustomTestResult(self.stream, self.descriptions, self.verbosity, report=self.report)
 
     def run(self, test):
-        result = super().run(test)
+        self.report = ExcelResultReport(self.language, self.browser)
+        try:
+            result = super().run(test)
+        finally:
+            # Also runs on an interrupted run so the rows reported so far end up in the workbook
+            self.report.close()
         logging.info(f"Total tests run: {result.testsRun}")
         logging.info(f"Successes: {len(result.successes)}")
         logging.info(f"Failures: {len(result.failures)}")
         logging.info(f"Errors: {len(result.errors)}")
-        self.write_to_excel(result)
         return result
 
-    def write_to_excel(self, result):
-        test_results_by_class = {}
-        for status, test, error in result.test_results:
-            test_class = test.__class__.__name__
-            if test_class not in test_results_by_class:
-                test_results_by_class[test_class] = []
-            test_results_by_class[test_class].append((status, test, error))
-
-        for test_class, class_results in test_results_by_class.items():
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{test_class}.xlsx"
-
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            results_dir = os.path.join(current_dir, "test_results")
-            os.makedirs(results_dir, exist_ok=True)
-
-            filepath = os.path.join(results_dir, filename)
-
-            wb = Workbook()
-            ws = wb.active
-            ws.title = f"{test_class}_{self.language}_{self.browser}"
-
-            pass_fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")
-            fail_fill = PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid")
-            header_font = Font(bold=True)
-
-            headers = ["Test Class", "Test Name", "Status", "Error Message"]
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col)
-                cell.value = header
-                cell.font = header_font
-
-            row = 2
-            for status, test, error in class_results:
-                ws.cell(row=row, column=1, value=test_class)
-                ws.cell(row=row, column=2, value=test._testMethodName)
-                ws.cell(row=row, column=3, value=status)
-
-                if error:
-                    error_type, error_value, traceback = error
-                    error_msg = str(error_value)
-
-                    if isinstance(error_value, AssertionError) or "Test failed:" in error_msg:
-                        ws.cell(row=row, column=4, value=error_msg)
-                    else:
-                        formatted_msg = f"Test failed: {error_msg}"
-                        ws.cell(row=row, column=4, value=formatted_msg)
-
-                    for col in range(1, 5):
-                        ws.cell(row=row, column=col).fill = fail_fill
-                else:
-                    for col in range(1, 5):
-                        ws.cell(row=row, column=col).fill = pass_fill
-
-                row += 1
-
-            for row_idx in range(1, ws.max_row + 1):
-                cell = ws.cell(row=row_idx, column=4)
-                if cell.value:
-                    lines = str(cell.value).count('\n') + 1
-                    ws.row_dimensions[row_idx].height = 15 * max(lines, 1)
-
-            for col in ws.columns:
-                max_length = 0
-                column = col[0].column_letter
-                for cell in col:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = (max_length + 2)
-                ws.column_dimensions[column].width = adjusted_width
-
-            wb.save(filepath)
-            logging.info(f"Test results Excel file created at: {filepath}")
-
-            if os.path.exists(filepath):
-                logging.info(f"Excel file successfully created: {filename}")
-            else:
-                logging.error(f"Failed to create Excel file: {filename}")
-
 
-def create_test_suite(language, browser):
+def create_test_suite(language, browser, include_api_only=True):
+    """Build the suite for one (language, browser) run. API-only classes (see ApiTestBase) behave the same in
+    every browser, so only the run with include_api_only picks them up."""
     suite = unittest.TestSuite()
 
     # test_classes = [
@@ -161,6 +141,13 @@ def create_test_suite(language, browser):
     test_classes = [TestProfilePage]
 
     for test_class in test_classes:
+        if not include_api_only and not requires_browser(test_class):
+            logging.info(f"Skipping {test_class.__name__} in {browser}: API-only, it runs once for {language} in another process")
+            continue
+        if STANDIN["enabled"] and requires_browser(test_class):
+            logging.info(f"Skipping {test_class.__name__}: the back-office stand-in only serves API-only suites")
+            continue
+
         # Generate test methods if it's TestRevert
         if test_class == TestRevert:
             # Generate the test methods
@@ -180,32 +167,62 @@ def create_test_suite(language, browser):
     return suite
 
 
-def run_tests(language, browser):
+def configure_logging(language, browser, shard_index=None):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_filename = f"TestResults_{language}_{browser}_{timestamp}.log"
-
-    logging.basicConfig(
-        level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', handlers=[
-            logging.FileHandler(log_filename),
-            #logging.StreamHandler()  # This will print to console
-        ]
-    )
-
-    logging.info(f"Starting test run in {browser} browser for {language} language...")
-    suite = create_test_suite(language, browser)
-    runner = CustomTestRunner(language, browser, verbosity=2)
-    result = runner.run(suite)
-
-    logging.info("\n" + "=" * 50)
-    logging.info("TEST RUN SUMMARY")
-    logging.info("=" * 50)
-    logging.info(f"Total tests run: {result.testsRun}")
-    logging.info(f"Successes: {len(result.successes)}")
-    logging.info(f"Failures: {len(result.failures)}")
-    logging.info(f"Errors: {len(result.errors)}")
-    logging.info("=" * 50 + "\n")
-
-    return result.wasSuccessful()
+    shard_suffix = f"_shard{shard_index}" if shard_index is not None else ""
+    log_filename = f"TestResults_{language}_{browser}_{timestamp}{shard_suffix}.log"
+
+    configure_root(log_filename)
+
+
+def run_tests(language, browser, include_api_only=True):
+    configure_logging(language, browser)
+    set_scope(language, browser)
+
+    try:
+        logging.info(f"Starting test run in {browser} browser for {language} language...")
+        suite = create_test_suite(language, browser, include_api_only)
+        if SCHEDULER["workers"] > 1:
+            # Shard test methods across worker processes, each with its own browser, longest tests first
+            durations = get_duration_store().median_durations(language, browser) if TIMING["enabled"] else None
+            scheduler = ParallelScheduler(durations=durations, worker_init=configure_logging)
+            suite = ParallelSuite(suite, language, browser, scheduler)
+        runner = CustomTestRunner(language, browser, verbosity=2)
+        result = runner.run(suite)
+
+        logging.info("\n" + "=" * 50)
+        logging.info("TEST RUN SUMMARY")
+        logging.info("=" * 50)
+        logging.info(f"Total tests run: {result.testsRun}")
+        logging.info(f"Successes: {len(result.successes)}")
+        logging.info(f"Failures: {len(result.failures)}")
+        logging.info(f"Errors: {len(result.errors)}")
+        logging.info("=" * 50 + "\n")
+
+        if TIMING["enabled"]:
+            store = get_duration_store()
+            logging.info(f"Time split (seconds): {store.category_totals()}")
+            for item in store.regressions(language=language, browser=browser):
+                logging.warning(
+                    f"Slower than usual: {item['test_id']} took {item['seconds']}s (median {item['baseline']}s)"
+                )
+
+        if API_LATENCY["enabled"]:
+            flush_api_latency()
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            breaches = report_api_latency(os.path.join(current_dir, "test_results", f"api_latency_{language}_{browser}.xlsx"))
+            for breach in breaches:
+                logging.warning(
+                    f"SLO breached: {breach['endpoint']} {breach['metric']} {breach['value']}ms > {breach['limit']}ms"
+                )
+            if breaches:
+                logging.warning(f"RUN DEGRADED: {len(breaches)} back-office latency SLOs breached")
+        return result.wasSuccessful()
+    finally:
+        # Each run is its own process and exits without atexit, so quit idle browsers and flush queued log
+        # records here
+        close_browser_pool()
+        stop_logging()
 
 
 if __name__ == "__main__":
@@ -215,12 +232,25 @@ if __name__ == "__main__":
     browsers = ["firefox"]
     processes = []
 
+    recover_reports(os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_results"))
+
+    # Serves every API helper from this process when enabled; the test processes reach it over HTTP
+    standin = start_standin() if STANDIN["enabled"] else None
+
+    if ACCOUNT_POOL["enabled"] and ACCOUNT_POOL["prefill_on_start"]:
+        # Create pooled accounts up front so setUp can lease one instead of registering and funding inline
+        TestInit(language=languages[0]).provision_account_pool()
+
     for browser in browsers:
         for language in languages:
             logging.info(f"Starting test run for language: {language}, browser: {browser}")
-            process = multiprocessing.Process(target=run_tests, args=(language, browser))
+            # API-only suites run once per language, in the first browser's process
+            process = multiprocessing.Process(target=run_tests, args=(language, browser, browser == browsers[0]))
             process.start()
             processes.append(process)
 
     for process in processes:
         process.join()
+
+    if standin:
+        standin.stop()
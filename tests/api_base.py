@@ -0,0 +1,28 @@
+from config.constant import LANGUAGE_SETTINGS
+from tests.test_init import TestInit
+
+
+class ApiTestBase(TestInit):
+    """Base for suites that only talk to the REST API.
+
+    Keeps every BaseTest/TestInit helper (login, get_game_ids, accounts, deposits, withdrawals) but never
+    launches or leases a browser. main.py runs these classes once per language rather than once per browser.
+    """
+
+    REQUIRES_BROWSER = False
+
+    def setUp(self):
+        if not self.language:
+            raise ValueError("Language is not set.")
+        self.logger.info(f"Setting up API-only test for {self.language} language...")
+        self.driver = None
+        self.url = LANGUAGE_SETTINGS[self.language]["home_url"]
+
+    def tearDown(self):
+        pass
+
+
+def requires_browser(test_class):
+    """False for API-only classes; every other BaseTest subclass needs a driver."""
+    return getattr(test_class, "REQUIRES_BROWSER", True)
+
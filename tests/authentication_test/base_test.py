@@ -4,6 +4,7 @@ from selenium import webdriver
 import logging
 import random
 import requests
+from utils import http_client
 import re
 from datetime import datetime, timedelta
 import os
@@ -19,9 +20,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, UnexpectedAlertPresentException
-from config.constant import HEADLESS, CREDENTIALS, LANGUAGE_SETTINGS, PROFILE_URL, API_URL
+from config.constant import HEADLESS, CREDENTIALS, LANGUAGE_SETTINGS, PROFILE_URL, API_URL, BROWSER_POOL, WAIT_SETTINGS, TOKEN_CACHE, TIMING, SESSION_LOGIN, POPUP_DISMISSER, PROFILER, REFERENCE_CACHE, CASSETTE
 import tempfile
-import requests
 import string
 import json
 from urllib.parse import urlparse
@@ -32,6 +32,55 @@ from selenium.webdriver.remote.remote_connection import RemoteConnection
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.remote_connection import ClientConfig
 from selenium.webdriver.safari.options import Options as SafariOptions
+from utils.browser_pool import get_browser_pool
+from utils.token_cache import get_token_cache
+from utils.reference_cache import get_reference_cache
+from utils.fixtures import get_image
+from utils.approvals import ApprovalBatch, action_for
+from utils.wait import AdaptiveWait
+from utils.timing import TimedTestMixin, instrument_driver, instrument_helpers
+from utils.popups import get_popup_dismisser
+from utils.profiler import instrument_connection
+from utils import snapshot as dom_snapshot
+from utils.logs import get_logger
+
+logger = logging.getLogger(__name__)
+
+
+def request_login_token(username, password, log=logger):
+    """Log in through the back-office API and return the token, or None."""
+    payload = {
+        "username": username,
+        "password": password
+    }
+
+    try:
+        response = http_client.request_with_retry(
+            "POST", f"{CREDENTIALS['BO_base_url']}/api/v2/login", json=payload,
+            accept=lambda r: r.status_code == 200 and r.json().get("code") == 200
+        )
+        data = response.json()
+        if response.status_code == 200 and data.get("code") == 200:
+            log.info("Login successful!")
+            return data["data"]["token"]
+        log.warning(f"Login failed: {data.get('message')}")
+    except Exception as e:
+        log.warning(f"Login failed with error: {str(e)}")
+
+    log.error("Login failed after maximum retries")
+    return None
+
+
+def renew_rejected_token(token):
+    """Unauthorized handler of the shared HTTP client: log the token's owner in again through the token cache."""
+    if not TOKEN_CACHE["enabled"]:
+        return None
+    return get_token_cache().renew(
+        token, lambda base_url, username, password: lambda: request_login_token(username, password)
+    )
+
+
+http_client.set_unauthorized_handler(renew_rejected_token)
 
 
 class ContinueOnFailureTestResult(unittest.TestResult):
@@ -45,7 +94,7 @@ class ContinueOnFailureTestResult(unittest.TestResult):
         print(f"Test Error: {test}")
 
 
-class BaseTest(unittest.TestCase):
+class BaseTest(TimedTestMixin, unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
@@ -120,41 +169,45 @@ class BaseTest(unittest.TestCase):
         else:
             raise ValueError(f"Unsupported browser: {browser}")
 
+    def acquire_browser(self, browser):
+        if not BROWSER_POOL["enabled"]:
+            driver = self.initialize_browser(browser)
+        else:
+            driver = get_browser_pool().acquire((browser, HEADLESS), lambda: self.initialize_browser(browser))
+        if TIMING["enabled"]:
+            instrument_driver(driver)
+            if PROFILER["enabled"]:
+                instrument_connection(driver)
+        if POPUP_DISMISSER["enabled"]:
+            dismisser = get_popup_dismisser(driver)
+            dismisser.closed = []
+            if self.auto_dismiss_popups():
+                dismisser.enable()
+            else:
+                dismisser.disable()
+        return driver
+
+    def release_browser(self):
+        driver = getattr(self, "driver", None)
+        if driver is None:
+            return
+        self.driver = None
+        if POPUP_DISMISSER["enabled"]:
+            get_popup_dismisser(driver).drain()
+        if BROWSER_POOL["enabled"]:
+            get_browser_pool().release(driver)
+        else:
+            driver.quit()
+
     def __init__(self, methodName="runTest", language=None, browser=None):
         super().__init__(methodName)
         self.language = language
         self.browser = browser
 
-        self.logger = logging.getLogger(f"{self.__class__.__name__}_{browser}_{language}")
-        self.logger.setLevel(logging.INFO)
-
-        for handler in self.logger.handlers[:]:
-            self.logger.removeHandler(handler)
-
-        log_filename = f"test_{self.__class__.__name__.lower()}_output.log"
-
-        try:
-            file_handler = logging.FileHandler(log_filename, mode='a', encoding='utf-8')
-            file_handler.setLevel(logging.INFO)
-
-            formatter = logging.Formatter('%(asctime)s - %(name)s - [%(browser)s/%(language)s] - %(levelname)s - %(message)s')
-            file_handler.setFormatter(formatter)
-
-            self.logger.addHandler(file_handler)
-            self.logger.propagate = False
-
-            class ContextFilter(logging.Filter):
-                def filter(self, record):
-                    record.browser = browser
-                    record.language = language
-                    return True
-                    
-            context_filter = ContextFilter()
-            self.logger.addFilter(context_filter)
-
-            self.logger.info(f"Logger initialized for {self.__class__.__name__} with browser={browser}, language={language}")
-        except Exception as e:
-            print(f"Error setting up logger: {str(e)}")
+        self.logger = get_logger(
+            f"{self.__class__.__name__}_{browser}_{language}", f"test_{self.__class__.__name__.lower()}_output.log",
+            browser=browser, language=language
+        )
 
         self.login_field_locators = {
             "login_id": (By.ID, "usernameTextField"),
@@ -172,14 +225,70 @@ class BaseTest(unittest.TestCase):
         if not self.browser or not self.language:
             raise ValueError("Browser or language is not set.")
         self.logger.info(f"Setting up {self.browser} browser for {self.language} language...")
-        self.driver = self.initialize_browser(self.browser)
+        self.driver = self.acquire_browser(self.browser)
         self.url = LANGUAGE_SETTINGS[self.language]["home_url"]
         self.driver.get(self.url)
         # size of iphone X, as desktop UI is not ready
         self.driver.set_window_size(375, 812)
 
+    def tearDown(self):
+        self.release_browser()
+
+    def auto_dismiss_popups(self):
+        """Whether the popup watcher should run for this test. Opt out with AUTO_DISMISS_POPUPS = False on the
+        class or the keep_popups decorator on the test."""
+        test_method = getattr(self, self._testMethodName, None)
+        return (
+            POPUP_DISMISSER["enabled"] and getattr(self, "AUTO_DISMISS_POPUPS", True)
+            and not getattr(test_method, "keep_popups", False)
+        )
+
+    def popups_auto_dismissed(self):
+        driver = getattr(self, "driver", None)
+        return driver is not None and POPUP_DISMISSER["enabled"] and get_popup_dismisser(driver).enabled
+
+    def set_popup_dismisser(self, enabled):
+        dismisser = get_popup_dismisser(self.driver)
+        if enabled:
+            dismisser.enable()
+        else:
+            dismisser.disable()
+
+    def dismissed_popups(self):
+        """Popups the watcher has closed since this test acquired its browser."""
+        dismisser = get_popup_dismisser(self.driver)
+        dismisser.drain()
+        return list(dismisser.closed)
+
+    def snapshot(self, rows, fields=None, root=None):
+        """Read rows (a CSS selector or a list of elements) and their fields in one WebDriver round-trip.
+
+        fields maps names to a CSS selector, "xpath:<expr>", None for the row itself, or a dict spec; see
+        utils.snapshot.field_spec.
+        """
+        return dom_snapshot.snapshot(self.driver, rows, fields, root)
+
+    def texts_by_id(self, selector, root=None):
+        """Return {id: text} for every element matching selector, e.g. "[id^='reward-']"."""
+        return dom_snapshot.texts_by_id(self.driver, selector, root)
+
+    def table_cell_texts(self, rows, cell_selector="td.MuiTableCell-body"):
+        """Return the cell texts of each table row as a list of lists."""
+        return [row["cells"] for row in self.snapshot(rows, {"cells": {"css": cell_selector, "all": True}})]
+
+    def settle(self, max_wait=WAIT_SETTINGS["default_timeout"]):
+        """Wait for the page to go quiet (no pending XHR/fetch, DOM and swal2 animations settled), at most max_wait seconds"""
+        return AdaptiveWait(self.driver).settle(max_wait)
+
+    def wait_until_stable(self, element, max_wait=WAIT_SETTINGS["default_timeout"]):
+        """Wait for element to stop moving, e.g. after scrollIntoView, at most max_wait seconds"""
+        return AdaptiveWait(self.driver).element_stable(element, max_wait)
+
     #id
     def navigate_to_login_page(self):
+        if self.uses_session_login():
+            # perform_login injects the session from whatever page is open; it opens the form itself on fallback
+            return
         self.annoucement_close_button()
         loginPage_button = WebDriverWait(self.driver,
                                          10).until(EC.element_to_be_clickable((By.ID, "unlogged-login-button")))
@@ -189,7 +298,7 @@ class BaseTest(unittest.TestCase):
         self.annoucement_close_button()
         self.daily_checkin_close_button()
         self.click_navigation_bar("footer-profile-button")
-        time.sleep(4)
+        self.settle(max_wait=4)
 
         displayed_text = WebDriverWait(self.driver,
                                        10).until(EC.visibility_of_element_located((By.ID, "username"))).text
@@ -218,7 +327,7 @@ class BaseTest(unittest.TestCase):
             link = WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable((By.XPATH, xpath)))
             link.click()
             self.logger.info(f"Successfully clicked navigation link: /{language}/{section}")
-            time.sleep(2)
+            self.settle(max_wait=2)
         except Exception as e:
             self.logger.error(f"Failed to click navigation link /{language}/{section}: {str(e)}")
             self.fail(f"Could not click navigation link: {str(e)}")
@@ -227,7 +336,7 @@ class BaseTest(unittest.TestCase):
             link = self.driver.find_element(By.ID, buttomNavigationBar)
             actions = ActionChains(self.driver)
             actions.move_to_element(link).click().perform()
-            time.sleep(2)
+            self.settle(max_wait=2)
         except Exception as e:
             self.fail(f"Could not click navigation link: {str(e)}")
 
@@ -244,15 +353,15 @@ class BaseTest(unittest.TestCase):
     def navigate_to_profile_menu(self, element_id):
         actions = ActionChains(self.driver)
         self.click_navigation_bar("footer-profile-button")
-        time.sleep(5)
+        self.settle(max_wait=5)
         link = self.driver.find_element(By.ID, element_id)
         self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", link)
         actions.move_to_element(link).click().perform()
-        time.sleep(5)
+        self.settle(max_wait=5)
     
     def navigate_to_live_page(self):
         self.click_navigation_bar("footer-live-button")
-        time.sleep(2)
+        self.settle(max_wait=2)
         self.boboLiveLogin()
 
     def navigate_AccSecurity(self):
@@ -272,6 +381,8 @@ class BaseTest(unittest.TestCase):
             EC.element_to_be_clickable((By.CSS_SELECTOR, 'a[href="setting/account/password"]'))
         )
         AccSecurity_page.click()
+        # Tests on this page may change the password, which revokes the user's cached token
+        self.forget_session()
 
     def navigate_to_resetPassword_page(self):
         self.navigate_ChangePassword()
@@ -284,6 +395,9 @@ class BaseTest(unittest.TestCase):
         AccPassword_page.click()
 
     def annoucement_close_button(self):
+        if self.popups_auto_dismissed():
+            self.settle(max_wait=2)
+            return
         try:
             close_button = WebDriverWait(self.driver,
                                          10).until(EC.element_to_be_clickable((By.ID, "announcement-close-button")))
@@ -294,29 +408,95 @@ class BaseTest(unittest.TestCase):
             pass
 
     def daily_checkin_close_button(self, close_mission=True):
+        if self.popups_auto_dismissed():
+            self.settle(max_wait=2)
+            return
         try:
             close_button = WebDriverWait(self.driver,
                                          10).until(EC.element_to_be_clickable((By.ID, "close-modal-button")))
 
             close_button.click()
-            time.sleep(2)
+            self.settle(max_wait=2)
             if close_mission:
                 close_button = WebDriverWait(self.driver,
                                              10).until(EC.element_to_be_clickable((By.ID, "not-yet-check-in-close")))
                 close_button.click()
-                time.sleep(2)
+                self.settle(max_wait=2)
         except TimeoutException:
             self.logger.info("No checkin popup found")
             pass
 
-    def perform_login(self, username, password, close_mission=True):
+    def perform_login(self, username, password, close_mission=True, via_ui=False):
+        """Log in through the login form, or by injecting an API token when SESSION_LOGIN is enabled.
+
+        Tests that exercise the login form itself set UI_LOGIN = True on the class or pass via_ui=True.
+        """
+        self.session_user = username
+        if not via_ui and self.uses_session_login():
+            if self.inject_session(username, password):
+                self.dismiss_login_popups(close_mission)
+                return
+            self.logger.warning(f"Session injection failed for {username}, falling back to the login form")
+            if not self.driver.find_elements(*self.login_field_locators["login_id"]):
+                self.driver.get(LANGUAGE_SETTINGS[self.language]["login_url"])
+
         self.enter_credentials(username, password)
         self.click_login_button()
-        time.sleep(5)
+        self.settle(max_wait=5)
         self.annoucement_close_button()
-        time.sleep(2)
+        self.settle(max_wait=2)
         self.daily_checkin_close_button(close_mission)
 
+    def uses_session_login(self):
+        return SESSION_LOGIN["enabled"] and not getattr(self, "UI_LOGIN", False)
+
+    def inject_session(self, username, password, target_url=None, retry=True):
+        """Write a token from the login API into the browser and load target_url already authenticated."""
+        token = self.login(username, password)
+        if not token:
+            return False
+
+        # Storage and cookies belong to the origin, so the app must already be open before they can be written
+        if urlparse(self.driver.current_url).netloc != urlparse(LANGUAGE_SETTINGS[self.language]["home_url"]).netloc:
+            self.driver.get(LANGUAGE_SETTINGS[self.language]["home_url"])
+        self.driver.execute_script(
+            "for (const key of arguments[0]) { window.localStorage.setItem(key, arguments[1]); }",
+            SESSION_LOGIN["storage_keys"], token
+        )
+        for name in SESSION_LOGIN["cookie_names"]:
+            self.driver.add_cookie({"name": name, "value": token, "path": "/"})
+
+        self.driver.get(target_url or LANGUAGE_SETTINGS[self.language]["home_url"])
+        self.settle(max_wait=5)
+        if not self.driver.find_elements(By.ID, "unlogged-login-button"):
+            self.logger.info(f"Logged in as {username} by session injection")
+            return True
+
+        if retry:
+            # A dead cached token looks the same to the app; the API call renews it (see renew_rejected_token)
+            http_client.get(
+                CREDENTIALS["GetUser"], headers={"Authorization": f"Bearer {token}", "Accept": "application/json"}
+            )
+            if self.login(username, password) != token:
+                self.logger.info(f"Cached token of {username} had expired, injecting the renewed one")
+                return self.inject_session(username, password, target_url, retry=False)
+
+        self.logger.warning(f"App did not pick up the injected session for {username}")
+        return False
+
+    def dismiss_login_popups(self, close_mission=True):
+        """Close the announcement and check-in popups if they are showing, without waiting for them to appear."""
+        for element_id in ("announcement-close-button", "close-modal-button"):
+            buttons = self.driver.find_elements(By.ID, element_id)
+            if buttons and buttons[0].is_displayed():
+                buttons[0].click()
+                self.settle(max_wait=2)
+        if close_mission:
+            buttons = self.driver.find_elements(By.ID, "not-yet-check-in-close")
+            if buttons and buttons[0].is_displayed():
+                buttons[0].click()
+                self.settle(max_wait=2)
+
     def get_field(self, field_name, form_type="login"):
         if form_type == "login":
             locator_type, locator_value = self.login_field_locators[field_name]
@@ -422,12 +602,12 @@ class BaseTest(unittest.TestCase):
         ), "Password field should initially be of type 'password'"
 
         visibility_toggle.click()
-        time.sleep(2)
+        self.settle(max_wait=2)
         assert (password_input.get_attribute("type") == "text"), "Password field should be of type 'text' when visible"
         assert (password_input.get_attribute("value") == password), "Visible password should match the entered password"
 
         visibility_toggle.click()
-        time.sleep(2)
+        self.settle(max_wait=2)
         assert (password_input.get_attribute("type") == "password"), "Password field should revert to type 'password'"
 
     def navigate_to_reload_page(self, tab):
@@ -436,23 +616,23 @@ class BaseTest(unittest.TestCase):
         if tab == "deposit":
             section_button = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, "home-deposit-button")))
             section_button.click()
-            time.sleep(2)
+            self.settle(max_wait=2)
 
         elif tab == "withdraw":
             section_button = WebDriverWait(driver,
                                            10).until(EC.element_to_be_clickable((By.ID, "home-withdrawal-button")))
             section_button.click()
-            time.sleep(2)
+            self.settle(max_wait=2)
 
         elif tab == "transfer":
             section_button = WebDriverWait(driver,
                                            10).until(EC.element_to_be_clickable((By.ID, "home-transfer-button")))
             section_button.click()
-            time.sleep(2)
+            self.settle(max_wait=2)
 
     def choose_amount(self, index):
         driver = self.driver
-        time.sleep(1)
+        self.settle(max_wait=1)
 
         try:
             amount_section = WebDriverWait(driver, 10).until(
@@ -469,14 +649,14 @@ class BaseTest(unittest.TestCase):
 
             for button in buttons:
                 driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-                time.sleep(1)
+                self.wait_until_stable(button, max_wait=1)
 
                 try:
                     button.click()
                 except Exception:
                     driver.execute_script("arguments[0].click();", button)
 
-                time.sleep(1)
+                self.settle(max_wait=1)
 
                 button_value = button.get_attribute("value")
                 input_value = input_field.get_attribute("value")
@@ -506,7 +686,7 @@ class BaseTest(unittest.TestCase):
             )
             self.logger.info(f"Expand more icons: {expand_more_icons}")
             expand_more_icons[expand_icon_index].click()
-            time.sleep(1)
+            self.settle(max_wait=1)
 
         except Exception as e:
             self.fail(f"Failed to open dropdown: {str(e)}")
@@ -563,18 +743,18 @@ class BaseTest(unittest.TestCase):
         self.logger.info(bonusDesc)
 
         #waitid
-        time.sleep(1)
+        self.settle(max_wait=1)
         close_button = WebDriverWait(self.driver, 10).until(
             EC.element_to_be_clickable((By.CSS_SELECTOR, '[data-testid="CloseIcon"]'))
         )
         close_button.click()
-        time.sleep(2)
+        self.settle(max_wait=2)
 
     def check_match_record(self, date, index):
         driver = self.driver
 
         while True:
-            time.sleep(1)
+            self.settle(max_wait=1)
             table_rows = driver.find_elements(By.CSS_SELECTOR, "tbody.MuiTableBody-root tr")
             self.logger.info(f"Found {len(table_rows)} rows in the current page")
 
@@ -609,7 +789,7 @@ class BaseTest(unittest.TestCase):
                     self.logger.error(f"Assertion failed: {str(e)}")
                     self.fail("Wrong Date Display")
 
-            time.sleep(2)
+            self.settle(max_wait=2)
             next_button = WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "button[aria-label='Go to next page']"))
             )
@@ -736,7 +916,7 @@ class BaseTest(unittest.TestCase):
                 driver.execute_script("arguments[0].scrollIntoView(true);", item)
                 WebDriverWait(driver, 3).until(EC.element_to_be_clickable(item)).click()
 
-                time.sleep(1)
+                self.settle(max_wait=1)
                 if choose_history_date:
                     self.calculate_date(index)
                 if check_start_end_disable:
@@ -788,7 +968,7 @@ class BaseTest(unittest.TestCase):
                 else:
                     break
 
-            time.sleep(1)
+            self.settle(max_wait=1)
         if check_add_account:
             return bank_list
 
@@ -798,7 +978,7 @@ class BaseTest(unittest.TestCase):
             amount_section = WebDriverWait(driver,
                                            10).until(EC.presence_of_element_located((By.ID, "amount-toggle-group")))
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", amount_section)
-            time.sleep(1)
+            self.wait_until_stable(amount_section, max_wait=1)
 
             buttons = amount_section.find_elements(By.TAG_NAME, 'button')
             self.logger.info(f"Number of buttons found: {len(buttons)}")
@@ -806,7 +986,7 @@ class BaseTest(unittest.TestCase):
             random_button = random.choice(buttons)
             self.logger.info(f"Selected button: {random_button}")
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", random_button)
-            time.sleep(1)
+            self.wait_until_stable(random_button, max_wait=1)
             random_button.click()
             self.logger.info("Clicked")
 
@@ -839,7 +1019,7 @@ class BaseTest(unittest.TestCase):
 
                 self.logger.info(f"Randomly selecting promo option: {random_promo_text}")
 
-                time.sleep(2)
+                self.settle(max_wait=2)
                 WebDriverWait(driver, 10).until(EC.element_to_be_clickable(random_promo)).click()
 
                 return random_promo_text
@@ -850,39 +1030,33 @@ class BaseTest(unittest.TestCase):
             self.fail(f"Failed to randomly select a promo option: {str(e)}")
 
     def handleDeposit(self, ID, isReject=False, isProcessing=False):
-        if isReject:
-            url = CREDENTIALS["RejectDepositRequest"].format(BO_base_url = CREDENTIALS["BO_base_url"], ID=ID)
-        elif isProcessing:
-            url = CREDENTIALS["ProcessingDepositRequest"].format(BO_base_url = CREDENTIALS["BO_base_url"], ID=ID)
-        else:
-            url = CREDENTIALS["ApproveDepositRequest"].format(BO_base_url = CREDENTIALS["BO_base_url"], ID=ID)
-
-        response = requests.get(url)
-
-        MAX_RETRIES = 3
-
-        for attempt in range(MAX_RETRIES):
-            if response.status_code == 200:
-                if isReject:
-                    self.logger.info(f"Successfully rejected deposit for ID {ID}")
-                elif isProcessing:
-                    self.logger.info(f"Successfully processing deposit for ID {ID}")
-                else:
-                    self.logger.info(f"Successfully approved deposit for ID {ID}")
-                break
+        self.handleDeposits([ID], isReject=isReject, isProcessing=isProcessing)
+
+    def handleDeposits(self, IDs, isReject=False, isProcessing=False):
+        """Approve, reject or process the pending deposits of several users in one back-office call."""
+        action = action_for(isReject, isProcessing)
+        batch = ApprovalBatch()
+        for ID in IDs:
+            batch.add("deposit", ID, action)
+        results = batch.flush()[("deposit", action)]
+
+        failed = [ID for ID, ok in results.items() if not ok]
+        for ID, ok in results.items():
+            if ok and isReject:
+                self.logger.info(f"Successfully rejected deposit for ID {ID}")
+            elif ok and isProcessing:
+                self.logger.info(f"Successfully processing deposit for ID {ID}")
+            elif ok:
+                self.logger.info(f"Successfully approved deposit for ID {ID}")
+
+        if failed:
+            self.logger.error(f"Failed to process deposit for IDs {failed}")
+            if isReject:
+                self.fail("Reject deposit failed")
+            elif isProcessing:
+                self.fail("Processing deposit failed")
             else:
-                self.logger.error(
-                    f"Attempt {attempt+1}: Failed to process deposit. Status code: {response.status_code}"
-                )
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(1)
-                else:
-                    if isReject:
-                        self.fail("Reject deposit failed")
-                    elif isProcessing:
-                        self.fail("Processing deposit failed")
-                    else:
-                        self.fail("Approve deposit failed")
+                self.fail("Approve deposit failed")
 
     def generic_submit(
         self, field=None, expected_result=None, check_general_error=None, check_ewallet_number=None,
@@ -890,12 +1064,12 @@ class BaseTest(unittest.TestCase):
         turnoverList=None
     ):
         driver = self.driver
-        time.sleep(2)
+        self.settle(max_wait=2)
         submit_button = WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable((By.ID, submit)))
         driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", submit_button)
-        time.sleep(3)
+        self.wait_until_stable(submit_button, max_wait=3)
         submit_button.click()
-        time.sleep(2)
+        self.settle(max_wait=2)
 
         if expected_result == "success":
             try:
@@ -917,7 +1091,7 @@ class BaseTest(unittest.TestCase):
                         ))
                     )
                     OkButton.click()
-                    time.sleep(1)
+                    self.settle(max_wait=1)
 
                 else:
                     self.success_box()
@@ -925,7 +1099,7 @@ class BaseTest(unittest.TestCase):
                 self.fail("Cannot submit successfully")
 
         elif expected_result == "failure":
-            time.sleep(1)
+            self.settle(max_wait=1)
             if check_general_error:
                 self.check_general_error(
                     expected_error, id, turnoverIncomplete=turnoverIncomplete, locked_by_list=locked_by_list,
@@ -1037,19 +1211,13 @@ class BaseTest(unittest.TestCase):
         )
 
         button_texts = []
+        for button in self.snapshot(buttons, {"text": None if history else "p.MuiTypography-root"}):
+            if button["text"] is None:
+                self.logger.error("Failed to get text from button: no label found")
+                continue
+            button_texts.append(button["text"])
         self.logger.info(button_texts)
 
-        for button in buttons:
-            try:
-                if history:
-                    button_text = button.text.strip()
-                    self.logger.info(button_text)
-                else:
-                    button_text = button.find_element(By.CSS_SELECTOR, "p.MuiTypography-root").text.strip()
-                button_texts.append(button_text)
-            except Exception as e:
-                self.logger.error(f"Failed to get text from button: {str(e)}")
-
         self.logger.info(len(button_texts))
         return button_texts
 
@@ -1058,7 +1226,7 @@ class BaseTest(unittest.TestCase):
         try:
             camera_button = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, "upload-camera-button")))
             camera_button.click()
-            time.sleep(2)
+            self.settle(max_wait=2)
             take_photo_button = WebDriverWait(driver,
                                               10).until(EC.element_to_be_clickable((By.ID, "camera-capture-button")))
             take_photo_button.click()
@@ -1070,38 +1238,24 @@ class BaseTest(unittest.TestCase):
 
     def upload_from_gallery(self, replace=False, checkLargeFile=False):
         if checkLargeFile:
-            self.test_image_url = PROFILE_URL["large_image_url"]
+            fixture_name = "gallery_large"
         else:
             if replace:
-                self.test_image_url = PROFILE_URL["replace_image_url"]
+                fixture_name = "gallery_replace"
             else:
-                self.test_image_url = PROFILE_URL["valid_image_url"]
+                fixture_name = "gallery_valid"
 
         driver = self.driver
         gallery_text = LANGUAGE_SETTINGS[self.language]["change_profile"]["gallery"]
         try:
-            # Get the filename from URL
-            filename = os.path.basename(urlparse(self.test_image_url).path)
-
-            # Create a temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as temp_file:
-                try:
-                    response = requests.get(self.test_image_url)
-                    response.raise_for_status()  # Raises an HTTPError for bad responses
-                    temp_file.write(response.content)
-                    self.test_image_path = temp_file.name
-                except requests.exceptions.RequestException as e:
-                    self.fail(f"Failed to download image from URL: {e}")
-                    return False
-
-            if not os.path.exists(self.test_image_path):
-                raise FileNotFoundError(f"Test image not found at {self.test_image_path}")
-                
-            # Make the file readable by all users (world-readable)
-            os.chmod(self.test_image_path, 0o644)
-            self.logger.info(f"Changed file permissions to make it world-readable: {self.test_image_path}")
+            # Downloaded once per process; the browser's file input reads the shared on-disk copy
+            try:
+                self.test_image_path = get_image(fixture_name).path()
+            except RuntimeError as e:
+                self.fail(f"Failed to download image: {e}")
+                return False
 
-            time.sleep(2)
+            self.settle(max_wait=2)
             gallery_button = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, "upload-gallery-button")))
             gallery_button.click()
             self.logger.info(f"Clicked '{gallery_text}' button")
@@ -1111,7 +1265,7 @@ class BaseTest(unittest.TestCase):
             )
             self.logger.info("File input element located.")
             file_input.send_keys(self.test_image_path)
-            time.sleep(2)
+            self.settle(max_wait=2)
             self.logger.info(f"Uploaded image from {self.test_image_path}")
 
         except Exception as e:
@@ -1140,7 +1294,7 @@ class BaseTest(unittest.TestCase):
 
     def check_balance(self, total_amount=None, games_amount=None, language=None, return_balance=None):
         driver = self.driver
-        time.sleep(2)
+        self.settle(max_wait=2)
         deposit_balance_element = WebDriverWait(driver,
                                                 10).until(EC.visibility_of_element_located((By.ID, "wallet-balance")))
 
@@ -1192,7 +1346,7 @@ class BaseTest(unittest.TestCase):
             EC.element_to_be_clickable((By.CSS_SELECTOR, "div.MuiPaper-root.mui-theme-l6njlf"))
         )
         non_withdrawable_section.click()
-        time.sleep(2)
+        self.settle(max_wait=2)
         parent_divs = driver.find_elements(
             By.CLASS_NAME, "MuiPaper-root.MuiPaper-elevation.MuiPaper-rounded.MuiPaper-elevation0.mui-theme-ppvpol"
         )
@@ -1230,11 +1384,11 @@ class BaseTest(unittest.TestCase):
         voucher_field = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.ID, "promo-code-input")))
         driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", voucher_field)
         voucher_field.send_keys(voucher)
-        time.sleep(1)
+        self.settle(max_wait=1)
         arrow_button = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, "apply-button")))
         arrow_button.click()
         self.logger.info("Clicked the arrow button successfully")
-        time.sleep(1)
+        self.settle(max_wait=1)
 
     def check_disable_field(self, item, check=None):
         is_disabled = ('Mui-disabled' in item.get_attribute('class') or item.get_attribute('disabled') is not None)
@@ -1275,7 +1429,7 @@ class BaseTest(unittest.TestCase):
             )
         except:
             self.fail("Cannot apply the valid voucher")
-        time.sleep(2)
+        self.settle(max_wait=2)
         self.choose_promo_code(
             driver, expand_icon_index, self.language, deposit_banktransfer=deposit_banktransfer,
             voucher_code=CREDENTIALS["deposit"]["valid_voucher"]
@@ -1391,7 +1545,7 @@ class BaseTest(unittest.TestCase):
         self, checkDuplicated=False, checkMaxAccounts=False, checkInvalidAcc=False, bank_list=None, setting=False
     ):
         try:
-            time.sleep(2)
+            self.settle(max_wait=2)
             if bank_list:
                 existingAccounts = bank_list
             else:
@@ -1406,7 +1560,7 @@ class BaseTest(unittest.TestCase):
                 self.logger.info(f"Current number of accounts: {currentAccountCount}")
 
                 if currentAccountCount >= 5:
-                    time.sleep(2)
+                    self.settle(max_wait=2)
                     self.addSingleAccount(existingAccounts, checkMaxAccounts=True, setting=setting)
                     return
                 else:
@@ -1414,7 +1568,7 @@ class BaseTest(unittest.TestCase):
                         verificationResult, currentAccountCount = self.addSingleAccount(
                             existingAccounts, setting=setting
                         )
-                        time.sleep(2)
+                        self.settle(max_wait=2)
                         self.logger.info(f"Added account. Current count: {currentAccountCount}")
 
                     self.addSingleAccount(existingAccounts, checkMaxAccounts=True, setting=setting)
@@ -1459,18 +1613,18 @@ class BaseTest(unittest.TestCase):
                 addAccountButton = WebDriverWait(driver,
                                                  10).until(EC.element_to_be_clickable((By.ID, "add-account-button")))
                 addAccountButton.click()
-                time.sleep(2)
+                self.settle(max_wait=2)
             else:
                 addAccountButton = WebDriverWait(driver, 10).until(
                     EC.element_to_be_clickable((By.ID, "add-bank-account-button"))
                 )
                 addAccountButton.click()
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             WebDriverWait(driver, 3).until(EC.presence_of_element_located((By.ID, "add-bank-form")))
             bankDropdown = WebDriverWait(driver, 3).until(EC.element_to_be_clickable((By.ID, "bank-select")))
             bankDropdown.click()
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             options = WebDriverWait(driver, 3).until(
                 EC.presence_of_all_elements_located((By.XPATH, '//ul[@role="listbox"]//li'))
@@ -1510,17 +1664,17 @@ class BaseTest(unittest.TestCase):
                         randomOption.click()
                         break
                     bankDropdown.click()
-                    time.sleep(1)
+                    self.settle(max_wait=1)
 
             accNumberField = WebDriverWait(driver,
                                            3).until(EC.visibility_of_element_located((By.ID, "acc-number-input")))
             accNumberField.send_keys(accountNumber)
             enteredAcc = accNumberField.get_attribute("value")
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             confirmButton = WebDriverWait(driver, 3).until(EC.element_to_be_clickable((By.ID, "submit-bank-button")))
             confirmButton.click()
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             if checkMaxAccounts:
                 self.check_general_error(
@@ -1538,7 +1692,7 @@ class BaseTest(unittest.TestCase):
                 self.logger.info("success")
                 self.success_box()
                 self.confirm_button()
-                time.sleep(3)
+                self.settle(max_wait=3)
                 verificationResult, numAccounts = self.verify_added_account(bankChosen, enteredAcc, setting=setting)
                 if verificationResult:
                     return True, numAccounts
@@ -1568,7 +1722,7 @@ class BaseTest(unittest.TestCase):
 
     def choose_random_bank_account(self):
         self.scrollToSection("wallet-form-bankAccount")
-        time.sleep(1)
+        self.settle(max_wait=1)
         bankOptions = self.select_dropdown_option(
             expand_icon_index=0, item_css_selector="li.MuiMenuItem-root", extract_acc=False, choose_account=True
         )
@@ -1594,19 +1748,19 @@ class BaseTest(unittest.TestCase):
         driver = self.driver
         clear_button = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, clearButton)))
         driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", clear_button)
-        time.sleep(1)
+        self.wait_until_stable(clear_button, max_wait=1)
         clear_button.click()
 
     def extract_total_balance(self):
         driver = self.driver
-        time.sleep(1)
+        self.settle(max_wait=1)
 
         self.scrollToSection("wallet-balance")
         WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.ID, "wallet-balance")))
         self.logger.info("Refreshing balance")
         balance_refresh = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, "refresh-button")))
         balance_refresh.click()
-        time.sleep(5)
+        self.settle(max_wait=5)
         self.logger.info("Done refreshing balance")
         BalanceStr = self.check_balance(language=self.language, return_balance=True)
         if not BalanceStr:
@@ -1622,7 +1776,7 @@ class BaseTest(unittest.TestCase):
                 "username": CREDENTIALS["duplicated_user"]["username"],
                 "password": CREDENTIALS["duplicated_user"]["password"]
             }
-            response = requests.post(f"{CREDENTIALS['BO_base_url']}/api/login", json=payload)
+            response = http_client.post(f"{CREDENTIALS['BO_base_url']}/api/login", json=payload)
             response.raise_for_status()
             data = response.json()
 
@@ -1635,7 +1789,7 @@ class BaseTest(unittest.TestCase):
                 "language": self.language
             }
 
-            response = requests.get(f"{CREDENTIALS['BO_base_url']}/api/depositInfo", headers=headers)
+            response = http_client.get(f"{CREDENTIALS['BO_base_url']}/api/depositInfo", headers=headers)
             response.raise_for_status()
             promoList = response.json().get("data", {}).get("popoPromo", [])
 
@@ -1691,7 +1845,7 @@ class BaseTest(unittest.TestCase):
             section = WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.ID, field_name)))
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", section)
             self.logger.info(f"Scrolled to {field_name} section")
-            time.sleep(1)
+            self.settle(max_wait=1)
         except Exception as e:
             self.fail(f"Failed to scroll to {field_name} section: {str(e)}")
 
@@ -1786,7 +1940,7 @@ class BaseTest(unittest.TestCase):
                 amount_field = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, amount_field_id)))
                 amount_field.clear()
                 amount_field.send_keys(amount)
-                time.sleep(1)
+                self.settle(max_wait=1)
 
                 if transfer:
                     self.generic_submit(
@@ -1795,7 +1949,7 @@ class BaseTest(unittest.TestCase):
                     )
                     driver.refresh()
                     self.selectWalletByAmount(0, mode='highest')
-                    time.sleep(1)
+                    self.settle(max_wait=1)
                     self.selectWalletByAmount(1, mode='lowest')
                 else:
                     if no_input:
@@ -1824,7 +1978,7 @@ class BaseTest(unittest.TestCase):
                         )
                         self.clear_details(clearButton=clear_button_id)
 
-                time.sleep(2)
+                self.settle(max_wait=2)
 
             except Exception as e:
                 self.fail(f"Test failed for amount '{amount}': {str(e)}")
@@ -1834,36 +1988,36 @@ class BaseTest(unittest.TestCase):
         dummyBank = WebDriverWait(self.driver,
                                   10).until(EC.element_to_be_clickable((By.CSS_SELECTOR, "#Main_Bank img")))
         dummyBank.click()
-        time.sleep(2)
+        self.settle(max_wait=2)
         username_input = WebDriverWait(self.driver, 10).until(
             EC.presence_of_element_located((By.XPATH, "//input[@placeholder='Your Username']"))
         )
         username_input.send_keys("abc")
-        time.sleep(2)
+        self.settle(max_wait=2)
         password_input = WebDriverWait(self.driver, 10).until(
             EC.presence_of_element_located((By.XPATH, "//input[@placeholder='Your Password']"))
         )
         password_input.send_keys("123")
-        time.sleep(2)
+        self.settle(max_wait=2)
         login_button = WebDriverWait(self.driver,
                                      10).until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button.btn.btn-default")))
         login_button.click()
-        time.sleep(5)
+        self.settle(max_wait=5)
         confirm_button = WebDriverWait(self.driver, 10).until(
             EC.element_to_be_clickable((By.XPATH, "//button[@onclick='ConfirmBankAccount()']"))
         )
         confirm_button.click()
-        time.sleep(5)
+        self.settle(max_wait=5)
         continue_button = WebDriverWait(self.driver, 10).until(
             EC.element_to_be_clickable((By.XPATH, "//button[@onclick='ConfirmUserResponse()']"))
         )
         continue_button.click()
-        time.sleep(7)
+        self.settle(max_wait=7)
 
     def choose_receipt(self):
         driver = self.driver
         self.scrollToSection("wallet-form-uploadReceipt")
-        time.sleep(1)
+        self.settle(max_wait=1)
         try:
             add_photo_button = WebDriverWait(driver,
                                              10).until(EC.element_to_be_clickable((By.ID, "upload-receipt-button")))
@@ -1905,13 +2059,13 @@ class BaseTest(unittest.TestCase):
         driver = self.driver
         totalReloadAmount = 0
         try:
-            time.sleep(2)
+            self.settle(max_wait=2)
             self.scrollToSection("wallet-form-popoPromo")
-            time.sleep(2)
+            self.settle(max_wait=2)
             initialPromoOptions = self.getPromoOptions()
             initialPromoTexts = [promo.text for promo in initialPromoOptions]
             self.logger.info(f"Found {len(initialPromoTexts)} promo options")
-            time.sleep(2)
+            self.settle(max_wait=2)
             driver.refresh()
 
             for promoText in initialPromoTexts:
@@ -1945,11 +2099,11 @@ class BaseTest(unittest.TestCase):
                 else:
                     reloadAmount = self.select_random_amount()
                     self.logger.info(f"Reload amount for promo: {promoText}")
-                time.sleep(2)
+                self.settle(max_wait=2)
 
                 if chooseReceipt:
                     self.choose_receipt()
-                    time.sleep(1)
+                    self.settle(max_wait=1)
 
                 currentPromoOptions = self.getPromoOptions()
                 currentNumPromos = len(currentPromoOptions)
@@ -1980,7 +2134,7 @@ class BaseTest(unittest.TestCase):
                 self.logger.info(f"Final Bonus amount: {bonusAmount}")
 
                 promo.click()
-                time.sleep(1)
+                self.settle(max_wait=1)
 
                 if testMinReload and lessDepositLimit:
                     # Test error message for insufficient reload amount
@@ -1998,7 +2152,7 @@ class BaseTest(unittest.TestCase):
                         )
                         reloadAmount = self.select_random_amount()
                         self.logger.info(f"New reload amount: {reloadAmount}")
-                        time.sleep(1)
+                        self.settle(max_wait=1)
 
                     bonusAmount = self.calculateBonusAmount(float(reloadAmount), bonus, bonusType, maxReward)
                     self.logger.info(f"Final Bonus amount: {bonusAmount}")
@@ -2018,17 +2172,17 @@ class BaseTest(unittest.TestCase):
 
                 if isQuickReload:
                     self.paymentGateway()
-                    time.sleep(2)
+                    self.settle(max_wait=2)
                     self.confirm_button()
                 else:
                     self.handleDeposit(ID)
-                    time.sleep(2)
+                    self.settle(max_wait=2)
 
                 self.verifyBonusBalance(initialBalance, reloadAmount, promoText=promoText, bonusAmount=bonusAmount)
                 if equalDepositLimit or greaterDepositLimit:
                     break
 
-                time.sleep(2)
+                self.settle(max_wait=2)
             return totalReloadAmount
         except Exception as e:
             self.fail(f"Test failed: {str(e)}")
@@ -2060,7 +2214,7 @@ class BaseTest(unittest.TestCase):
             EC.element_to_be_clickable((By.CSS_SELECTOR, "div.MuiBox-root.mui-theme-164q5tj"))
         )
         self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", mini_game_container)
-        time.sleep(1)
+        self.wait_until_stable(mini_game_container, max_wait=1)
 
         mini_game_container.click()
 
@@ -2078,7 +2232,7 @@ class BaseTest(unittest.TestCase):
         )
         # self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", mini_game_container)
         ActionChains(self.driver).move_to_element(mini_game_container).click().perform()
-        time.sleep(1)
+        self.settle(max_wait=1)
 
         mini_game_container.click()
 
@@ -2095,18 +2249,18 @@ class BaseTest(unittest.TestCase):
         self.annoucement_close_button()
         self.daily_checkin_close_button()
 
-        time.sleep(2)
+        self.settle(max_wait=2)
 
     def checkSpinTicket(self):
         self.navigateHomePage()
-        time.sleep(2)
+        self.settle(max_wait=2)
         self.logger.info("Checking spin ticket")
         self.clickMiniGameWidget("lucky_wheel")
         self.driver.refresh()
-        time.sleep(5)
+        self.settle(max_wait=5)
         spinTicket = self.driver.find_element(By.ID, "chance-text-wrapper")
         self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", spinTicket)
-        time.sleep(1)
+        self.wait_until_stable(spinTicket, max_wait=1)
         spinTicketText = spinTicket.text
         spinTicketCount = int(''.join(filter(str.isdigit, spinTicketText)))
         self.logger.info(f"Spin ticket count: {spinTicketCount}")
@@ -2116,7 +2270,7 @@ class BaseTest(unittest.TestCase):
         driver = self.driver
         self.click_navigation_bar("footer-profile-button")
         self.driver.refresh()
-        time.sleep(2)
+        self.settle(max_wait=2)
         #id
         bb_points_element = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "bb_point_value")))
 
@@ -2128,7 +2282,7 @@ class BaseTest(unittest.TestCase):
 
     def boboLiveLogin(self, username=None, password=None):
         try:
-            time.sleep(2)
+            self.settle(max_wait=2)
             login_button = WebDriverWait(self.driver,
                                          10).until(EC.element_to_be_clickable((By.ID, "bobolive-login-button")))
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", login_button)
@@ -2145,10 +2299,10 @@ class BaseTest(unittest.TestCase):
             )
             submit_button.click()
 
-            time.sleep(5)
+            self.settle(max_wait=5)
             self.driver.refresh()
             
-            time.sleep(5)
+            self.settle(max_wait=5)
         except Exception as e:
             pass
 
@@ -2159,7 +2313,7 @@ class BaseTest(unittest.TestCase):
 
         self.logger.info("Clicking Live button")
         live_button.click()
-        time.sleep(1)
+        self.settle(max_wait=1)
 
         self.boboLiveLogin()
 
@@ -2175,7 +2329,7 @@ class BaseTest(unittest.TestCase):
         self.assertTrue(coins_amount.isdigit(), "Coins amount is not a number")
 
         self.driver.back()
-        time.sleep(1)
+        self.settle(max_wait=1)
         return int(coins_amount)
 
     def get4DCards(self):
@@ -2249,7 +2403,7 @@ class BaseTest(unittest.TestCase):
 
         finalSpinTickets = self.checkSpinTicket()
 
-        time.sleep(2)
+        self.settle(max_wait=2)
         finalBBPoints = self.checkBBPoint()
         self.logger.info(f"Final Spin tickets: {finalSpinTickets}")
         self.logger.info(f"Final BB Points: {finalBBPoints}")
@@ -2273,7 +2427,15 @@ class BaseTest(unittest.TestCase):
         self.click_navigation_bar("footer-profile-button")
         self.click_navigation_bar("settings-button")
         self.click_navigation_bar("logout-list-item")
-        time.sleep(2)
+        self.settle(max_wait=2)
+        self.forget_session()
+
+    def forget_session(self):
+        """Drop the cached token of the user logged in through perform_login, e.g. after a UI logout."""
+        username = getattr(self, "session_user", None)
+        if username:
+            self.invalidate_login(username)
+            self.session_user = None
 
     def successMessage(self, id, successMessage=None):
         try:
@@ -2295,7 +2457,7 @@ class BaseTest(unittest.TestCase):
         turnoverAPI = CREDENTIALS["CheckTurnover"].format(BO_base_url = CREDENTIALS["BO_base_url"], ID=userID, language=language)
         locked_by_list = []
 
-        response = requests.get(turnoverAPI)
+        response = http_client.get(turnoverAPI)
 
         if response.status_code == 200:
             self.logger.info(f"Turnover API Response: {response.json()}")
@@ -2335,64 +2497,60 @@ class BaseTest(unittest.TestCase):
         self.perform_login(username, password)
 
     def login(self, username, password):
-        payload = {
-            "username": username,
-            "password": password
-        }
-
-        max_retries = 3
-        retry_count = 0
-
-        while retry_count < max_retries:
-            try:
-                response = requests.post(f"{CREDENTIALS['BO_base_url']}/api/v2/login", json=payload)
-                response.raise_for_status()
-                data = response.json()
+        # While recording or replaying, every login goes through the cassette so it can tell whose token it is
+        if not TOKEN_CACHE["enabled"] or CASSETTE["mode"] != "off":
+            return self.fetch_login_token(username, password)
+        return get_token_cache().get_token(
+            CREDENTIALS['BO_base_url'], username, password, lambda: self.fetch_login_token(username, password)
+        )
 
-                if data.get("code") == 200:
-                    token = data["data"]["token"]
-                    self.logger.info("Login successful!")
-                    return token
-                else:
-                    self.logger.warning(f"Login attempt {retry_count + 1} failed: {data.get('message')}")
-                    retry_count += 1
-                    time.sleep(2)
-            except Exception as e:
-                self.logger.warning(f"Login attempt {retry_count + 1} failed with error: {str(e)}")
-                retry_count += 1
-                time.sleep(1)
+    def invalidate_login(self, username):
+        """Forget the cached token, e.g. after changing the user's password or receiving a 401."""
+        get_token_cache().invalidate(CREDENTIALS['BO_base_url'], username)
 
-        self.logger.error("Login failed after maximum retries")
-        return None
+    def cached_reference(self, name, fetch, **params):
+        """Return catalog data (VIP levels, promotions, gifts...) fetched once per run and shared by all workers.
 
-    def get_game_ids(self, headers, max_retries=3):
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(f"{CREDENTIALS['BO_base_url']}/api/transfers", headers=headers)
+        params (e.g. language) are part of the cache key; fetch() is only called on a miss.
+        """
+        if not REFERENCE_CACHE["enabled"]:
+            return fetch()
+        return get_reference_cache().get(name, fetch, base_url=CREDENTIALS['BO_base_url'], **params)
 
-                if response.status_code == 200:
-                    result = response.json().get("data")
-                    result = sorted(self.parse_game_ids(result), key=lambda x: x["id"])
-                    self.logger.info(f"Game IDs: {result}")
-                    return result
+    def invalidate_reference(self, *names):
+        """Drop cached catalogs after a test changes them, so every worker fetches them again."""
+        if REFERENCE_CACHE["enabled"]:
+            get_reference_cache().invalidate(*names)
 
-                self.logger.warning(f"Attempt {attempt + 1} failed. Status code: {response.status_code}")
+    def get_rebate_percentages(self):
+        """Return the rebate tiers of every provider from the back office."""
+        def fetch():
+            response = http_client.get(CREDENTIALS['CheckRebatePercentage'].format(BO_base_url = CREDENTIALS["BO_base_url"]))
+            if response.status_code != 200:
+                self.fail(f"Failed to check rebate percentage: {response.status_code}")
+            return response.json()
 
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2
-                    self.logger.info(f"Waiting {wait_time} seconds before retry")
-                    time.sleep(wait_time)
+        return self.cached_reference("rebate_percentages", fetch)
 
-            except requests.RequestException as e:
-                self.logger.error(f"Attempt {attempt + 1} failed. Error: {e}")
+    def fetch_login_token(self, username, password):
+        return request_login_token(username, password, self.logger)
 
-                # If not the last attempt, wait before retrying
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2
-                    self.logger.info(f"Waiting {wait_time} seconds before retry")
-                    time.sleep(wait_time)
+    def get_game_ids(self, headers, max_retries=3):
+        try:
+            response = http_client.request_with_retry(
+                "GET", f"{CREDENTIALS['BO_base_url']}/api/transfers", headers=headers, attempts=max_retries
+            )
+            if response.status_code == 200:
+                result = response.json().get("data")
+                result = sorted(self.parse_game_ids(result), key=lambda x: x["id"])
+                # Full provider list only at DEBUG; %s defers the rendering to the log writer thread
+                self.logger.debug("Game IDs: %s", result)
+                self.logger.info("Retrieved %d game IDs", len(result))
+                return result
+            self.logger.warning(f"Failed to retrieve game IDs. Status code: {response.status_code}")
+        except requests.RequestException as e:
+            self.logger.error(f"Failed to retrieve game IDs. Error: {e}")
 
-        # If all attempts fail
         self.logger.error("Failed to retrieve game IDs after all retries")
         return []
 
@@ -2420,7 +2578,7 @@ class BaseTest(unittest.TestCase):
 
     def navigate_to_transfer(self):
         self.navigate_to_reload_page("transfer")
-        time.sleep(2)
+        self.settle(max_wait=2)
 
     def generate_valid_phone(self):
         phone = "1"
@@ -2431,15 +2589,19 @@ class BaseTest(unittest.TestCase):
         return f"{phone}{remaining_digits}"
 
     def get_vip_levels(self, language=None):
-        token = self.login(self.username, self.password)
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Language": language if language else self.language
-        }
-        response = requests.get(f"{API_URL}/api/uservip", headers=headers)
-        response.raise_for_status()
-        vip_levels = response.json().get("data")
-        return vip_levels
+        language = language if language else self.language
+
+        def fetch():
+            token = self.login(self.username, self.password)
+            headers = {
+                "Authorization": f"Bearer {token}",
+                "Language": language
+            }
+            response = http_client.get(f"{API_URL}/api/uservip", headers=headers)
+            response.raise_for_status()
+            return response.json().get("data")
+
+        return self.cached_reference("vip_levels", fetch, language=language)
 
     def performWithdrawTest(self, is_reject=False, is_processing=False):
         try:
@@ -2450,7 +2612,7 @@ class BaseTest(unittest.TestCase):
 
             amount = WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable((By.ID, "reload-amount-input")))
             self.driver.execute_script("arguments[0].scrollIntoView(true);", amount)
-            time.sleep(1)
+            self.wait_until_stable(amount, max_wait=1)
             cleanAmount = self.getWithdrawableAmount()
 
             maxAmount = int(float(cleanAmount))
@@ -2465,13 +2627,13 @@ class BaseTest(unittest.TestCase):
             amount.clear()
             amount.send_keys(str(withdrawBalance))
             self.logger.info(f"Entered value: {amount.get_attribute('value')}")
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             self.generic_submit(expected_result="success", submit="submit-withdraw-button")
 
             ID = self.get_id_number()
             self.handleWithdrawRequest(ID, isReject=is_reject, isProcessing=is_processing)
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             finalBalance = self.extract_total_balance()
             if is_reject:
@@ -2489,7 +2651,7 @@ class BaseTest(unittest.TestCase):
             turnoverAPI = CREDENTIALS["CheckTurnover"].format(BO_base_url = CREDENTIALS["BO_base_url"], ID=userID, language=language)
             turnover_ids = []
 
-            response = requests.get(turnoverAPI)
+            response = http_client.get(turnoverAPI)
             if response.status_code == 200:
                 turnoverData = response.json()
                 self.logger.info(f"Turnover data: {turnoverData}")
@@ -2533,7 +2695,7 @@ class BaseTest(unittest.TestCase):
                 modify_url = CREDENTIALS["ModifyTurnover"].format(BO_base_url = CREDENTIALS["BO_base_url"], userID=userID, turnover_id=turnover_id, action=action)
                 self.logger.info(f"Attempting to {action_type} turnover ID: {turnover_id}")
 
-                response = requests.get(modify_url)
+                response = http_client.get(modify_url)
                 if response.status_code == 200:
                     self.logger.info(f"Successfully {action_type} turnover ID: {turnover_id}")
                 else:
@@ -2553,7 +2715,7 @@ class BaseTest(unittest.TestCase):
         headers = {
             "Authorization": f"Bearer {token}",
         }
-        response = requests.get(f"{API_URL}/api/user", headers=headers)
+        response = http_client.get(f"{API_URL}/api/user", headers=headers)
         response.raise_for_status()
         vip_id = response.json().get("data")["vip"]
         return vip_id
@@ -2565,7 +2727,7 @@ class BaseTest(unittest.TestCase):
             "Accept": "application/json",
             "Content-Type": "application/json"
         }
-        response = requests.get(f"{CREDENTIALS['BO_base_url']}/api/user", headers=headers)
+        response = http_client.get(f"{CREDENTIALS['BO_base_url']}/api/user", headers=headers)
         return response.json().get("data")["id"]
 
     def get_user_vip_id(self):
@@ -2573,7 +2735,7 @@ class BaseTest(unittest.TestCase):
         headers = {
             "Authorization": f"Bearer {token}",
         }
-        response = requests.get(f"{API_URL}/api/user", headers=headers)
+        response = http_client.get(f"{API_URL}/api/user", headers=headers)
         response.raise_for_status()
         vip_id = response.json().get("data")["vip"]
         return vip_id
@@ -2584,7 +2746,7 @@ class BaseTest(unittest.TestCase):
             "Authorization": f"Bearer {token}",
             "Language": language if language else self.language
         }
-        response = requests.get(f"{API_URL}/api/user", headers=headers)
+        response = http_client.get(f"{API_URL}/api/user", headers=headers)
         response.raise_for_status()
         user_info = response.json().get("data")
         return user_info.get(info_name)
@@ -2600,29 +2762,29 @@ class BaseTest(unittest.TestCase):
         # Scroll to element and click
         self.logger.info("Scrolling to 4D tab")
         self.driver.execute_script("arguments[0].scrollIntoView(true);", tab_button)
-        time.sleep(1)
+        self.wait_until_stable(tab_button, max_wait=1)
 
         self.logger.info("Clicking 4D tab")
         self.driver.execute_script("arguments[0].click();", tab_button)
-        time.sleep(3)
+        self.settle(max_wait=3)
     
     def bobolive_topup_diamond(self):
         self.logger.info("Topping up diamond")
         self.navigate_to_live_page()
         topup_button = self.driver.find_element(By.ID, "bobolive-topup-button")
         topup_button.click()
-        time.sleep(3)
+        self.settle(max_wait=3)
         amount_element = self.driver.find_element(By.ID, "amount")
         amount_element.click()
         amount_element.send_keys("30")
-        time.sleep(2)
+        self.settle(max_wait=2)
         self.driver.find_element(By.ID, "bobolive-topup-submit-button").click()
-        time.sleep(5)
+        self.settle(max_wait=5)
         self.paymentGateway()
-        time.sleep(2)
+        self.settle(max_wait=2)
         self.success_icon()
         self.confirm_button()
-        time.sleep(2)
+        self.settle(max_wait=2)
     
     def add_4d_cards_api(self, userID, amount):
         token = self.login(self.username, self.password)
@@ -2635,7 +2797,7 @@ class BaseTest(unittest.TestCase):
             "amount": str(amount),
             "pass": "123456",
         }
-        response = requests.post(f"{CREDENTIALS['Add4dCards'].format(BO_base_url = CREDENTIALS["BO_base_url"])}", headers=headers, json=data)
+        response = http_client.post(f"{CREDENTIALS['Add4dCards'].format(BO_base_url = CREDENTIALS["BO_base_url"])}", headers=headers, json=data)
         response.raise_for_status()
     
     def get_4d_history_api(self, four_d_number="", start_date="", end_date="", is_won="", page="", per_page=""):
@@ -2651,7 +2813,7 @@ class BaseTest(unittest.TestCase):
             "page": page,
             "per_page": per_page,
         }
-        response = requests.post(f"{CREDENTIALS['Get4dHistory'].format(BO_base_url = CREDENTIALS["BO_base_url"])}", headers=headers, json=data)
+        response = http_client.post(f"{CREDENTIALS['Get4dHistory'].format(BO_base_url = CREDENTIALS["BO_base_url"])}", headers=headers, json=data)
         response.raise_for_status()
         return response.json().get("data")
     
@@ -2693,12 +2855,12 @@ class BaseTest(unittest.TestCase):
             'Authorization': f"Bearer {token}"
             }
             
-            self.logger.info(f"Payload: {payload}")
-            
+            self.logger.debug("Payload: %s", payload)
 
-            response = requests.request("POST", url, headers=headers, data=payload, files=files)
+            response = http_client.request("POST", url, headers=headers, data=payload, files=files)
 
-            self.logger.info(response.text)
+            self.logger.info("Bet response %s", response.status_code)
+            self.logger.debug("Bet response body: %s", response.text)
         
         except requests.exceptions.RequestException as e:
             self.logger.error(f"API request failed: {str(e)}")
@@ -2722,7 +2884,7 @@ class BaseTest(unittest.TestCase):
         'Authorization': f"Bearer {token}"
         }
 
-        response = requests.request("POST", CREDENTIALS['UpdateBetResult'].format(BO_base_url = CREDENTIALS["BO_base_url"]), headers=headers, data=payload, files=files)
+        response = http_client.request("POST", CREDENTIALS['UpdateBetResult'].format(BO_base_url = CREDENTIALS["BO_base_url"]), headers=headers, data=payload, files=files)
         response.raise_for_status()
 
     def check_contact_us(self, target_platform):
@@ -2730,19 +2892,23 @@ class BaseTest(unittest.TestCase):
         if not contact_us_api:
             self.fail("ContactUs API URL is missing in CREDENTIALS")
 
-        self.logger.info(f"Making request to contact API: {contact_us_api}")
+        contact_us_api = contact_us_api.format(BO_base_url = CREDENTIALS["BO_base_url"])
 
-        try:
-            response = requests.get(contact_us_api, timeout=10)
-            response.raise_for_status()
-        except requests.RequestException as e:
-            self.fail(f"Failed to fetch contact information: {str(e)}")
+        def fetch():
+            self.logger.info(f"Making request to contact API: {contact_us_api}")
+            try:
+                response = http_client.get(contact_us_api, timeout=10)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                self.fail(f"Failed to fetch contact information: {str(e)}")
 
-        try:
-            contact_us_data = response.json()
-            self.logger.info(f"Raw API response: {contact_us_data}")
-        except json.JSONDecodeError:
-            self.fail("Failed to parse contact information response as JSON")
+            try:
+                return response.json()
+            except json.JSONDecodeError:
+                self.fail("Failed to parse contact information response as JSON")
+
+        contact_us_data = self.cached_reference("contact_us", fetch)
+        self.logger.info(f"Raw API response: {contact_us_data}")
 
             # Handle the case where "value" is a JSON string that needs to be parsed again
         value_data = contact_us_data.get("data", {}).get("value", "")
@@ -2782,11 +2948,15 @@ class BaseTest(unittest.TestCase):
         WebDriverWait(self.driver, 10).until(lambda d: len(d.window_handles) > 1)
         self.driver.switch_to.window(self.driver.window_handles[-1])
 
-        if self.browser == "firefox":
-            time.sleep(5)
-            current_url = self.driver.current_url
-        else:
-            current_url = self.driver.current_url
+        # The new window opens on about:blank (for several seconds in Firefox) before it redirects
+        try:
+            WebDriverWait(self.driver, 10).until(lambda d: d.current_url == ai_whatsapp_url)
+        except TimeoutException:
+            pass
+        current_url = self.driver.current_url
         self.logger.info(f"Redirected to URL: {current_url}")
 
         self.assertEqual(current_url, ai_whatsapp_url, f"Not redirected to expected URL. Got: {current_url}")
+
+
+instrument_helpers(BaseTest)
@@ -7,6 +7,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from config.constant import LANGUAGE_SETTINGS, CREDENTIALS
 from tests.authentication_test.base_test import BaseTest
+from utils.logs import get_logger
 
 # test_05_WrongOldPassword and test_03_SuccessReset
 
@@ -17,27 +18,13 @@ class TestPasswordPage(BaseTest):
         super().__init__(methodName)
         self.language = language
         self.browser = browser
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.INFO)
-
-        for handler in self.logger.handlers[:]:
-            self.logger.removeHandler(handler)
-
-        file_handler = logging.FileHandler("test_forgotPassword_output.log")
-        file_handler.setLevel(logging.INFO)
-
-        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        file_handler.setFormatter(formatter)
-
-        self.logger.addHandler(file_handler)
-
-        self.logger.propagate = False
+        self.logger = get_logger(__name__, "test_forgotPassword_output.log", "%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
     def setUp(self):
         if not self.browser or not self.language:
             raise ValueError("Browser or language is not set.")
         self.logger.info(f"Setting up {self.browser} browser for {self.language} language...")
-        self.driver = self.initialize_browser(self.browser)
+        self.driver = self.acquire_browser(self.browser)
         self.url = LANGUAGE_SETTINGS[self.language]["home_url"]
         self.driver.get(self.url)
         #self.driver.maximize_window()
@@ -49,7 +36,7 @@ class TestPasswordPage(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
 
     def fill_password_fields(self, password_data):
         driver = self.driver
@@ -8,6 +8,8 @@ from .base_test import BaseTest, ContinueOnFailureTestResult
 
 
 class TestLogin(BaseTest):
+    # These tests cover the login form, so never log in by session injection
+    UI_LOGIN = True
 
     def __init__(self, methodName="runTest", language=None, browser=None):
         super().__init__(methodName, language, browser)
@@ -18,7 +20,7 @@ class TestLogin(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
 
     def generic_login(self, username, password, expected_result="success"):
         try:
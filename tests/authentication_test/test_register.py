@@ -39,7 +39,7 @@ class TestRegister(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
 
     def get_field(self, field_name):
         locator_type, locator_value = self.field_locators[field_name]
@@ -37,12 +37,12 @@ class TestSetting(BaseTest):
         except Exception as e:
             self.logger.error(f"Setup failed: {str(e)}")
             if hasattr(self, 'driver'):
-                self.driver.quit()
+                self.release_browser()
             raise
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
 
     def click_confirm_button(self):
         driver = self.driver
@@ -628,7 +628,7 @@ class TestSetting(BaseTest):
             self.confirm_button()
             try:
                 self.click_navigation_bar("logout-list-item")
-                self.perform_login(self.username, new_password)
+                self.perform_login(self.username, new_password, via_ui=True)
                 self.verify_login(self.username)
             except Exception as e:
                 self.logger.error(f"Failed to verify new password: {str(e)}")
@@ -692,6 +692,7 @@ class TestSetting(BaseTest):
             self.click_navigation_bar("logout-list-item")
             try:
                 WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.ID, "loginButton")))
+                self.forget_session()
             except Exception as e:
                 self.logger.error(f"Failed to verify logout: {str(e)}")
                 self.fail(f"Failed to verify logout: {str(e)}")
@@ -28,7 +28,7 @@ class TestBankTransfer(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
 
     def navigate_to_bank_transfer(self):
 
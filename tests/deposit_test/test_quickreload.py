@@ -39,7 +39,7 @@ class TestQuickReload(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
 
     def navigate_to_quickreload(self):
 
@@ -51,25 +51,6 @@ class TestQuickReload(BaseTest):
         bank_transfer.click()
         time.sleep(2)
 
-    def get_all_button_texts(self):
-
-        driver = self.driver
-
-        buttons = WebDriverWait(driver, 10).until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "button.MuiButton-outlinedPrimary"))
-        )
-
-        button_texts = []
-
-        for button in buttons:
-            try:
-                button_text = button.find_element(By.CSS_SELECTOR, "p.MuiTypography-root").text.strip()
-                button_texts.append(button_text)
-            except Exception as e:
-                self.logger.error(f"Failed to get text from button: {str(e)}")
-
-        return button_texts
-
     def paymentGateway(self):
         WebDriverWait(self.driver, 10).until(EC.visibility_of_element_located((By.CLASS_NAME, "swal2-success-ring")))
         dummyBank = WebDriverWait(self.driver,
@@ -0,0 +1,58 @@
+import unittest
+from utils.load import LoadProfile
+
+
+class TestLoadProfile(unittest.TestCase):
+    """Arrival schedules of LoadProfile; needs neither a browser nor the back office."""
+
+    RATE = 5
+    RAMP_UP = 30
+    STEADY = 120
+    RAMP_DOWN = 30
+
+    def make_profile(self, arrivals, rate=RATE):
+        return LoadProfile(rate, ramp_up=self.RAMP_UP, steady=self.STEADY, ramp_down=self.RAMP_DOWN, arrivals=arrivals)
+
+    def assertClose(self, actual, expected, tolerance, what):
+        self.assertLessEqual(
+            abs(actual - expected), tolerance, f"{what}: {actual} arrivals, expected {expected} +/- {tolerance}"
+        )
+
+    def test_expected_arrivals(self):
+        profile = self.make_profile("uniform")
+        self.assertEqual(profile.expected_arrivals(self.RAMP_UP), self.RATE * self.RAMP_UP / 2)
+        self.assertEqual(profile.expected_arrivals(profile.duration), 750)
+        for t in (0, 10, 30, 90, 150, 165, 180):
+            self.assertAlmostEqual(profile.time_of(profile.expected_arrivals(t)), t)
+
+    def test_uniform_arrivals(self):
+        for rate in (5, 20):
+            profile = self.make_profile("uniform", rate)
+            times = list(profile.schedule())
+            ramp_up = sum(1 for t in times if t < self.RAMP_UP)
+            self.assertClose(ramp_up, rate * self.RAMP_UP / 2, 1, f"uniform ramp-up at {rate}/s")
+            self.assertClose(len(times), profile.expected_arrivals(profile.duration), 1, f"uniform run at {rate}/s")
+            self.assertEqual(times, sorted(times))
+
+    def test_poisson_arrivals(self):
+        for rate in (5, 20):
+            profile = self.make_profile("poisson", rate)
+            expected_ramp_up = rate * self.RAMP_UP / 2
+            expected_total = profile.expected_arrivals(profile.duration)
+            for seed in range(4):
+                times = list(profile.schedule(seed))
+                ramp_up = sum(1 for t in times if t < self.RAMP_UP)
+                # Poisson counts have a standard deviation of sqrt(mean); 4 of them leaves no room for flakes
+                self.assertClose(ramp_up, expected_ramp_up, 4 * expected_ramp_up ** 0.5,
+                                 f"poisson ramp-up at {rate}/s, seed {seed}")
+                self.assertClose(len(times), expected_total, 4 * expected_total ** 0.5,
+                                 f"poisson run at {rate}/s, seed {seed}")
+                self.assertTrue(all(0 < t < profile.duration for t in times))
+
+    def test_without_ramps(self):
+        profile = LoadProfile(5, ramp_up=0, steady=10, ramp_down=0, arrivals="uniform")
+        self.assertClose(len(list(profile.schedule())), 50, 1, "uniform without ramps")
+
+
+if __name__ == "__main__":
+    unittest.main()
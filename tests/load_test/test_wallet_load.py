@@ -0,0 +1,142 @@
+import unittest
+from datetime import datetime, timezone
+from config.constant import API_URL, CREDENTIALS, SCENARIOS
+from tests.api_base import ApiTestBase
+from tests.test_init import TestInit
+from utils import http_client
+from utils.load import StepFailed, VirtualUser
+from utils.scenarios import ScenarioEngine, configured_scenarios
+
+
+class TestWalletLoad(ApiTestBase):
+    """Mixed wallet traffic: the journeys in SCENARIOS, built from the same helpers the functional tests use.
+
+    Each simulated user gets its own TestInit holding its account, so helpers that read self.username and
+    self.password (bet_4d_api, get_user_id) act for that user.
+    """
+
+    def scenario_actions(self):
+        return {
+            "register": self.register,
+            "login": self.login_user,
+            "deposit": self.deposit,
+            "approve": self.approve_deposit,
+            "transfer": self.transfer,
+            "withdraw": self.withdraw,
+            "approve_withdraw": self.approve_withdraw,
+            "bet_4d": self.bet_4d,
+            "checkin": self.check_in,
+            "mission": self.mission,
+        }
+
+    def make_client(self, index):
+        return TestInit(methodName="runTest", language=self.language, browser=self.browser)
+
+    def register(self, user):
+        client = user.context
+        username, password = client.create_new_account()
+        if not username:
+            raise StepFailed("registration failed")
+        client.username, client.password = username, password
+        user.data.clear()
+
+    def login_user(self, user):
+        client = user.context
+        if not getattr(client, "username", None):
+            self.register(user)
+        token = client.fetch_login_token(client.username, client.password)
+        if not token:
+            raise StepFailed("login failed")
+        user.data["headers"] = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+        if "user_id" not in user.data:
+            user.data["user_id"] = client.get_user_id_api(client.username, client.password)
+
+    def deposit(self, user):
+        client = user.context
+        amount = user.rng.randint(*SCENARIOS["deposit_amount"])
+        if not client.submit_deposit_api(amount=amount, username=client.username, password=client.password):
+            raise StepFailed("deposit rejected")
+
+    def approve_deposit(self, user):
+        user.context.handleDeposit(user.data["user_id"])
+
+    def transfer(self, user):
+        client = user.context
+        if "providers" not in user.data:
+            games = client.get_game_ids(user.data["headers"])
+            user.data["providers"] = [game["id"] for game in games if game["id"] > 0]
+        if not user.data["providers"]:
+            raise StepFailed("no providers")
+        response = client.make_transfer(
+            user.data["headers"], source_id=0, target_id=user.rng.choice(user.data["providers"]),
+            amount=user.rng.randint(*SCENARIOS["transfer_amount"])
+        )
+        if response.status_code != 200:
+            raise StepFailed(f"HTTP {response.status_code}")
+
+    def withdraw(self, user):
+        client = user.context
+        amount = user.rng.randint(*SCENARIOS["withdraw_amount"])
+        if not client.withdraw_api(amount=amount, username=client.username, password=client.password):
+            raise StepFailed("withdraw rejected")
+
+    def approve_withdraw(self, user):
+        user.context.handleWithdrawRequest(user.data["user_id"])
+
+    def bet_4d(self, user):
+        # Posts directly with the session's headers: bet_4d_api logs in again, looks the user up and swallows errors
+        bet_time = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        bet_number = user.rng.randint(1000, 9999)
+        response = http_client.post(
+            CREDENTIALS["Bet4d"], headers=user.data["headers"],
+            data={
+                "pass": "123456",
+                "user_id": user.data["user_id"],
+                "bet_number": bet_number,
+                "bet_number_list": bet_number,
+                "bet_dates": bet_time.split("T")[0],
+                "bet_platforms": "GD",
+                "source": "whitelabel",
+                "B": user.rng.choice([0.5, 1.0, 1.5]),
+                "type": "coupon",
+                "coupon_id": "2",
+                "user_bet_time": bet_time,
+                "show_id": "-1",
+                "user_bet_date": bet_time.split("T")[0],
+            }
+        )
+        VirtualUser.check(response)
+
+    def check_in(self, user):
+        response = http_client.get(
+            f"{API_URL}/api/simulate-checkin?user_id={user.data['user_id']}&days=1&passcode=99999&last_check_in_days=1"
+        )
+        if response.status_code != 200:
+            raise StepFailed(f"HTTP {response.status_code}")
+
+    def mission(self, user):
+        response = http_client.get(
+            f"{API_URL}/api/simulate-daily-mission?passcode=99999&user_id={user.data['user_id']}",
+            headers=user.data["headers"]
+        )
+        if response.status_code != 200:
+            raise StepFailed(f"HTTP {response.status_code}")
+
+    @unittest.skipUnless(SCENARIOS["enabled"], "Scenario load test is opt-in, see SCENARIOS in config")
+    def test_mixed_workload(self):
+        engine = ScenarioEngine(configured_scenarios(), self.scenario_actions(), make_context=self.make_client)
+        self.logger.info(
+            f"Starting mixed workload: {engine.population} users over {engine.ramp_up}s for {engine.duration}s, "
+            f"think time {engine.think_time}s"
+        )
+        engine.run()
+        engine.log_summary(self.logger)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        engine.write_report(f"test_results/wallet_load_test_{timestamp}.xlsx")
+        completed = sum(count for (_, outcome), count in engine.journeys.items() if outcome == "completed")
+        self.assertTrue(completed > 0, "No journey completed")
+
+
+if __name__ == "__main__":
+    unittest.main()
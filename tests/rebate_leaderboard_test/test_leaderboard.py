@@ -3,6 +3,7 @@ import time
 import logging
 import random
 import requests
+from utils import http_client
 import re
 import json
 from selenium.webdriver.common.by import By
@@ -59,7 +60,7 @@ class TestLeaderboard(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
 
     def find_element_by_id(self, element_id, wait_time=10):
         try:
@@ -142,6 +143,8 @@ class TestLeaderboard(BaseTest):
             self.logger.info("Collecting comprehensive leaderboard ranking information")
 
             all_rankings = []
+            # One round-trip for every name/turnover/member cell on the board
+            texts = self.texts_by_id("[id^='reward-']")
 
             overall_position = 1
 
@@ -150,13 +153,9 @@ class TestLeaderboard(BaseTest):
                 ranking_info["ranking_type"] = "top"
 
                 try:
-                    name_id = f"reward-name-top-3-{i}"
-                    name_element = self.driver.find_element(By.ID, name_id)
-                    ranking_info["name"] = name_element.text.strip()
+                    ranking_info["name"] = texts[f"reward-name-top-3-{i}"]
 
-                    turnover_id = f"reward-turnover-top-3-{i}"
-                    turnover_element = self.driver.find_element(By.ID, turnover_id)
-                    turnover_text = turnover_element.text.strip()
+                    turnover_text = texts[f"reward-turnover-top-3-{i}"]
 
                     clean_turnover = turnover_text.replace("RM", "").replace(",", "").strip()
                     ranking_info["turnover_raw"] = turnover_text
@@ -167,9 +166,7 @@ class TestLeaderboard(BaseTest):
                         ranking_info["turnover"] = 0
                         self.logger.warning(f"Could not convert turnover value '{clean_turnover}' to float")
 
-                    member_id = f"reward-effective-new-add-top-3-{i}"
-                    member_element = self.driver.find_element(By.ID, member_id)
-                    member_text = member_element.text.strip()
+                    member_text = texts[f"reward-effective-new-add-top-3-{i}"]
 
                     member_count_match = re.search(r'Member:\s*(\d+)', member_text)
                     if member_count_match:
@@ -184,7 +181,7 @@ class TestLeaderboard(BaseTest):
                     self.logger.info(f"Collected ranking {overall_position}: {ranking_info}")
                     overall_position += 1
 
-                except NoSuchElementException:
+                except KeyError:
                     self.logger.warning(f"Could not find all elements for top position {i+1}")
                     continue
 
@@ -194,13 +191,9 @@ class TestLeaderboard(BaseTest):
                     ranking_info = {}
                     ranking_info["ranking_type"] = "regular"
 
-                    name_id = f"reward-name-ranking-{rank_index}"
-                    name_element = self.driver.find_element(By.ID, name_id)
-                    ranking_info["name"] = name_element.text.strip()
+                    ranking_info["name"] = texts[f"reward-name-ranking-{rank_index}"]
 
-                    turnover_id = f"reward-turnover-ranking-{rank_index}"
-                    turnover_element = self.driver.find_element(By.ID, turnover_id)
-                    turnover_text = turnover_element.text.strip()
+                    turnover_text = texts[f"reward-turnover-ranking-{rank_index}"]
 
                     turnover_match = re.search(r'Turnover:\s*RM\s*([\d,.]+)', turnover_text)
                     if turnover_match:
@@ -216,9 +209,7 @@ class TestLeaderboard(BaseTest):
                         ranking_info["turnover"] = 0
                         ranking_info["turnover_raw"] = turnover_text
 
-                    member_id = f"reward-effective-new-add-ranking-{rank_index}"
-                    member_element = self.driver.find_element(By.ID, member_id)
-                    member_text = member_element.text.strip()
+                    member_text = texts[f"reward-effective-new-add-ranking-{rank_index}"]
 
                     member_count_match = re.search(r'Member:\s*(\d+)', member_text)
                     if member_count_match:
@@ -235,7 +226,7 @@ class TestLeaderboard(BaseTest):
 
                     rank_index += 1
 
-                except NoSuchElementException:
+                except KeyError:
                     # No more rankings found, exit loop
                     self.logger.info(f"Found {len(all_rankings)} rankings in total")
                     break
@@ -457,23 +448,27 @@ class TestLeaderboard(BaseTest):
             if not leaderboard_tnc_api:
                 self.fail("LeaderBoardTnc API URL is missing in CREDENTIALS")
 
-            self.logger.info(f"Making request to LeaderBoardTnc API: {leaderboard_tnc_api}")
+            leaderboard_tnc_api = leaderboard_tnc_api.format(BO_base_url = CREDENTIALS["BO_base_url"])
 
-            headers = {
-                "Language": self.language
-            }
-            try:
-                response = requests.get(leaderboard_tnc_api, headers=headers)
-                response.raise_for_status()
-            except requests.RequestException as e:
-                self.fail(f"Failed to fetch contact information: {str(e)}")
+            def fetch():
+                self.logger.info(f"Making request to LeaderBoardTnc API: {leaderboard_tnc_api}")
+                headers = {
+                    "Language": self.language
+                }
+                try:
+                    response = http_client.get(leaderboard_tnc_api, headers=headers)
+                    response.raise_for_status()
+                except requests.RequestException as e:
+                    self.fail(f"Failed to fetch contact information: {str(e)}")
 
-            # Parse JSON response
-            try:
-                leaderboard_tnc_data = response.json()
-                self.logger.info(f"Raw API response: {leaderboard_tnc_data}")
-            except json.JSONDecodeError:
-                self.fail("Failed to parse contact information response as JSON")
+                # Parse JSON response
+                try:
+                    return response.json()
+                except json.JSONDecodeError:
+                    self.fail("Failed to parse contact information response as JSON")
+
+            leaderboard_tnc_data = self.cached_reference("leaderboard_tnc", fetch, language=self.language)
+            self.logger.info(f"Raw API response: {leaderboard_tnc_data}")
 
             # Extract TnC content from API
             value_data = leaderboard_tnc_data.get("data", {}).get("tnc", "")
@@ -586,7 +581,7 @@ class TestLeaderboard(BaseTest):
 
             time.sleep(10)
             check_ranking_api = CREDENTIALS['CheckRanking']
-            response = requests.get(check_ranking_api)
+            response = http_client.get(check_ranking_api)
             if response.status_code != 200:
                 self.fail(f"Failed to check ranking: {response.status_code}")
             else:
@@ -2,7 +2,7 @@ import unittest
 import time
 import logging
 import random
-import requests
+from utils import http_client
 import re
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -57,7 +57,7 @@ class TestRebate(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
 
     def navigate_to_rebate_record(self, tab_name):
         rebate_section = self.driver.find_element(By.ID, "home-rebate-button")
@@ -80,31 +80,41 @@ class TestRebate(BaseTest):
         try:
             WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.ID, "t1_paper")))
 
+            # Every value on the rebate card in one round-trip; total_rebate_value is rendered more than once
+            elements = self.snapshot("[id$='_turnover_value'], [id$='_rebate_value'], #month-select")
+            texts = {}
+            for element in elements:
+                texts.setdefault(element["id"], element["text"])
+            missing = {"t1_turnover_value", "t2_turnover_value", "t3_turnover_value", "total_turnover_value",
+                       "t1_rebate_value", "t2_rebate_value", "t3_rebate_value", "month-select"} - texts.keys()
+            if missing:
+                raise NoSuchElementException(f"Rebate values not found: {sorted(missing)}")
+
             turnover_values = {
-                "tier1": self.driver.find_element(By.ID, "t1_turnover_value").text,
-                "tier2": self.driver.find_element(By.ID, "t2_turnover_value").text,
-                "tier3": self.driver.find_element(By.ID, "t3_turnover_value").text,
-                "total": self.driver.find_element(By.ID, "total_turnover_value").text
+                "tier1": texts["t1_turnover_value"],
+                "tier2": texts["t2_turnover_value"],
+                "tier3": texts["t3_turnover_value"],
+                "total": texts["total_turnover_value"]
             }
 
             rebate_values = {
-                "tier1": self.driver.find_element(By.ID, "t1_rebate_value").text,
-                "tier2": self.driver.find_element(By.ID, "t2_rebate_value").text,
-                "tier3": self.driver.find_element(By.ID, "t3_rebate_value").text
+                "tier1": texts["t1_rebate_value"],
+                "tier2": texts["t2_rebate_value"],
+                "tier3": texts["t3_rebate_value"]
             }
 
-            try:
-                total_rebate_elements = self.driver.find_elements(By.ID, "total_rebate_value")
-                total_rebate_value = total_rebate_elements[-1].text
+            total_rebate_elements = [element["text"] for element in elements if element["id"] == "total_rebate_value"]
+            if total_rebate_elements:
+                total_rebate_value = total_rebate_elements[-1]
                 if total_rebate_value.strip() == "MYR" and len(total_rebate_elements) > 1:
-                    total_rebate_value = f"MYR {total_rebate_elements[1].text}"
-            except Exception as e:
-                self.logger.warning(f"Error getting total rebate value: {str(e)}")
+                    total_rebate_value = f"MYR {total_rebate_elements[1]}"
+            else:
+                self.logger.warning("Error getting total rebate value: element not found")
                 total_rebate_value = "MYR 0.00"
 
             rebate_values["total"] = total_rebate_value
 
-            selected_month = self.driver.find_element(By.ID, "month-select").text
+            selected_month = texts["month-select"]
 
             clean_values = {
                 "turnover": {},
@@ -274,35 +284,17 @@ class TestRebate(BaseTest):
                     "language": self.language
                 }
 
-                max_api_retries = 3
-                api_retry_count = 0
                 rebate_api_record = None
-                
-                while api_retry_count < max_api_retries:
-                    try:
-                        rebate_api_record_response = requests.get(api_url, headers=headers, timeout=30)
-                        if rebate_api_record_response.status_code == 200:
-                            rebate_api_record = rebate_api_record_response.json()
-                            break
-                        elif rebate_api_record_response.status_code == 524:
-                            api_retry_count += 1
-                            self.logger.warning(f"Server timeout (524) on attempt {api_retry_count}")
-                            if api_retry_count < max_api_retries:
-                                time.sleep(5)  
-                            else:
-                                self.logger.error("Server timeout after maximum retries")
-                                return None, None
-                        else:
-                            self.logger.error(f"API request failed with status code: {rebate_api_record_response.status_code}")
-                            return None, None
-                    except Exception as e:
-                        api_retry_count += 1
-                        self.logger.warning(f"API request attempt {api_retry_count} failed: {str(e)}")
-                        if api_retry_count < max_api_retries:
-                            time.sleep(2)
-                        else:
-                            self.logger.error("Failed to get API records after maximum retries")
-                            return None, None
+                try:
+                    rebate_api_record_response = http_client.request_with_retry("GET", api_url, headers=headers)
+                    if rebate_api_record_response.status_code == 200:
+                        rebate_api_record = rebate_api_record_response.json()
+                    else:
+                        self.logger.error(f"API request failed with status code: {rebate_api_record_response.status_code}")
+                        return None, None
+                except Exception as e:
+                    self.logger.error(f"Failed to get API records after maximum retries: {str(e)}")
+                    return None, None
 
                 if not rebate_api_record:
                     return None, None
@@ -873,12 +865,7 @@ class TestRebate(BaseTest):
 
     def check_rebate_percentage(self,provider_id,tier_level):
 
-        check_rebate_percentage = CREDENTIALS['CheckRebatePercentage']
-        response = requests.get(check_rebate_percentage)
-        if response.status_code != 200:
-            self.fail(f"Failed to check rebate percentage: {response.status_code}")
-
-        rebate_data = response.json()
+        rebate_data = self.get_rebate_percentages()
         for provider in rebate_data.get("data", []):
             if provider_id == provider.get("provider_id"):
                 rebate_percentage = provider.get("rebate_percentage", {}).get(tier_level, 0)
@@ -933,7 +920,7 @@ class TestRebate(BaseTest):
             self.logger.info(f"Rebate amount (float): {rebate_amount}")
 
             approve_rebate_url = CREDENTIALS['ApproveRebate'].format(userID=self.userID)
-            response = requests.get(approve_rebate_url)
+            response = http_client.get(approve_rebate_url)
             if response.status_code != 200:
                 self.fail(f"Failed to approve rebate: {response.status_code}")
             else:
@@ -15,6 +15,7 @@ import math
 
 class TestRevert(TransferBase):
 
+    ORDERED_TESTS = True
     BATCH_SIZE = int(CREDENTIALS['revert_batch_size']['batch_size'])
     _test_methods_generated = False
 
@@ -75,7 +76,7 @@ class TestRevert(TransferBase):
         try:
             if hasattr(self, 'driver') and self.driver and not self.browser_closed:
                 self.logger.info("Closing browser...")
-                self.driver.quit()
+                self.release_browser()
                 self.driver = None
                 self.browser_closed = True
         except Exception as e:
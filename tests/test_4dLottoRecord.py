@@ -17,6 +17,7 @@ import io
 from pyzbar.pyzbar import decode
 from urllib.parse import urlparse, parse_qs
 from tests.test_init import TestInit
+from utils.logs import get_logger
 from typing import Dict, Any, Optional, List, Union, Tuple, BinaryIO, TypeVar, Type
 import requests
 import math
@@ -32,14 +33,7 @@ class Test4dLottoRecord(BaseTest):
         super().__init__(methodName)
         self.language = language
         self.browser = browser
-        self.logger = logging.getLogger(f"{self.__class__.__name__}")
-        self.logger.setLevel(logging.INFO)
-        self.logger.propagate = False
-
-        if not self.logger.handlers:
-            handler = logging.FileHandler('4d_lotto_record.log')
-            handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-            self.logger.addHandler(handler)
+        self.logger = get_logger(self.__class__.__name__, "4d_lotto_record.log", "%(asctime)s - %(levelname)s - %(message)s")
 
         self.test_init = TestInit(methodName="runTest", language=language, browser=browser)
 
@@ -47,7 +41,7 @@ class Test4dLottoRecord(BaseTest):
         if not self.browser or not self.language:
             raise ValueError("Browser or language is not set.")
         self.logger.info(f"Setting up {self.browser} browser for {self.language} language...")
-        self.driver = self.initialize_browser(self.browser)
+        self.driver = self.acquire_browser(self.browser)
         self.url = LANGUAGE_SETTINGS[self.language]["home_url"]
         self.driver.get(self.url)
         # self.driver.maximize_window()
@@ -56,7 +50,7 @@ class Test4dLottoRecord(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
     
     def setup_test_user(self, register_new=False):
         """Set up test user - either create new or use existing"""
@@ -139,7 +133,7 @@ class Test4dLottoRecord(BaseTest):
     def enter_number_card(self, need_click_stack=True, need_verify_number_card=True, need_delete_existing_number=False, value_enter="", expected_value=""):
         if need_click_stack:
             self.click_number_stack()
-        time.sleep(2)
+        self.settle(max_wait=2)
         number_cards = self.driver.find_elements(By.CSS_SELECTOR, "[id^='four-digit-']")
         self.logger.info(f"Found {len(number_cards)} number cards in the UI")
         self.assertEqual(len(number_cards), 4, "Number of cards is not correct")
@@ -274,12 +268,12 @@ class Test4dLottoRecord(BaseTest):
             self.navigate_to_4d_tabs()
             
             self.wait_for_element(By.ID, "numberLottCard")
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             bet_button = self.driver.find_element(By.ID, "betButton")
             self.driver.execute_script("arguments[0].click();", bet_button)
             
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             try:
                 self.wait_for_element(By.ID, "closeButtonStep1", timeout=15)
@@ -292,7 +286,7 @@ class Test4dLottoRecord(BaseTest):
             bet_button = self.driver.find_element(By.ID, "betButton")
             self.driver.execute_script("arguments[0].click();", bet_button)
             
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             try:
                 self.wait_for_element(By.ID, "closeButtonStep1", timeout=15)
@@ -332,9 +326,9 @@ class Test4dLottoRecord(BaseTest):
             
             bet_button = self.driver.find_elements(By.ID, "betButton")
             actions.move_to_element(bet_button[1]).click().perform()
-            time.sleep(2)
+            self.settle(max_wait=2)
             
-            time.sleep(3)
+            self.settle(max_wait=3)
             
             remaining_text = self.driver.find_element(By.ID, "totalCardNumberStep1").text
             number_of_cards_step1 = remaining_text.split(LANGUAGE_SETTINGS[self.language]["check_in"][":"])[1].strip()
@@ -354,14 +348,14 @@ class Test4dLottoRecord(BaseTest):
             self.navigate_to_4d_tabs()
             
             self.wait_for_element(By.ID, "numberLottCard")
-            time.sleep(2)
+            self.settle(max_wait=2)
             random_number = random.randint(0, 9)
             
             self.enter_number_card(value_enter=random_number, expected_value=random_number)
             
             bet_button = self.driver.find_elements(By.ID, "betButton")
             self.driver.execute_script("arguments[0].click();", bet_button[1])
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             # Get the initial card count values
             remaining_text = self.driver.find_element(By.ID, "totalCardNumberStep1").text
@@ -379,7 +373,7 @@ class Test4dLottoRecord(BaseTest):
             
             # Test the add button
             actions.move_to_element(add_button).click().perform()
-            time.sleep(1)
+            self.settle(max_wait=1)
             
             # Verify bet cards increased
             bet_cards = self.driver.find_element(By.ID, "cardNumberBox").text
@@ -393,7 +387,7 @@ class Test4dLottoRecord(BaseTest):
             
             # Test the minus button
             actions.move_to_element(minus_button).click().perform()
-            time.sleep(1)
+            self.settle(max_wait=1)
             
             # Verify bet cards decreased
             bet_cards = self.driver.find_element(By.ID, "cardNumberBox").text
@@ -413,7 +407,7 @@ class Test4dLottoRecord(BaseTest):
             
             # Try clicking minus button when count is already 0
             actions.move_to_element(minus_button).click().perform()
-            time.sleep(1)
+            self.settle(max_wait=1)
             
             # Verify bet cards still 0 and not negative
             bet_cards = self.driver.find_element(By.ID, "cardNumberBox").text
@@ -454,7 +448,7 @@ class Test4dLottoRecord(BaseTest):
             self.navigate_to_4d_tabs()
             
             self.wait_for_element(By.ID, "numberLottCard")
-            time.sleep(2)
+            self.settle(max_wait=2)
             cards_in_tab_before = int(self.driver.find_element(By.ID, "totalCardNumberText").text.split(LANGUAGE_SETTINGS[self.language]["check_in"][":"])[1])
             self.logger.info(f"Cards in tab before: {cards_in_tab_before}")
             random_number = random.randint(0, 9)
@@ -465,20 +459,20 @@ class Test4dLottoRecord(BaseTest):
             bet_button = self.driver.find_elements(By.ID, "betButton")
             self.driver.execute_script("arguments[0].click();", bet_button[1])
             
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             add_button = self.driver.find_element(By.ID, "addButton")
             minus_button = self.driver.find_element(By.ID, "removeButton")
             
             actions.move_to_element(add_button).click().perform()
-            time.sleep(1)
+            self.settle(max_wait=1)
             actions.move_to_element(add_button).click().perform()
-            time.sleep(1)
+            self.settle(max_wait=1)
             actions.move_to_element(add_button).click().perform()
-            time.sleep(1)
+            self.settle(max_wait=1)
             
             actions.move_to_element(minus_button).click().perform()
-            time.sleep(1)
+            self.settle(max_wait=1)
             
             cards_number = self.driver.find_element(By.ID, "cardNumberBox").text
             self.assertEqual(cards_number, "2", "Number of cards is not correct")
@@ -494,7 +488,7 @@ class Test4dLottoRecord(BaseTest):
             record_button = self.driver.find_element(By.ID, "checkBetRecordButton")
             actions.move_to_element(record_button).click().perform()
             
-            time.sleep(10)
+            self.settle(max_wait=10)
             
             # Find all records and click the most recent one
             ui_records = self.driver.find_elements(By.CSS_SELECTOR, "[id^='lotto-history-item-']")
@@ -523,7 +517,7 @@ class Test4dLottoRecord(BaseTest):
             
             # Click to view the receipt details
             actions.move_to_element(new_record).click().perform()
-            time.sleep(3)
+            self.settle(max_wait=3)
             
             # Verify URL contains correct ID
             current_url = self.driver.current_url
@@ -585,23 +579,23 @@ class Test4dLottoRecord(BaseTest):
             bet_button = self.driver.find_elements(By.ID, "betButton")
             bet_button[1].click()
             
-            time.sleep(2)
+            self.settle(max_wait=2)
             bet_number = self.driver.find_element(By.ID, "fourDigitDisplay").text
             
             self.assertEqual(bet_number, "1111", "Bet number is not correct")
-            time.sleep(1)
+            self.settle(max_wait=1)
             
             change_button = self.driver.find_element(By.ID, "backButton")
             change_button.click()
             
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             self.enter_number_card(need_click_stack=False, need_delete_existing_number=True, value_enter="2", expected_value="2")
             
             bet_button = self.driver.find_elements(By.ID, "betButton")
             bet_button[1].click()
             
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             bet_number = self.driver.find_element(By.ID, "fourDigitDisplay").text
             
@@ -626,7 +620,7 @@ class Test4dLottoRecord(BaseTest):
             
             self.navigate_to_profile_menu("profile-menu-lotto_history")
             
-            time.sleep(5)
+            self.settle(max_wait=5)
             
             # Wait for UI elements to load
             self.wait_for_element(By.CSS_SELECTOR, "a[id^='lotto-history-item-']")
@@ -694,10 +688,10 @@ class Test4dLottoRecord(BaseTest):
             
             # Find the tab by its text and href
             tab = self.wait_for_element(By.CSS_SELECTOR, "a[href='?tab=2']")
-            time.sleep(2)
+            self.settle(max_wait=2)
             actions.move_to_element(tab).click().perform()
             
-            time.sleep(1)
+            self.settle(max_wait=1)
             
             # Wait for UI elements to load
             self.wait_for_element(By.CSS_SELECTOR, "a[id^='lotto-win-item-']")
@@ -754,14 +748,14 @@ class Test4dLottoRecord(BaseTest):
             self.update_bet_result(records_list_api[0].get("id"), "win", "100")
             
             self.navigate_to_profile_menu("profile-menu-lotto_history")
-            time.sleep(1)
+            self.settle(max_wait=1)
             
             # Find the tab by its text and href
             tab = self.driver.find_element(By.CSS_SELECTOR, "a[href='?tab=2']")
-            time.sleep(2)
+            self.settle(max_wait=2)
             tab.click()
             
-            time.sleep(1)
+            self.settle(max_wait=1)
             
             # Get records from API
             records_total_api = self.get_4d_history_api(four_d_number="", start_date="", end_date="", is_won="1", page="", per_page="").get("total")
@@ -779,7 +773,7 @@ class Test4dLottoRecord(BaseTest):
             date_str = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%d %H:%M:%S")
             short_date = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S").strftime("%y%m%d %H:%M")
             
-            time.sleep(10)
+            self.settle(max_wait=10)
             
             # Find all records and click the most recent one
             ui_records = self.driver.find_elements(By.CSS_SELECTOR, "a[id^='lotto-win-item-']")
@@ -788,7 +782,7 @@ class Test4dLottoRecord(BaseTest):
             record_id = new_record.get_attribute("href").split("id=")[1]
             # Click to view the receipt details
             new_record.click()
-            time.sleep(3)
+            self.settle(max_wait=3)
             
             # Verify URL contains correct ID
             current_url = self.driver.current_url
@@ -849,7 +843,7 @@ class Test4dLottoRecord(BaseTest):
             search_input.send_keys("1")
             
             # Wait for search results
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             # Find all search result records
             search_results = self.driver.find_elements(By.CSS_SELECTOR, "a.MuiListItem-root")
@@ -911,19 +905,19 @@ class Test4dLottoRecord(BaseTest):
             # Click calendar icon
             calendar_icon = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='CalendarMonthIcon']")
             calendar_icon.click()
-            time.sleep(1)  # Wait for calendar to appear
+            self.settle(max_wait=1)  # Wait for calendar to appear
 
             # Click on the dates
             self.driver.find_element(By.CSS_SELECTOR, f"[data-day='{yesterday_str}'] button").click()
             self.driver.find_element(By.CSS_SELECTOR, f"[data-day='{today_str}'] button").click()
             
-            time.sleep(1)
+            self.settle(max_wait=1)
             
             ok_button = self.driver.find_element(By.XPATH, "//button[text()='OK']")
             ok_button.click()
             
             # Wait for search results
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             # Find all search result records
             filter_results = self.driver.find_elements(By.CSS_SELECTOR, "a.MuiListItem-root")
@@ -977,18 +971,18 @@ class Test4dLottoRecord(BaseTest):
             # Click calendar icon
             calendar_icon = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='CalendarMonthIcon']")
             calendar_icon.click()
-            time.sleep(1)  # Wait for calendar to appear
+            self.settle(max_wait=1)  # Wait for calendar to appear
 
             # Click on the dates
             self.driver.find_element(By.CSS_SELECTOR, f"[data-day='{today_str}'] button").click()
             
-            time.sleep(1)
+            self.settle(max_wait=1)
             
             ok_button = self.driver.find_element(By.XPATH, "//button[text()='OK']")
             ok_button.click()
             
             # Wait for search results
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             # Find all search result records
             filter_results = self.driver.find_elements(By.CSS_SELECTOR, "a.MuiListItem-root")
@@ -1088,15 +1082,15 @@ class Test4dLottoRecord(BaseTest):
             
             self.navigate_to_profile_menu("profile-menu-lotto_history")
             tab = self.driver.find_element(By.CSS_SELECTOR, "a[href='?tab=2']")
-            time.sleep(2)
+            self.settle(max_wait=2)
             tab.click()
-            time.sleep(2)
+            self.settle(max_wait=2)
             # Find and input search term
             search_input = self.driver.find_element(By.ID, ":R34qflajttrafkq:")
             search_input.send_keys("1")
             
             # Wait for search results
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             # Find all search result records
             search_results = self.driver.find_elements(By.CSS_SELECTOR, "a.MuiListItem-root")
@@ -1205,25 +1199,25 @@ class Test4dLottoRecord(BaseTest):
                 
             self.navigate_to_profile_menu("profile-menu-lotto_history")
             tab = self.driver.find_element(By.CSS_SELECTOR, "a[href='?tab=2']")
-            time.sleep(2)
+            self.settle(max_wait=2)
             tab.click()
-            time.sleep(2)
+            self.settle(max_wait=2)
             # Click calendar icon
             calendar_icon = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='CalendarMonthIcon']")
             calendar_icon.click()
-            time.sleep(1)  # Wait for calendar to appear
+            self.settle(max_wait=1)  # Wait for calendar to appear
 
             # Click on the dates
             self.driver.find_element(By.CSS_SELECTOR, f"[data-day='{yesterday_str}'] button").click()
             self.driver.find_element(By.CSS_SELECTOR, f"[data-day='{today_str}'] button").click()
             
-            time.sleep(1)
+            self.settle(max_wait=1)
             
             ok_button = self.driver.find_element(By.XPATH, "//button[text()='OK']")
             ok_button.click()
             
             # Wait for search results
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             # Find all search result records
             filter_results = self.driver.find_elements(By.CSS_SELECTOR, "a.MuiListItem-root")
@@ -1325,24 +1319,24 @@ class Test4dLottoRecord(BaseTest):
                 
             self.navigate_to_profile_menu("profile-menu-lotto_history")
             tab = self.driver.find_element(By.CSS_SELECTOR, "a[href='?tab=2']")
-            time.sleep(2)
+            self.settle(max_wait=2)
             tab.click()
-            time.sleep(2)
+            self.settle(max_wait=2)
             # Click calendar icon
             calendar_icon = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='CalendarMonthIcon']")
             calendar_icon.click()
-            time.sleep(1)  # Wait for calendar to appear
+            self.settle(max_wait=1)  # Wait for calendar to appear
 
             # Click on the dates
             self.driver.find_element(By.CSS_SELECTOR, f"[data-day='{today_str}'] button").click()
             
-            time.sleep(1)
+            self.settle(max_wait=1)
             
             ok_button = self.driver.find_element(By.XPATH, "//button[text()='OK']")
             ok_button.click()
             
             # Wait for search results
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             # Find all search result records
             filter_results = self.driver.find_elements(By.CSS_SELECTOR, "a.MuiListItem-root")
@@ -1418,23 +1412,23 @@ class Test4dLottoRecord(BaseTest):
             self.logger.info(f"Cards in tab: {cards_in_tab}")
             
             self.navigate_to_live_page()
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             live_link = self.driver.find_element(By.CLASS_NAME, "live_link")
             live_link.click()
             
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             close_button = self.driver.find_element(By.CSS_SELECTOR, "button.mui-theme-7pi2se")
             close_button.click()
             
-            time.sleep(2)
+            self.settle(max_wait=2)
             
             WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable((By.ID, "bobolive-fourD-widget")))
             four_d_tab = self.driver.find_element(By.ID, "bobolive-fourD-widget")
             self.driver.execute_script("arguments[0].click();", four_d_tab)
             
-            time.sleep(5)
+            self.settle(max_wait=5)
             
             cards_in_live_room = self.driver.find_element(By.CSS_SELECTOR, "p.mui-theme-1vsn7f2, p.mui-theme-1u7a8fq").text
             self.logger.info(f"Cards in live room: {cards_in_live_room}")
@@ -8,8 +8,10 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from config.constant import LANGUAGE_SETTINGS, CREDENTIALS, API_URL
 from tests.authentication_test.base_test import BaseTest
+from utils.logs import get_logger
 import time
 import requests
+from utils import http_client
 
 class RewardClass():
     def __init__(self, token, language):
@@ -23,7 +25,7 @@ class RewardClass():
             "Authorization": f"Bearer {self.token}",
             "language": self.language
         }
-        response = requests.get(f"{self.api_url}/api/reward", headers=headers)
+        response = http_client.get(f"{self.api_url}/api/reward", headers=headers)
         response.raise_for_status()
         current_week_reward = response.json().get("data")
         current_day_reward = self.get_current_day_reward(current_week_reward)
@@ -41,7 +43,7 @@ class RewardClass():
     
     def get_reward_type(self, reward_id):
         try:
-            response = requests.get(f"{self.api_url}/api/rewards/{reward_id}")
+            response = http_client.get(f"{self.api_url}/api/rewards/{reward_id}")
             response.raise_for_status()
             result = response.json().get("data")
             if not result or 'reward_type' not in result:
@@ -77,31 +79,22 @@ class RewardClass():
 
 class TestDailyCheckIn(BaseTest):
 
+    # Tests share one account and build on each other's state; run them in order on one worker
+    ORDERED_TESTS = True
+    # Every test asserts on the check-in popup, so the background popup watcher stays off
+    AUTO_DISMISS_POPUPS = False
+
     def __init__(self, methodName="runTest", language=None, browser=None):
         super().__init__(methodName)
         self.language = language
         self.browser = browser
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.INFO)
-
-        for handler in self.logger.handlers[:]:
-            self.logger.removeHandler(handler)
-
-        file_handler = logging.FileHandler("test_daily_checkin.log")
-        file_handler.setLevel(logging.INFO)
-
-        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        file_handler.setFormatter(formatter)
-
-        self.logger.addHandler(file_handler)
-
-        self.logger.propagate = False
+        self.logger = get_logger(__name__, "test_daily_checkin.log", "%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
     def setUp(self):
         if not self.browser or not self.language:
             raise ValueError("Browser or language is not set.")
         self.logger.info(f"Setting up {self.browser} browser for {self.language} language...")
-        self.driver = self.initialize_browser(self.browser)
+        self.driver = self.acquire_browser(self.browser)
         self.url = LANGUAGE_SETTINGS[self.language]["home_url"]
         self.driver.get(self.url)
         #self.driver.maximize_window()
@@ -109,7 +102,7 @@ class TestDailyCheckIn(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
             
     def navigate_to_check_in_page(self):
         driver = self.driver
@@ -477,7 +470,7 @@ class TestDailyCheckIn(BaseTest):
         self.verify_rewards("bonus", wallet_before, wallet_after, reward_dict)
     
     def simulate_check_in(self, user_id, days, last_check_in_days):
-        response = requests.get(f'{API_URL}/api/simulate-checkin?user_id={user_id}&days={days}&passcode=99999&last_check_in_days={last_check_in_days}')
+        response = http_client.get(f'{API_URL}/api/simulate-checkin?user_id={user_id}&days={days}&passcode=99999&last_check_in_days={last_check_in_days}')
         if response.status_code == 200:
             return True
         else:
@@ -505,20 +498,23 @@ class TestDailyCheckIn(BaseTest):
             "username": username,
             "password": password
         }
-        response = requests.post(f"{API_URL}/api/login", data=data)
+        response = http_client.post(f"{API_URL}/api/login", data=data)
         response.raise_for_status()
         result = response.json().get("data")
         self.token = result['token']
     
     
     def get_vip_levels(self):
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-        }
-        response = requests.get(f"{API_URL}/api/uservip", headers=headers)
-        response.raise_for_status()
-        vip_levels = response.json().get("data")
-        return vip_levels
+        def fetch():
+            headers = {
+                "Authorization": f"Bearer {self.token}",
+            }
+            response = http_client.get(f"{API_URL}/api/uservip", headers=headers)
+            response.raise_for_status()
+            return response.json().get("data")
+
+        # No Language header, so the API answers in its default language
+        return self.cached_reference("vip_levels", fetch, language=None)
 
         
     def test_01_BasicCheckInFlowPopup(self):
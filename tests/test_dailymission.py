@@ -10,6 +10,7 @@ from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from config.constant import API_URL, LANGUAGE_SETTINGS, CREDENTIALS
 from tests.authentication_test.base_test import BaseTest
+from utils.logs import get_logger
 import pyperclip
 from PIL import Image
 import io
@@ -17,27 +18,24 @@ from pyzbar.pyzbar import decode
 from urllib.parse import urlparse, parse_qs
 from tests.test_init import TestInit
 from typing import Dict, Any, Optional, List, Union, Tuple, BinaryIO, TypeVar, Type
-import requests
+from utils import http_client
+from utils.popups import keep_popups
 import random
 import json
 import re
 
 class TestDailyMission(BaseTest):
 
+    # Tests share one account and build on each other's state; run them in order on one worker
+    ORDERED_TESTS = True
+
     def __init__(
         self, methodName: str = 'runTest', language: Optional[str] = None, browser: Optional[str] = None
     ) -> None:
         super().__init__(methodName)
         self.language = language
         self.browser = browser
-        self.logger = logging.getLogger(f"{self.__class__.__name__}")
-        self.logger.setLevel(logging.INFO)
-        self.logger.propagate = False
-
-        if not self.logger.handlers:
-            handler = logging.FileHandler('daily_mission.log')
-            handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-            self.logger.addHandler(handler)
+        self.logger = get_logger(self.__class__.__name__, "daily_mission.log", "%(asctime)s - %(levelname)s - %(message)s")
 
         self.test_init = TestInit(methodName="runTest", language=language, browser=browser)
 
@@ -45,7 +43,7 @@ class TestDailyMission(BaseTest):
         if not self.browser or not self.language:
             raise ValueError("Browser or language is not set.")
         self.logger.info(f"Setting up {self.browser} browser for {self.language} language...")
-        self.driver = self.initialize_browser(self.browser)
+        self.driver = self.acquire_browser(self.browser)
         self.url = LANGUAGE_SETTINGS[self.language]["home_url"]
         self.driver.get(self.url)
         # self.driver.maximize_window()
@@ -55,7 +53,7 @@ class TestDailyMission(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
     
     def get_mission_api(self):
         """Get missions data from API"""
@@ -64,7 +62,7 @@ class TestDailyMission(BaseTest):
             "Authorization": f"Bearer {token}",
             "Language": self.language
         }
-        response = requests.get(f"{API_URL}/api/getdailymissions", headers=headers)
+        response = http_client.get(f"{API_URL}/api/getdailymissions", headers=headers)
         response.raise_for_status()
         missions = response.json().get("data")
         return missions
@@ -578,7 +576,7 @@ class TestDailyMission(BaseTest):
                 modify_url = CREDENTIALS["ModifyTurnover"].format(BO_base_url = CREDENTIALS["BO_base_url"], userID=userID, turnover_id=turnover_id, action=action)
                 self.logger.info(f"Attempting to {action_type} turnover ID: {turnover_id}")
 
-                response = requests.get(modify_url)
+                response = http_client.get(modify_url)
                 if response.status_code == 200:
                     self.logger.info(f"Successfully {action_type} turnover ID: {turnover_id}")
                 else:
@@ -598,7 +596,7 @@ class TestDailyMission(BaseTest):
             turnoverAPI = CREDENTIALS["CheckTurnover"].format(BO_base_url = CREDENTIALS["BO_base_url"], ID=userID, language=language)
             turnover_ids = []
 
-            response = requests.get(turnoverAPI)
+            response = http_client.get(turnoverAPI)
             if response.status_code == 200:
                 turnoverData = response.json()
                 self.logger.info(f"Turnover data: {turnoverData}")
@@ -627,7 +625,7 @@ class TestDailyMission(BaseTest):
             "amount": amount,
             "bank": bank
         }
-        response = requests.post(f"{CREDENTIALS['BO_base_url']}/api/withdraw", headers=headers, json=payload)
+        response = http_client.post(f"{CREDENTIALS['BO_base_url']}/api/withdraw", headers=headers, json=payload)
         response.raise_for_status()
     
     def handleWithdrawRequest(self, ID, isReject=False, isProcessing=False):
@@ -638,7 +636,7 @@ class TestDailyMission(BaseTest):
         else:
             url = CREDENTIALS["ApproveWithdrawRequest"].format(BO_base_url = CREDENTIALS["BO_base_url"], ID=ID)
 
-        response = requests.get(url)
+        response = http_client.get(url)
 
         if isReject:
             if response.status_code == 200:
@@ -768,7 +766,7 @@ class TestDailyMission(BaseTest):
         headers = {
             "Authorization": f"Bearer {token}",
         }
-        response = requests.get(f"{API_URL}/api/simulate-game-records?passcode=99999&user_id={user_id}&amount={amount}&type={type}&provider_id={provider_id}", headers=headers)
+        response = http_client.get(f"{API_URL}/api/simulate-game-records?passcode=99999&user_id={user_id}&amount={amount}&type={type}&provider_id={provider_id}", headers=headers)
         response.raise_for_status()
     
     def simulate_reset_mission_next_day(self, user_id):
@@ -777,7 +775,7 @@ class TestDailyMission(BaseTest):
         headers = {
             "Authorization": f"Bearer {token}",
         }
-        response = requests.get(f"{API_URL}/api/simulate-daily-mission?passcode=99999&user_id={user_id}", headers=headers)
+        response = http_client.get(f"{API_URL}/api/simulate-daily-mission?passcode=99999&user_id={user_id}", headers=headers)
         response.raise_for_status()
     
     def verify_navigation(self, url):
@@ -2143,6 +2141,7 @@ class TestDailyMission(BaseTest):
             self.logger.error(f"Test failed with error: {str(e)}")
             self.fail(f"Test failed with error: {str(e)}")
     
+    @keep_popups
     def test_19_HomePagePopUpDailyMission(self):
         try:
             self.logger.info("Starting test for verifying mission show up in home modal...")
@@ -2160,6 +2159,7 @@ class TestDailyMission(BaseTest):
             self.logger.error(f"Test failed with error: {str(e)}")
             self.fail(f"Test failed with error: {str(e)}")
     
+    @keep_popups
     def test_20_HomePagePopUpAllMissionShown(self):
         """Test to verify that all missions from the API are shown in the pop up."""
         try:
@@ -2194,6 +2194,7 @@ class TestDailyMission(BaseTest):
             self.logger.error(f"Test failed with error: {str(e)}")
             self.fail(f"Test failed with error: {str(e)}")
     
+    @keep_popups
     def test_21_HomePagePopUpNavigateToMissionsPage(self):
         try:
             self.logger.info("Starting test for verifying navigation to missions page...")
@@ -2219,6 +2220,7 @@ class TestDailyMission(BaseTest):
             self.logger.error(f"Test failed with error: {str(e)}")
             self.fail(f"Test failed with error: {str(e)}")
     
+    @keep_popups
     def test_22_HomePagePopUpMissionGoButtonRedirectsToDeposit(self):
         """Test to verify that clicking 'Go' button from home modal redirects to the deposit page."""
         try:
@@ -2257,6 +2259,7 @@ class TestDailyMission(BaseTest):
             self.logger.error(f"Test failed with error: {str(e)}")
             self.fail(f"Test failed with error: {str(e)}")
     
+    @keep_popups
     def test_23_HomePagePopUpMissionGoButtonRedirectsToWithdraw(self):
         """Test to verify that clicking 'Go' button from home modal redirects to the withdraw page."""
         try:
@@ -2295,6 +2298,7 @@ class TestDailyMission(BaseTest):
             self.logger.error(f"Test failed with error: {str(e)}")
             self.fail(f"Test failed with error: {str(e)}")
     
+    @keep_popups
     def test_24_HomePagePopUpMissionGoButtonRedirectsToGames(self):
         """Test to verify that clicking 'Go' button from home modal redirects to the games page."""
         try:
@@ -2333,6 +2337,7 @@ class TestDailyMission(BaseTest):
             self.logger.error(f"Test failed with error: {str(e)}")
             self.fail(f"Test failed with error: {str(e)}")
     
+    @keep_popups
     def test_25_HomePagePopUpMissionProgressUpdatesAfterDeposit(self):
         """Test to verify that mission progress updates correctly after making a deposit."""
         try:
@@ -2389,6 +2394,7 @@ class TestDailyMission(BaseTest):
             self.logger.error(f"Test failed with error: {str(e)}")
             self.fail(f"Test failed with error: {str(e)}")
     
+    @keep_popups
     def test_26_HomePagePopUpTopUpMissionCompletionAndRewardClaim(self):
         """Test to verify topup mission completion and reward claiming functionality."""
         self.logger.info("Starting topup mission completion and reward claim test...")
@@ -2465,6 +2471,7 @@ class TestDailyMission(BaseTest):
         # Verify the correct reward was received
         self.verify_reward_received(reward_type, reward_value, initial_balances, final_balances)
     
+    @keep_popups
     def test_27_HomePagePopUpAttemptToClaimAgainAfterClaimed(self):
         """Test to verify that a completed and already claimed mission cannot be claimed again."""
         try:
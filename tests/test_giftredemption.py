@@ -16,25 +16,22 @@ import io
 from pyzbar.pyzbar import decode
 from urllib.parse import urlparse, parse_qs
 from tests.test_init import TestInit
+from utils.logs import get_logger
 from typing import Dict, Any, Optional, List, Union, Tuple, BinaryIO, TypeVar, Type
-import requests
+from utils import http_client
 
 class TestGiftRedemption(BaseTest):
 
+    # Tests share one account and build on each other's state; run them in order on one worker
+    ORDERED_TESTS = True
+
     def __init__(
         self, methodName: str = 'runTest', language: Optional[str] = None, browser: Optional[str] = None
     ) -> None:
         super().__init__(methodName)
         self.language = language
         self.browser = browser
-        self.logger = logging.getLogger(f"{self.__class__.__name__}")
-        self.logger.setLevel(logging.INFO)
-        self.logger.propagate = False
-
-        if not self.logger.handlers:
-            handler = logging.FileHandler('gift_redemption.log')
-            handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-            self.logger.addHandler(handler)
+        self.logger = get_logger(self.__class__.__name__, "gift_redemption.log", "%(asctime)s - %(levelname)s - %(message)s")
 
         self.test_init = TestInit(methodName="runTest", language=language, browser=browser)
 
@@ -42,7 +39,7 @@ class TestGiftRedemption(BaseTest):
         if not self.browser or not self.language:
             raise ValueError("Browser or language is not set.")
         self.logger.info(f"Setting up {self.browser} browser for {self.language} language...")
-        self.driver = self.initialize_browser(self.browser)
+        self.driver = self.acquire_browser(self.browser)
         self.url = LANGUAGE_SETTINGS[self.language]["home_url"]
         self.driver.get(self.url)
         # self.driver.maximize_window()
@@ -60,7 +57,7 @@ class TestGiftRedemption(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
     
     # Helper methods
     def wait_for_element(self, by, value, timeout=10):
@@ -128,26 +125,30 @@ class TestGiftRedemption(BaseTest):
         if gift_cards is None:
             gift_cards = self.get_all_gift_cards()
             
-        gift_titles = []
-        for card in gift_cards:
-            try:
-                title_element = card.find_element(By.XPATH, ".//div[contains(@class, 'MuiTypography-h6')]")
-                gift_titles.append(title_element.text)
-            except NoSuchElementException:
-                continue
-        
-        return gift_titles
-    
-    def get_gift_points(self, gift_card):
-        """Extract points value from a gift card"""
-        try:
-            points_text = gift_card.find_element(By.XPATH, ".//p[contains(@class, 'MuiTypography-body2')]").text
+        return [card["title"] for card in self.read_gift_cards(gift_cards) if card["title"] is not None]
+
+    def read_gift_cards(self, gift_cards):
+        """Read the title and points of every card in one round-trip. Returns [{"title", "points"}], with None
+        for anything missing."""
+        cards = self.snapshot(gift_cards, {
+            "title": "xpath:.//div[contains(@class, 'MuiTypography-h6')]",
+            "points": "xpath:.//p[contains(@class, 'MuiTypography-body2')]",
+        })
+        for card in cards:
+            card["points"] = self.parse_gift_points(card["points"])
+        return cards
 
+    def parse_gift_points(self, points_text):
+        try:
             return int(''.join(filter(str.isdigit, points_text)))
-        except (NoSuchElementException, ValueError) as e:
+        except (TypeError, ValueError) as e:
             self.logger.warning(f"Couldn't extract points for a gift: {str(e)}")
             return None
     
+    def get_gift_points(self, gift_card):
+        """Extract points value from a gift card"""
+        return self.read_gift_cards([gift_card])[0]["points"]
+    
     def set_points_filter(self, target_value):
         """Set the points filter slider to the target value"""
         self.logger.info(f"Setting point range to: {target_value}")
@@ -230,6 +231,7 @@ class TestGiftRedemption(BaseTest):
             self.logger.info(f"{'Unfavoriting' if is_currently_favorite else 'Favoriting'} gift: {gift_name}")
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", icon_to_click)
             icon_to_click.click()
+            self.invalidate_reference("gifts")
             
             # Wait for the UI to update
             time.sleep(2)
@@ -288,14 +290,17 @@ class TestGiftRedemption(BaseTest):
             return False
     
     def get_gift_api(self):
-        token = self.login(self.username, self.password)
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "language": self.language
-        }
-        response = requests.get(f"{API_URL}/api/gifts", headers=headers)
-        response.raise_for_status()
-        gifts = response.json().get("data")
+        def fetch():
+            token = self.login(self.username, self.password)
+            headers = {
+                "Authorization": f"Bearer {token}",
+                "language": self.language
+            }
+            response = http_client.get(f"{API_URL}/api/gifts", headers=headers)
+            response.raise_for_status()
+            return response.json().get("data")
+
+        gifts = self.cached_reference("gifts", fetch, language=self.language)
         self.logger.info(gifts)
         return gifts
 
@@ -498,6 +503,8 @@ class TestGiftRedemption(BaseTest):
             )
             
             result = {"success": False, "popup": swal_popup}
+            # The redemption went through, so stock and last-updated times in the gift list have changed
+            self.invalidate_reference("gifts")
             
             # Check for the success title
             try:
@@ -722,15 +729,10 @@ class TestGiftRedemption(BaseTest):
         list: List of tuples (title, points)
         """
         gift_data = []
-        for card in cards[:min(num_samples, len(cards))]:
-            points = self.get_gift_points(card)
-            try:
-                title = card.find_element(By.XPATH, ".//div[contains(@class, 'MuiTypography-h6')]").text
-                if points is not None:
-                    gift_data.append((title, points))
-                    self.logger.info(f"Gift: {title}, Points: {points}")
-            except NoSuchElementException:
-                pass
+        for card in self.read_gift_cards(cards[:min(num_samples, len(cards))]):
+            if card["title"] is not None and card["points"] is not None:
+                gift_data.append((card["title"], card["points"]))
+                self.logger.info(f"Gift: {card['title']}, Points: {card['points']}")
         return gift_data
 
     def verify_sorting_by_points(self, sorted_points, expected_order="ascending"):
@@ -940,7 +942,7 @@ class TestGiftRedemption(BaseTest):
                 "Accept": "application/json",
                 "Content-Type": "application/json"
             }
-        response = requests.get(f"{CREDENTIALS['BO_base_url']}/api/user", headers=headers)
+        response = http_client.get(f"{CREDENTIALS['BO_base_url']}/api/user", headers=headers)
         return response.json().get("data")["id"]
 
     def find_unaffordable_gift(self, search_keyword, current_points):
@@ -966,21 +968,15 @@ class TestGiftRedemption(BaseTest):
         self.logger.info(f"Found {len(gift_cards)} gifts matching '{search_keyword}'")
         
         # Find a gift that costs more than user's points
-        for card in gift_cards:
-            points = self.get_gift_points(card)
-            if points is None:
-                continue
-                
-            try:
-                title_element = card.find_element(By.XPATH, ".//div[contains(@class, 'MuiTypography-h6')]")
-                gift_title = title_element.text
-                
-                # Check if the gift is unaffordable
-                if points > current_points:
-                    self.logger.info(f"Found unaffordable gift: {gift_title} ({points} points), user has {current_points} points")
-                    return card, gift_title, points
-            except NoSuchElementException:
+        for card, details in zip(gift_cards, self.read_gift_cards(gift_cards)):
+            points, gift_title = details["points"], details["title"]
+            if points is None or gift_title is None:
                 continue
+
+            # Check if the gift is unaffordable
+            if points > current_points:
+                self.logger.info(f"Found unaffordable gift: {gift_title} ({points} points), user has {current_points} points")
+                return card, gift_title, points
         
         self.logger.error("Could not find an unaffordable gift")
         return None, None, None
@@ -1187,13 +1183,11 @@ class TestGiftRedemption(BaseTest):
             all_within_range = True
             gifts_outside_range = []
             
-            for gift in filtered_gifts:
-                points = self.get_gift_points(gift)
+            for gift in self.read_gift_cards(filtered_gifts):
+                points, gift_title = gift["points"], gift["title"]
                 if points is None:
                     continue
-                    
-                gift_title = gift.find_element(By.XPATH, ".//div[contains(@class, 'MuiTypography-h6')]").text
-                
+
                 # Check if the gift's points are within range
                 if points > actual_value:
                     all_within_range = False
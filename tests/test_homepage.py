@@ -3,7 +3,7 @@ import unittest
 import time
 import logging
 import random
-import requests
+from utils import http_client
 import re
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -29,7 +29,7 @@ class HomepageData(BaseTest):
         headers = {
             "Authorization": f"Bearer {token}"
         }
-        response = requests.get(f"{CREDENTIALS['GetUser'].format(BO_base_url=CREDENTIALS['BO_base_url'])}", headers=headers)
+        response = http_client.get(f"{CREDENTIALS['GetUser'].format(BO_base_url=CREDENTIALS['BO_base_url'])}", headers=headers)
         response.raise_for_status() 
         return response.json()['data']
 
@@ -40,7 +40,7 @@ class HomepageData(BaseTest):
             "Authorization": f"Bearer {token}",
             "language": self.language
         }
-        response = requests.get(f"{CREDENTIALS['GetProvider'].format(BO_base_url=CREDENTIALS['BO_base_url'])}", headers=headers)
+        response = http_client.get(f"{CREDENTIALS['GetProvider'].format(BO_base_url=CREDENTIALS['BO_base_url'])}", headers=headers)
         return response.json()['data']
 
     def home_api(self, username, password):
@@ -49,7 +49,7 @@ class HomepageData(BaseTest):
         headers = {
             "Authorization": f"Bearer {token}"
         }
-        response = requests.get(f"{CREDENTIALS['GetHome'].format(BO_base_url=CREDENTIALS['BO_base_url'])}", headers=headers)
+        response = http_client.get(f"{CREDENTIALS['GetHome'].format(BO_base_url=CREDENTIALS['BO_base_url'])}", headers=headers)
         return response.json()['data']
     
 class TestHomepage(BaseTest):
@@ -62,7 +62,7 @@ class TestHomepage(BaseTest):
         if not self.browser or not self.language:
             raise ValueError("Browser or language is not set.")
         self.logger.info(f"Setting up {self.browser} browser for {self.language} language...")
-        self.driver = self.initialize_browser(self.browser)
+        self.driver = self.acquire_browser(self.browser)
         self.url = LANGUAGE_SETTINGS[self.language]["home_url"]
         self.driver.get(self.url)
         # self.driver.maximize_window()
@@ -72,7 +72,7 @@ class TestHomepage(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
     
     def setup_test_user(self, register_new=False):
         """Set up test user - either create new or use existing"""
@@ -142,7 +142,7 @@ class TestHomepage(BaseTest):
     
     def check_img_response(self, img_url):
         """Check if image URL is valid"""
-        response = requests.get(img_url)
+        response = http_client.get(img_url)
         response.raise_for_status()
         return True
     
@@ -210,7 +210,7 @@ class TestHomepage(BaseTest):
 
     def check_img_response(self, img_url):
         """Check if image URL is valid"""
-        response = requests.get(img_url)
+        response = http_client.get(img_url)
         response.raise_for_status()
         return True
     
@@ -1,17 +1,24 @@
 import unittest
 import random
+import math
+import concurrent.futures
 import string
-import requests
+from utils import http_client
 import logging
 import os
 import time
 import pandas as pd
+import requests
 from datetime import datetime
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from config.constant import LANGUAGE_SETTINGS, CREDENTIALS
+from config.constant import LANGUAGE_SETTINGS, CREDENTIALS, API_URL, ACCOUNT_POOL
 from tests.authentication_test.base_test import BaseTest
+from utils.account_pool import get_account_pool
+from utils.fixtures import get_image
+from utils.approvals import ApprovalBatch, action_for
+from utils.timing import instrument_helpers
 from decimal import Decimal, ROUND_HALF_UP
 
 
@@ -25,31 +32,6 @@ class TestInit(BaseTest):
     def __init__(self, methodName="runTest", language=None, browser=None):
         super().__init__(methodName, language, browser)
 
-    def download_image(self):
-        try:
-            image_url = CREDENTIALS["image_url"]
-            image_path = CREDENTIALS["image_path"]
-
-            response = requests.get(image_url, timeout=30)
-            if response.status_code == 200:
-                with open(image_path, "wb") as f:
-                    f.write(response.content)
-                self.logger.info(f"Successfully downloaded image to {image_path}")
-                return image_path
-
-            self.logger.info("Download failed, creating fallback image")
-            with open(image_path, "wb") as f:
-                f.write(
-                    bytes.fromhex(
-                        'FFD8FFE000104A46494600010100000100010000FFDB004300080606070605080707070909080A0C140D0C0B0B0C1912130F141D1A1F1E1D1A1C1C20242E2720222C231C1C2837292C30313434341F27393D38323C2E333432FFDB0043010909090C0B0C180D0D1832211C213232323232323232323232323232323232323232323232323232323232323232323232323232323232323232323232323232FFC00011080001000103012200021101031101FFC4001F0000010501010101010100000000000000000102030405060708090A0BFFC400B51000020102040403040705040400010277000102031104052131061241510761711322328108144291A1B1C109233352F0156272D10A162434E125F11718191A262728292A35363738393A434445464748494A535455565758595A636465666768696A737475767778797A82838485868788898A92939495969798999AA2A3A4A5A6A7A8A9AAB2B3B4B5B6B7B8B9BAC2C3C4C5C6C7C8C9CAD2D3D4D5D6D7D8D9DAE1E2E3E4E5E6E7E8E9EAF1F2F3F4F5F6F7F8F9FAFFC4001F0100030101010101010101010000000000000102030405060708090A0BFFC400B51100020102040403040705040400010277000102031104052131061241510761711322328108144291A1B1C109233352F0156272D10A162434E125F11718191A262728292A35363738393A434445464748494A535455565758595A636465666768696A737475767778797A82838485868788898A92939495969798999AA2A3A4A5A6A7A8A9AAB2B3B4B5B6B7B8B9BAC2C3C4C5C6C7C8C9CAD2D3D4D5D6D7D8D9DAE2E3E4E5E6E7E8E9EAF2F3F4F5F6F7F8F9FAFFDA000C03010002110311003F00F7FA28A2800A28A2803FFD9'
-                    )
-                )
-            return image_path
-
-        except Exception as e:
-            self.logger.error(f"Error downloading/creating image: {str(e)}")
-            raise
-
     def submit_deposit_api(
         self, amount=None, paytype="bank", transferType="2", bankId=9, promoCode=None, username=None, password=None,
         check_history_amount=False
@@ -65,7 +47,7 @@ class TestInit(BaseTest):
                 "Accept": "application/json"
             }
 
-            deposit_info_response = requests.get(f"{CREDENTIALS['BO_base_url']}/api/depositInfo", headers=headers)
+            deposit_info_response = http_client.get(f"{CREDENTIALS['BO_base_url']}/api/depositInfo", headers=headers)
             if deposit_info_response.status_code != 200:
                 self.logger.error(f"Failed to get deposit info: {deposit_info_response.text}")
                 return False
@@ -81,19 +63,13 @@ class TestInit(BaseTest):
                 "promoCode": promoCode
             }
 
-            image_path = self.download_image()
-
-            with open(image_path, "rb") as image_file:
-                files = {
-                    "attachment": (image_path, image_file, "image/jpeg")
-                }
-
-                deposit_response = requests.post(
-                    f"{CREDENTIALS['BO_base_url']}/api/recharge", headers=headers, data=deposit_data, files=files
-                )
+            files = {
+                "attachment": get_image("receipt").upload()
+            }
 
-            if os.path.exists(image_path):
-                os.remove(image_path)
+            deposit_response = http_client.post(
+                f"{CREDENTIALS['BO_base_url']}/api/recharge", headers=headers, data=deposit_data, files=files
+            )
 
             self.logger.info(f"Deposit response status: {deposit_response.status_code}")
 
@@ -117,6 +93,12 @@ class TestInit(BaseTest):
             return False
 
     def register_new_account(self):
+        account = self.lease_account("fresh")
+        if account:
+            return account["username"], account["password"]
+        return self.create_new_account()
+
+    def create_new_account(self):
         try:
             letters = ''.join(random.choices(string.ascii_letters, k=2))
             numbers = ''.join(random.choices(string.digits, k=2))
@@ -137,7 +119,7 @@ class TestInit(BaseTest):
                 "phone": phone,
             }
 
-            register_response = requests.post(f"{CREDENTIALS['BO_base_url']}/api/v3/register", json=register_data)
+            register_response = http_client.post(f"{CREDENTIALS['BO_base_url']}/api/v3/register", json=register_data)
             self.logger.info(f"Register response status: {register_response.status_code}")
 
             register_response.raise_for_status()
@@ -155,6 +137,11 @@ class TestInit(BaseTest):
             return None, None
 
     def register_and_deposit_with_promo(self, with_additional_deposit=False):
+        if not with_additional_deposit:
+            account = self.lease_account("promo")
+            if account:
+                return account["username"], account["password"]
+
         try:
             # Register new account
             username, password = self.register_new_account()
@@ -182,6 +169,108 @@ class TestInit(BaseTest):
             self.logger.error(f"Error in register_and_deposit_with_promo: {str(e)}")
             return None, None
 
+    def lease_account(self, state):
+        """Take a pre-provisioned account from the account pool, or None if the pool is disabled or empty."""
+        if not ACCOUNT_POOL["enabled"]:
+            return None
+
+        account = get_account_pool().lease(state, CREDENTIALS['BO_base_url'])
+        if account:
+            self.logger.info(f"Using pooled {state} account: {account['username']}")
+        else:
+            self.logger.info(f"No pooled {state} account available, creating one inline")
+        return account
+
+    def get_user_id_api(self, username, password):
+        token = self.login(username, password)
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/json"
+        }
+        response = http_client.get(f"{CREDENTIALS['BO_base_url']}/api/user", headers=headers)
+        response.raise_for_status()
+        return response.json().get("data")["id"]
+
+    def provision_account(self, state):
+        """Create one account in the given pool state and store it. Returns the username, or None when the back
+        office refuses a step or cannot be reached. Bugs raise, so a pool state that can never be filled is not
+        silently left empty."""
+        try:
+            username, password = self.create_new_account()
+            if not username:
+                return None
+
+            user_id = None
+            data = {}
+
+            match state:
+                case "fresh":
+                    pass
+                case "deposited":
+                    user_id = self.get_user_id_api(username, password)
+                    amount = random.randint(*ACCOUNT_POOL["deposit_amount"])
+                    deposit_success = self.submit_deposit_api(username=username, password=password, amount=amount)
+                    if not deposit_success:
+                        return None
+                    self.handleDeposit(user_id)
+                    data["deposit_amount"] = amount
+                case "promo":
+                    deposit_success = self.submit_deposit_api(promoCode="10DSRB", username=username, password=password)
+                    if not deposit_success:
+                        return None
+                    data["promo_code"] = "10DSRB"
+                case "vip":
+                    user_id = self.get_user_id_api(username, password)
+                    headers = {
+                        "Authorization": f"Bearer {self.login(username, password)}",
+                        "Language": self.language or "en"
+                    }
+                    response = http_client.get(f"{API_URL}/api/uservip", headers=headers)
+                    response.raise_for_status()
+                    vip_levels = sorted(response.json().get("data"), key=lambda level: float(level["recharge"]))
+                    vip_level = vip_levels[ACCOUNT_POOL["vip_level"]]
+                    amount = int(math.ceil(float(vip_level["recharge"])))
+                    deposit_success = self.submit_deposit_api(username=username, password=password, amount=amount)
+                    if not deposit_success:
+                        return None
+                    self.handleDeposit(user_id)
+                    data["vip"] = vip_level.get("id")
+                    data["deposit_amount"] = amount
+                case _:
+                    raise ValueError(f"Unknown account state: {state}")
+
+            get_account_pool().add(state, CREDENTIALS['BO_base_url'], username, password, user_id=user_id, data=data)
+            self.logger.info(f"Provisioned {state} account: {username}")
+            return username
+
+        except (requests.RequestException, AssertionError) as e:
+            self.logger.error(f"Error provisioning {state} account: {str(e)}")
+            return None
+
+    def provision_account_pool(self, targets=None, workers=None):
+        """Top the account pool up to targets ({state: count}) using a thread pool. Returns {state: created}."""
+        targets = targets or ACCOUNT_POOL["targets"]
+        workers = workers or ACCOUNT_POOL["provision_workers"]
+
+        pool = get_account_pool()
+        pool.purge()
+        available = pool.available(CREDENTIALS['BO_base_url'])
+
+        jobs = []
+        for state, target in targets.items():
+            jobs.extend([state] * max(0, target - available.get(state, 0)))
+        self.logger.info(f"Account pool available: {available}, provisioning {len(jobs)} accounts")
+
+        created = {state: 0 for state in targets}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.provision_account, state): state for state in jobs}
+            for future in concurrent.futures.as_completed(futures):
+                if future.result():
+                    created[futures[future]] += 1
+
+        self.logger.info(f"Account pool provisioned: {created}")
+        return created
+
     def withdraw_api(self, amount=None, username=None, password=None):
         try:
             token = self.login(username, password)
@@ -199,7 +288,7 @@ class TestInit(BaseTest):
                 "bank": 524,
             }
 
-            withdraw_response = requests.post(
+            withdraw_response = http_client.post(
                 f"{CREDENTIALS['BO_base_url']}/api/withdraw", headers=headers, json=withdraw_data
             )
             self.logger.info(f"Withdraw response status: {withdraw_response.status_code}")
@@ -221,33 +310,35 @@ class TestInit(BaseTest):
             return False
 
     def handleWithdrawRequest(self, ID, isReject=False, isProcessing=False):
-        if isReject:
-            url = CREDENTIALS["RejectWithdrawRequest"].format(BO_base_url = CREDENTIALS["BO_base_url"], ID=ID)
-        elif isProcessing:
-            url = CREDENTIALS["ProcessingWithdrawRequest"].format(BO_base_url = CREDENTIALS["BO_base_url"], ID=ID)
-        else:
-            url = CREDENTIALS["ApproveWithdrawRequest"].format(BO_base_url = CREDENTIALS["BO_base_url"], ID=ID)
-
-        response = requests.get(url)
-
-        if isReject:
-            if response.status_code == 200:
-                self.logger.info(f"Successfully rejected deposit for ID {ID}")
-            else:
-                self.logger.error(f"Failed to reject. Status code: {response.status_code}")
-                self.fail("Reject deposit failed")
-        elif isProcessing:
-            if response.status_code == 200:
-                self.logger.info(f"Successfully processing deposit for ID {ID}")
-            else:
-                self.logger.error(f"Failed to processing. Status code: {response.status_code}")
-                self.fail("Processing deposit failed")
-        else:
-            if response.status_code == 200:
-                self.logger.info(f"Successfully approved deposit for ID {ID}")
+        self.handleWithdrawRequests([ID], isReject=isReject, isProcessing=isProcessing)
+
+    def handleWithdrawRequests(self, IDs, isReject=False, isProcessing=False):
+        """Approve, reject or process the pending withdrawals of several users in one back-office call."""
+        action = action_for(isReject, isProcessing)
+        batch = ApprovalBatch()
+        for ID in IDs:
+            batch.add("withdraw", ID, action)
+        results = batch.flush()[("withdraw", action)]
+
+        for ID, ok in results.items():
+            if isReject:
+                if ok:
+                    self.logger.info(f"Successfully rejected deposit for ID {ID}")
+                else:
+                    self.logger.error(f"Failed to reject withdraw for ID {ID}")
+                    self.fail("Reject deposit failed")
+            elif isProcessing:
+                if ok:
+                    self.logger.info(f"Successfully processing deposit for ID {ID}")
+                else:
+                    self.logger.error(f"Failed to processing withdraw for ID {ID}")
+                    self.fail("Processing deposit failed")
             else:
-                self.logger.error(f"Failed to approve. Status code: {response.status_code}")
-                self.fail("Approve withdraw failed")
+                if ok:
+                    self.logger.info(f"Successfully approved deposit for ID {ID}")
+                else:
+                    self.logger.error(f"Failed to approve withdraw for ID {ID}")
+                    self.fail("Approve withdraw failed")
 
     def make_transfer(self, headers, source_id, target_id, amount):
         self.logger.info(f"Making transfer from {source_id} to {target_id} with amount {amount}")
@@ -256,7 +347,7 @@ class TestInit(BaseTest):
             "target_id": target_id,
             "amount": amount
         }
-        response = requests.post(f"{CREDENTIALS['BO_base_url']}/api/transfers", json=payload, headers=headers)
+        response = http_client.post(f"{CREDENTIALS['BO_base_url']}/api/transfers", json=payload, headers=headers)
         return response
 
     def get_promo_codes(self, username, password):
@@ -271,7 +362,7 @@ class TestInit(BaseTest):
             "language": self.language
         }
 
-        deposit_info_response = requests.get(f"{CREDENTIALS['BO_base_url']}/api/depositInfo", headers=headers)
+        deposit_info_response = http_client.get(f"{CREDENTIALS['BO_base_url']}/api/depositInfo", headers=headers)
         if deposit_info_response.status_code != 200:
             self.logger.error(f"Failed to get deposit info: {deposit_info_response.text}")
             return []
@@ -378,23 +469,13 @@ class TestInit(BaseTest):
             create_downline_api = CREDENTIALS['CreateDownline'].format(
                 userID=tier_1_userID, number_of_t2=structure['t2'], number_of_t3=structure['t3']
             )
-            max_retries = 3
-            retry_count = 0
-            response = None
-
-            while retry_count < max_retries:
-                try:
-                    response = requests.get(create_downline_api)
-                    if response.status_code == 200:
-                        self.logger.info("Downline created successfully")
-                        break
-                    else:
-                        self.logger.warning(f"Attempt {retry_count + 1} failed. Status code: {response.status_code}")
-                except Exception as e:
-                    self.logger.warning(f"Attempt {retry_count + 1} failed with error: {str(e)}")
-
-                retry_count += 1
-                time.sleep(1)
+            try:
+                response = http_client.request_with_retry("GET", create_downline_api)
+                if response.status_code == 200:
+                    self.logger.info("Downline created successfully")
+            except Exception as e:
+                self.logger.warning(f"Create downline failed with error: {str(e)}")
+                response = None
 
             if response is None or response.status_code != 200:
                 self.fail(f"Failed to create downline: {response.status_code if response else 'No response'}")
@@ -412,9 +493,10 @@ class TestInit(BaseTest):
                 }]
                 self.logger.info(f"Downline Users: {downline_users}")
 
+                # Submit every tier user's deposit first, then approve them all in one back-office call
+                deposit_amounts = {}
                 for user_tier in downline_users:
                     for tier_user in downline_users[user_tier]:
-                        self.logger.info(f"Processing Tier User: {tier_user['id']}")
                         if valid_turnover:
                             deposit_result = self.submit_deposit_api(
                                 username=tier_user['username'], password=tier_user['password'],
@@ -438,15 +520,18 @@ class TestInit(BaseTest):
                                 self.logger.error("Deposit failed, but continuing with default amount")
 
                         self.logger.info(f"Deposit Amount: {user_amount}")
-                        self.handleDeposit(tier_user['id'])
-                        rebate_percentage = 0
+                        deposit_amounts[tier_user['id']] = user_amount
 
-                        check_rebate_percentage = CREDENTIALS['CheckRebatePercentage']
-                        response = requests.get(check_rebate_percentage)
-                        if response.status_code != 200:
-                            self.fail(f"Failed to check rebate percentage: {response.status_code}")
+                self.handleDeposits(list(deposit_amounts))
+
+                for user_tier in downline_users:
+                    for tier_user in downline_users[user_tier]:
+                        self.logger.info(f"Processing Tier User: {tier_user['id']}")
+                        user_amount = deposit_amounts[tier_user['id']]
+                        self.logger.info(f"Deposit Amount: {user_amount}")
+                        rebate_percentage = 0
 
-                        rebate_data = response.json()
+                        rebate_data = self.get_rebate_percentages()
                         match user_tier:
                             case "t1_users":
                                 tier_level = "1"
@@ -548,7 +633,7 @@ class TestInit(BaseTest):
 
                         # Place bet to generate rebate
                         place_bet_url = f"{CREDENTIALS['PlaceBet'].format(userID=tier_user['id'], transfer_amount=user_amount, type=1, game_id=transfer_details['target_id'], game_record_date=current_date)}"
-                        response = requests.get(place_bet_url)
+                        response = http_client.get(place_bet_url)
                         self.logger.info(f"userid: {tier_user['id']}")
                         self.logger.info(f"Response: {response.status_code}")
                         if response.status_code != 200:
@@ -569,7 +654,7 @@ class TestInit(BaseTest):
             self.logger.info(f"Tier 1 users: {tier_1_users}")
             self.logger.info(f"Downline rebate info: {rebate_info_list}")
             self.logger.info(rebate_info_list[0])
-            response = requests.get(rebate_simulation_url)
+            response = http_client.get(rebate_simulation_url)
             if response.status_code != 200:
                 self.fail(f"Failed to create rebate: {response.status_code}")
             else:
@@ -624,5 +709,8 @@ class TestInit(BaseTest):
         return float(value.replace("MYR ", "").replace(",", ""))
 
 
+instrument_helpers(TestInit)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -56,7 +56,7 @@ class TestLiveAgent(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
 
     def navigate_to_live_agent(self):
         live_agent_section = self.driver.find_element(By.ID, "chatbot-girl-button")
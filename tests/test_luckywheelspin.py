@@ -9,34 +9,24 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from config.constant import LANGUAGE_SETTINGS, CREDENTIALS, API_URL
 from tests.authentication_test.base_test import BaseTest
 import tempfile
-import requests
+from utils import http_client
 from urllib.parse import urlparse
 import urllib.parse
 import json
 import re
 from tests.test_init import TestInit
+from utils.logs import get_logger
 
 class TestLuckyWheelSpinPage(BaseTest):
 
+    # Tests share one account and build on each other's state; run them in order on one worker
+    ORDERED_TESTS = True
+
     def __init__(self, methodName="runTest", language=None, browser=None):
         super().__init__(methodName)
         self.language = language
         self.browser = browser
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.INFO)
-
-        for handler in self.logger.handlers[:]:
-            self.logger.removeHandler(handler)
-
-        file_handler = logging.FileHandler("test_wheelspin_output.log")
-        file_handler.setLevel(logging.INFO)
-
-        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        file_handler.setFormatter(formatter)
-
-        self.logger.addHandler(file_handler)
-
-        self.logger.propagate = False
+        self.logger = get_logger(__name__, "test_wheelspin_output.log", "%(asctime)s - %(name)s - %(levelname)s - %(message)s")
         
         self.test_init = TestInit(methodName="runTest", language=language, browser=browser)
 
@@ -44,7 +34,7 @@ class TestLuckyWheelSpinPage(BaseTest):
         if not self.browser or not self.language:
             raise ValueError("Browser or language is not set.")
         self.logger.info(f"Setting up {self.browser} browser for {self.language} language...")
-        self.driver = self.initialize_browser(self.browser)
+        self.driver = self.acquire_browser(self.browser)
         self.url = LANGUAGE_SETTINGS[self.language]["home_url"]
         self.driver.get(self.url)
         # self.driver.maximize_window()
@@ -54,14 +44,14 @@ class TestLuckyWheelSpinPage(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
     
     def get_api_token(self):
         data = {
             "username": self.username,
             "password": self.password
         }
-        response = requests.post(f"{API_URL}/api/login", data=data)
+        response = http_client.post(f"{API_URL}/api/login", data=data)
         response.raise_for_status()
         result = response.json().get("data")
         self.token = result['token']
@@ -72,7 +62,7 @@ class TestLuckyWheelSpinPage(BaseTest):
                 "Accept": "application/json",
                 "Content-Type": "application/json"
             }
-        response = requests.get(f"{CREDENTIALS['BO_base_url']}/api/user", headers=headers)
+        response = http_client.get(f"{CREDENTIALS['BO_base_url']}/api/user", headers=headers)
         return response.json().get("data")["id"]
     
     def get_spin_api(self):
@@ -80,23 +70,32 @@ class TestLuckyWheelSpinPage(BaseTest):
             "Authorization": f"Bearer {self.token}",
             "Language": self.language
         }
-        response = requests.get(f"{API_URL}/api/getPrizes?type=wheel", headers=headers)
+        response = http_client.get(f"{API_URL}/api/getPrizes?type=wheel", headers=headers)
         response.raise_for_status()
         prizes = response.json().get("data").get("prizes")
         spin_left = response.json().get("data").get("spin_left")
         tnc = response.json().get("data").get("tnc")
         return prizes, spin_left, tnc
 
+    def get_wheel_tnc(self):
+        # spin_left is per user and read fresh through get_spin_api; only the T&C text is shared
+        def fetch():
+            _, _, tnc = self.get_spin_api()
+            return tnc
+
+        return self.cached_reference("wheel_tnc", fetch, language=self.language)
+
     def get_probability_api(self):
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Language": self.language
-        }
-        response = requests.get(f"{API_URL}/api/getPrizesWithProbability", headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        prizes = data.get("data")
-        return prizes
+        def fetch():
+            headers = {
+                "Authorization": f"Bearer {self.token}",
+                "Language": self.language
+            }
+            response = http_client.get(f"{API_URL}/api/getPrizesWithProbability", headers=headers)
+            response.raise_for_status()
+            return response.json().get("data")
+
+        return self.cached_reference("wheel_probabilities", fetch, language=self.language)
     
     def prize_popup(self):
         try:        
@@ -192,7 +191,7 @@ class TestLuckyWheelSpinPage(BaseTest):
         headers = {
             "Authorization": f"Bearer {self.token}"
         }
-        response = requests.get(f"{API_URL}/api/prizes/history", headers=headers)
+        response = http_client.get(f"{API_URL}/api/prizes/history", headers=headers)
         response.raise_for_status()
         winners = response.json().get("data")
         winner_count = len(winners)
@@ -206,7 +205,7 @@ class TestLuckyWheelSpinPage(BaseTest):
         
         tnc_inner = tnc_elements.get_attribute('innerHTML')
         
-        _, _, tnc_expected = self.get_spin_api()
+        tnc_expected = self.get_wheel_tnc()
                 
         self.assertIn(tnc_expected, tnc_inner, "expected TNC not found")
     
@@ -11,6 +11,7 @@ from config.constant import LANGUAGE_SETTINGS, CREDENTIALS, LIVE_AGENT_URL, PROF
 from tests.authentication_test.base_test import BaseTest
 import tempfile
 import requests
+from utils import http_client
 from urllib.parse import urlparse, unquote
 from selenium.webdriver.common.action_chains import ActionChains
 from tests.test_init import TestInit
@@ -27,7 +28,7 @@ class HomepageData(BaseTest):
         headers = {
             "Authorization": f"Bearer {token}"
         }
-        response = requests.get(f"{CREDENTIALS['GetUser'].format(BO_base_url=CREDENTIALS['BO_base_url'])}", headers=headers)
+        response = http_client.get(f"{CREDENTIALS['GetUser'].format(BO_base_url=CREDENTIALS['BO_base_url'])}", headers=headers)
         response.raise_for_status() 
         return response.json()['data']
 
@@ -38,7 +39,7 @@ class HomepageData(BaseTest):
             "Authorization": f"Bearer {token}",
             "language": self.language
         }
-        response = requests.get(f"{CREDENTIALS['GetProvider'].format(BO_base_url=CREDENTIALS['BO_base_url'])}", headers=headers)
+        response = http_client.get(f"{CREDENTIALS['GetProvider'].format(BO_base_url=CREDENTIALS['BO_base_url'])}", headers=headers)
         return response.json()['data']
 
     def home_api(self, username, password):
@@ -47,7 +48,7 @@ class HomepageData(BaseTest):
         headers = {
             "Authorization": f"Bearer {token}"
         }
-        response = requests.get(f"{CREDENTIALS['GetHome'].format(BO_base_url=CREDENTIALS['BO_base_url'])}", headers=headers)
+        response = http_client.get(f"{CREDENTIALS['GetHome'].format(BO_base_url=CREDENTIALS['BO_base_url'])}", headers=headers)
         return response.json()['data']
         
 
@@ -61,7 +62,7 @@ class TestProfilePage(BaseTest):
         if not self.browser or not self.language:
             raise ValueError("Browser or language is not set.")
         self.logger.info(f"Setting up {self.browser} browser for {self.language} language...")
-        self.driver = self.initialize_browser(self.browser)
+        self.driver = self.acquire_browser(self.browser)
         self.url = LANGUAGE_SETTINGS[self.language]["home_url"]
         self.driver.get(self.url)
         # self.driver.maximize_window()
@@ -71,7 +72,7 @@ class TestProfilePage(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
     
     def setup_test_user(self, register_new=False):
         """Set up test user - either create new or use existing"""
@@ -207,7 +208,7 @@ class TestProfilePage(BaseTest):
             # Create a temporary file
             with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as temp_file:
                 try:
-                    response = requests.get(invalid_file_url)
+                    response = http_client.get(invalid_file_url)
                     response.raise_for_status()  # Raises an HTTPError for bad responses
                     temp_file.write(response.content)
                     invalid_file_path = temp_file.name
@@ -300,7 +301,7 @@ class TestProfilePage(BaseTest):
 
     def check_img_response(self, img_url):
         """Check if image URL is valid"""
-        response = requests.get(img_url)
+        response = http_client.get(img_url)
         response.raise_for_status()
         return True
 
@@ -11,6 +11,7 @@ from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from config.constant import API_URL, CREDENTIALS, LANGUAGE_SETTINGS
 from tests.authentication_test.base_test import BaseTest
+from utils.logs import get_logger
 import pyperclip
 from PIL import Image
 import io
@@ -18,7 +19,7 @@ from pyzbar.pyzbar import decode
 from urllib.parse import urlparse, parse_qs
 from tests.test_init import TestInit
 from typing import Dict, Any, Optional, List, Union, Tuple, BinaryIO, TypeVar, Type
-import requests
+from utils import http_client
 import math
 import re
 from datetime import datetime, timedelta
@@ -33,14 +34,7 @@ class TestPromotion(BaseTest):
         super().__init__(methodName)
         self.language = language
         self.browser = browser
-        self.logger = logging.getLogger(f"{self.__class__.__name__}")
-        self.logger.setLevel(logging.INFO)
-        self.logger.propagate = False
-
-        if not self.logger.handlers:
-            handler = logging.FileHandler('4d_lotto_record.log')
-            handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-            self.logger.addHandler(handler)
+        self.logger = get_logger(self.__class__.__name__, "4d_lotto_record.log", "%(asctime)s - %(levelname)s - %(message)s")
 
         self.test_init = TestInit(methodName="runTest", language=language, browser=browser)
 
@@ -48,7 +42,7 @@ class TestPromotion(BaseTest):
         if not self.browser or not self.language:
             raise ValueError("Browser or language is not set.")
         self.logger.info(f"Setting up {self.browser} browser for {self.language} language...")
-        self.driver = self.initialize_browser(self.browser)
+        self.driver = self.acquire_browser(self.browser)
         self.url = LANGUAGE_SETTINGS[self.language]["home_url"]
         self.driver.get(self.url)
         # self.driver.maximize_window()
@@ -57,7 +51,7 @@ class TestPromotion(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
     
     def setup_test_user(self, register_new=False):
         """Set up test user - either create new or use existing"""
@@ -114,16 +108,18 @@ class TestPromotion(BaseTest):
         self.navigate_to_profile_menu("profile-menu-promotion")
     
     def get_all_promotion_api(self):
-        token = self.login(self.username, self.password)
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/json",
-            "Language": self.language
-        }
-        response = requests.get(f"{CREDENTIALS['GetAllPromotion'].format(BO_base_url = CREDENTIALS["BO_base_url"])}", headers=headers)
-        response.raise_for_status()
-        promotions = response.json().get("data").get("promotions")
-        return promotions
+        def fetch():
+            token = self.login(self.username, self.password)
+            headers = {
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/json",
+                "Language": self.language
+            }
+            response = http_client.get(f"{CREDENTIALS['GetAllPromotion'].format(BO_base_url = CREDENTIALS["BO_base_url"])}", headers=headers)
+            response.raise_for_status()
+            return response.json().get("data").get("promotions")
+
+        return self.cached_reference("promotions", fetch, language=self.language)
 
     def normalize_with_bs4(self, html_str):
         soup = BeautifulSoup(html_str, 'html.parser')
@@ -10,6 +10,7 @@ from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from config.constant import API_URL, LANGUAGE_SETTINGS, CREDENTIALS
 from tests.authentication_test.base_test import BaseTest
+from utils.logs import get_logger
 import pyperclip
 from PIL import Image
 import io
@@ -22,20 +23,19 @@ import math
 import re
 class TestVipMemberLevel(BaseTest):
 
+    # Tests share one account and build on each other's state; run them in order on one worker
+    ORDERED_TESTS = True
+
+    # Account above the first VIP level for the read-only profile tests, leased once per process
+    vip_account = None
+
     def __init__(
         self, methodName: str = 'runTest', language: Optional[str] = None, browser: Optional[str] = None
     ) -> None:
         super().__init__(methodName)
         self.language = language
         self.browser = browser
-        self.logger = logging.getLogger(f"{self.__class__.__name__}")
-        self.logger.setLevel(logging.INFO)
-        self.logger.propagate = False
-
-        if not self.logger.handlers:
-            handler = logging.FileHandler('vip_member_level.log')
-            handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-            self.logger.addHandler(handler)
+        self.logger = get_logger(self.__class__.__name__, "vip_member_level.log", "%(asctime)s - %(levelname)s - %(message)s")
 
         self.test_init = TestInit(methodName="runTest", language=language, browser=browser)
 
@@ -43,7 +43,7 @@ class TestVipMemberLevel(BaseTest):
         if not self.browser or not self.language:
             raise ValueError("Browser or language is not set.")
         self.logger.info(f"Setting up {self.browser} browser for {self.language} language...")
-        self.driver = self.initialize_browser(self.browser)
+        self.driver = self.acquire_browser(self.browser)
         self.url = LANGUAGE_SETTINGS[self.language]["home_url"]
         self.driver.get(self.url)
         # self.driver.maximize_window()
@@ -52,15 +52,19 @@ class TestVipMemberLevel(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
     
     def setup_test_user(self, register_new=False):
         """Set up test user - either create new or use existing"""
         if register_new:
             self.username, self.password = self.test_init.register_new_account()
         else:
-            self.username = "LuffyTest5"
-            self.password = "LuffyTest5"
+            if TestVipMemberLevel.vip_account is None:
+                account = self.test_init.lease_account("vip")
+                TestVipMemberLevel.vip_account = (
+                    (account["username"], account["password"]) if account else ("LuffyTest5", "LuffyTest5")
+                )
+            self.username, self.password = TestVipMemberLevel.vip_account
         
         self.navigate_to_login_page()
         self.perform_login(self.username, self.password)
@@ -2,7 +2,7 @@ import unittest
 import time
 import logging
 import random
-import requests
+from utils import http_client
 from datetime import datetime, timedelta
 from decimal import Decimal, ROUND_HALF_UP
 from selenium.webdriver.common.by import By
@@ -52,7 +52,7 @@ class TestHistory(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
 
     def navigate_to_history(self):
         driver = self.driver
@@ -63,7 +63,7 @@ class TestHistory(BaseTest):
         driver = self.driver
         date_picker = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, picker_id)))
         date_picker.click()
-        time.sleep(2)
+        self.settle(max_wait=2)
 
         WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.CLASS_NAME, "MuiDayCalendar-root")))
 
@@ -74,7 +74,7 @@ class TestHistory(BaseTest):
 
         ok_button = driver.find_element(By.XPATH, "//button[text()='OK']")
         ok_button.click()
-        time.sleep(2)
+        self.settle(max_wait=2)
 
         date_picker = driver.find_element(By.ID, picker_id)
         date_str = date_picker.get_attribute("value")
@@ -108,11 +108,11 @@ class TestHistory(BaseTest):
         self.logger.info(f"Current datetime: {current_datetime}")
         self.logger.info(f"Current datetime for comparison: {current_datetime.strftime('%d/%m/%Y')}")
 
-        time.sleep(1)
+        self.settle(max_wait=1)
 
         start_picker = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "start-date-picker")))
         start_picker.click()
-        time.sleep(1)
+        self.settle(max_wait=1)
 
         WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.CLASS_NAME, "MuiDayCalendar-root")))
 
@@ -174,7 +174,7 @@ class TestHistory(BaseTest):
                 start_date_elem.click()
 
             driver.find_element(By.XPATH, "//button[text()='OK']").click()
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             start_picker = driver.find_element(By.ID, "start-date-picker")
             start_date_str = start_picker.get_attribute("value")
@@ -183,7 +183,7 @@ class TestHistory(BaseTest):
 
             end_picker = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "end-date-picker")))
             end_picker.click()
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.CLASS_NAME, "MuiDayCalendar-root")))
 
@@ -221,7 +221,7 @@ class TestHistory(BaseTest):
                 last_date.click()
 
             driver.find_element(By.XPATH, "//button[text()='OK']").click()
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             # Log the selected date range
             end_picker = driver.find_element(By.ID, "end-date-picker")
@@ -235,7 +235,7 @@ class TestHistory(BaseTest):
         self.logger.info(f"Selected start date element: {random_start_date.text}")
 
         driver.find_element(By.XPATH, "//button[text()='OK']").click()
-        time.sleep(1)
+        self.settle(max_wait=1)
 
         start_picker = driver.find_element(By.ID, "start-date-picker")
         start_date_str = start_picker.get_attribute("value")
@@ -246,7 +246,7 @@ class TestHistory(BaseTest):
 
         end_picker = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "end-date-picker")))
         end_picker.click()
-        time.sleep(1)
+        self.settle(max_wait=1)
 
         WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.CLASS_NAME, "MuiDayCalendar-root")))
 
@@ -261,7 +261,7 @@ class TestHistory(BaseTest):
             self.logger.info(f"Selected last available date as end date: {random_end_date.text}")
 
         driver.find_element(By.XPATH, "//button[text()='OK']").click()
-        time.sleep(1)
+        self.settle(max_wait=1)
 
         end_picker = driver.find_element(By.ID, "end-date-picker")
         end_date_str = end_picker.get_attribute("value")
@@ -288,14 +288,14 @@ class TestHistory(BaseTest):
             if option_id == f"history-type-option-{record_type}":
                 record_type_value = option_id.split("-")[-1]
                 self.logger.info(f"Record type value extracted from ID: {record_type_value}")
-                time.sleep(2)
+                self.settle(max_wait=2)
                 self.logger.info(f"Selecting record type: {i.text}")
                 i.click()
                 return record_type_value
 
     def check_date_record(self, index):
         self.open_dropdown(index)
-        time.sleep(2)
+        self.settle(max_wait=2)
         date_options = WebDriverWait(self.driver, 10).until(
             EC.visibility_of_all_elements_located((By.CSS_SELECTOR, "li[id^='date-type-option-']"))
         )
@@ -362,7 +362,7 @@ class TestHistory(BaseTest):
             record_option = WebDriverWait(self.driver,
                                           10).until(EC.visibility_of_element_located((By.ID, record_type_id)))
             record_option.click()
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             date_option_id = record_type_id.split("-")[-1]
             self.logger.info(f"Extracted date option ID: {date_option_id}")
@@ -457,7 +457,7 @@ class TestHistory(BaseTest):
 
                 self.logger.info(f"API URL: {api_url}")
 
-                deposit_info_response = requests.get(api_url, headers=headers)
+                deposit_info_response = http_client.get(api_url, headers=headers)
                 if deposit_info_response.status_code != 200:
                     self.logger.error(f"Failed to get deposit info: {deposit_info_response.text}")
                     return False
@@ -468,8 +468,9 @@ class TestHistory(BaseTest):
                 api_records = deposit_info.get('data', {}).get('data', [])
                 self.logger.info(f"API returned {len(api_records)} records")
 
-                first_row = rows[0]
-                cells = first_row.find_elements(By.CSS_SELECTOR, "td.MuiTableCell-body")
+                # Every row's cell texts in one round-trip
+                row_texts = self.table_cell_texts(rows)
+                cells = row_texts[0]
 
                 if date_in_range and api_records:
                     time_recorded = False
@@ -482,8 +483,7 @@ class TestHistory(BaseTest):
                     self.logger.info(f"Record type ID: {record_type_value}")
                     match record_type_value:
                         case "bet":
-                            for i, cell in enumerate(cells):
-                                cell_text = cell.text
+                            for i, cell_text in enumerate(cells):
 
                                 match i:
                                     case 0:
@@ -504,7 +504,7 @@ class TestHistory(BaseTest):
                                                 self.fail(f"✗ Provider ID cell is incorrect")
                                     case 3:
                                         # Convert Unicode Minus to ASCII Hyphen
-                                        normalized_text = cell.text.replace("\u2212", "-")
+                                        normalized_text = cell_text.replace("\u2212", "-")
                                         if game_win:
                                             if not normalized_text.strip().startswith("-"):
                                                 self.logger.info(f"✓ Win/Loss cell has value: {cell_text}")
@@ -512,7 +512,7 @@ class TestHistory(BaseTest):
                                             else:
                                                 self.fail(f"✗ Win/Loss cell is incorrect")
                                         else:
-                                            self.logger.info(f"Loss: {cell.text}")
+                                            self.logger.info(f"Loss: {cell_text}")
                                             if normalized_text.strip().startswith("-"):
                                                 self.logger.info(f"✓ Win/Loss cell has value: {cell_text}")
                                                 win_loss_recorded = True
@@ -526,8 +526,7 @@ class TestHistory(BaseTest):
 
                         case "deposit" | "withdraw":
 
-                            for i, cell in enumerate(cells):
-                                cell_text = cell.text
+                            for i, cell_text in enumerate(cells):
 
                                 match i:
                                     case 0:
@@ -608,8 +607,7 @@ class TestHistory(BaseTest):
                                 return False
                         case "promo":
 
-                            for i, cell in enumerate(cells):
-                                cell_text = cell.text
+                            for i, cell_text in enumerate(cells):
                                 match i:
                                     case 0:
                                         if current_time in cell_text:
@@ -675,9 +673,8 @@ class TestHistory(BaseTest):
                                 row_amount_recorded = False
                                 current_reward_type = None
 
-                                cells = row.find_elements(By.CSS_SELECTOR, "td.MuiTableCell-body")
-                                for i, cell in enumerate(cells):
-                                    cell_text = cell.text
+                                cells = row_texts[row_index]
+                                for i, cell_text in enumerate(cells):
 
                                     match i:
                                         case 0:
@@ -760,7 +757,7 @@ class TestHistory(BaseTest):
                                 self.logger.error("✗ Transfer should have two rows (source and destination)")
                                 return False
                 else:
-                    if cells[0].text == LANGUAGE_SETTINGS[self.language]["history"]["no_record"]:
+                    if cells[0] == LANGUAGE_SETTINGS[self.language]["history"]["no_record"]:
                         self.logger.info(f"No {record_type_text} records found in UI as expected (date out of range)")
                         return True
                     elif not date_in_range:
@@ -836,7 +833,7 @@ class TestHistory(BaseTest):
 
     def verify_transfer_row(self, row, api_record, wallet_name, current_time, amount, cell_mapping, row_name):
         self.logger.info(f"Checking {row_name}:")
-        row_cells = row.find_elements(By.CSS_SELECTOR, "td.MuiTableCell-body")
+        row_cells = self.table_cell_texts([row])[0]
 
         verifications = {
             "time": False,
@@ -846,8 +843,7 @@ class TestHistory(BaseTest):
             "status": False
         }
 
-        for i, cell in enumerate(row_cells):
-            cell_text = cell.text
+        for i, cell_text in enumerate(row_cells):
             self.logger.info(f"Cell {i} ({cell_mapping.get(i, 'Unknown')}): {cell_text}")
 
             match i:
@@ -946,7 +942,7 @@ class TestHistory(BaseTest):
         # Place bet
         place_bet_url = f"{CREDENTIALS['PlaceBet'].format(BO_base_url = CREDENTIALS["BO_base_url"], userID=self.userID, transfer_amount=transfer_amount, type=type, game_id=game_id, game_record_date=current_date)}"
 
-        response = requests.get(place_bet_url, headers=headers)
+        response = http_client.get(place_bet_url, headers=headers)
         if response.status_code != 200:
             self.fail(f"Failed to place bet: {response.status_code}")
         else:
@@ -955,7 +951,7 @@ class TestHistory(BaseTest):
         return transfer_details, current_time, game_win
 
     def verify_rebate_rows(self, row, api_record, rebate_info):
-        row_cells = row.find_elements(By.CSS_SELECTOR, "td.MuiTableCell-body")
+        row_cells = self.table_cell_texts([row])[0]
 
         verifications = {
             "time": False,
@@ -965,8 +961,7 @@ class TestHistory(BaseTest):
             "status": False
         }
 
-        for i, cell in enumerate(row_cells):
-            cell_text = cell.text
+        for i, cell_text in enumerate(row_cells):
 
             match i:
                 case 0:
@@ -1047,7 +1042,7 @@ class TestHistory(BaseTest):
     def test_01_ChooseRecordType(self):
         try:
             self.driver
-            time.sleep(1)
+            self.settle(max_wait=1)
             self.select_dropdown_option(expand_icon_index=0, item_css_selector="li.MuiMenuItem-root")
         except Exception as e:
             self.fail(f"Test failed {str(e)}")
@@ -1055,7 +1050,7 @@ class TestHistory(BaseTest):
     def test_02_ChooseDate(self):
         try:
             self.driver
-            time.sleep(1)
+            self.settle(max_wait=1)
             self.select_dropdown_option(
                 expand_icon_index=1, item_css_selector="li.MuiMenuItem-root", check_start_end_disable=True
             )
@@ -1066,10 +1061,10 @@ class TestHistory(BaseTest):
         try:
             self.clear_selection()
             start_date = self.choose_date("start-date-picker", return_date=True)
-            time.sleep(2)
+            self.settle(max_wait=2)
             self.logger.info(f"Start Date: {start_date}")
             end_date = self.choose_date("end-date-picker", return_date=True)
-            time.sleep(2)
+            self.settle(max_wait=2)
             self.logger.info(f"End Date: {end_date}")
             try:
                 date_type_button = self.driver.find_element(By.ID, "date-type-button")
@@ -1097,10 +1092,10 @@ class TestHistory(BaseTest):
             self.select_random_options(0)
             self.choose_date(0)
             self.choose_date(1)
-        time.sleep(2)
+        self.settle(max_wait=2)
         try:
             self.clear_selection()
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             try:
                 date_inputs = WebDriverWait(driver, 10).until(
@@ -1132,10 +1127,10 @@ class TestHistory(BaseTest):
             self.handleDeposit(self.userID)
 
             self.driver.refresh()
-            time.sleep(2)
+            self.settle(max_wait=2)
             self.open_dropdown(0)
             record_type_value = self.choose_specific_record_type("deposit")
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             record_types = self.check_date_record(1)
             self.logger.info(f"Found {len(record_types)} record types")
@@ -1154,7 +1149,7 @@ class TestHistory(BaseTest):
                     self.fail(f"Test failed: {str(e)}")
 
                 self.open_dropdown(1)
-            time.sleep(1)
+            self.settle(max_wait=1)
 
         except Exception as e:
             self.fail(f"Test failed: {str(e)}")
@@ -1169,11 +1164,11 @@ class TestHistory(BaseTest):
 
             self.handleDeposit(self.userID)
             self.clear_selection()
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             self.open_dropdown(0)
             record_type_value = self.choose_specific_record_type("deposit")
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             self.choose_date_range_with_current_time(current_time)
             has_records = self.verify_record_history(
@@ -1222,7 +1217,7 @@ class TestHistory(BaseTest):
             current_time = datetime.now().strftime("%d/%m/%Y %I:%M %p")
             self.open_dropdown(0)
             record_type_value = self.choose_specific_record_type("withdraw")
-            time.sleep(2)
+            self.settle(max_wait=2)
             record_types = self.check_date_record(1)
             self.logger.info(f"Found {len(record_types)} record types")
             self.logger.info(f"Record types: {record_types}")
@@ -1255,11 +1250,11 @@ class TestHistory(BaseTest):
             self.logger.info(f"Transfer Amount: {transfer_amount}")
             transfer_details, _ = self.transfer_to_random_game(transfer_amount, self.username, self.password)
             self.clear_selection()
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             self.open_dropdown(0)
             record_type_value = self.choose_specific_record_type("transfer")
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             record_types = self.check_date_record(1)
             self.logger.info(f"Found {len(record_types)} record types")
@@ -1302,10 +1297,10 @@ class TestHistory(BaseTest):
             self.logger.info(f"Deposit Amount: {amount}")
             self.handleDeposit(self.userID)
             self.clear_selection()
-            time.sleep(2)
+            self.settle(max_wait=2)
             self.open_dropdown(0)
             record_type_value = self.choose_specific_record_type("promo")
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             record_types = self.check_date_record(1)
             self.logger.info(f"Found {len(record_types)} record types")
@@ -1342,10 +1337,10 @@ class TestHistory(BaseTest):
             self.logger.info(f"Expected reward counts: {expected_reward_counts}")
             self.handleDeposit(self.userID)
             self.clear_selection()
-            time.sleep(2)
+            self.settle(max_wait=2)
             self.open_dropdown(0)
             record_type_value = self.choose_specific_record_type("reward")
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             record_types = self.check_date_record(1)
             self.logger.info(f"Found {len(record_types)} record types")
@@ -1374,10 +1369,10 @@ class TestHistory(BaseTest):
             transfer_details, current_time, game_win = self.setup_for_bet_test()
 
             self.clear_selection()
-            time.sleep(2)
+            self.settle(max_wait=2)
             self.open_dropdown(0)
             record_type_value = self.choose_specific_record_type("bet")
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             record_types = self.check_date_record(1)
             self.logger.info(f"Found {len(record_types)} record types")
@@ -1406,11 +1401,11 @@ class TestHistory(BaseTest):
             transfer_details, current_time, game_win = self.setup_for_bet_test(use_yesterday=True)
 
             self.clear_selection()
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             self.open_dropdown(0)
             record_type_value = self.choose_specific_record_type("bet")
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             record_types = self.check_date_record(1)
             self.logger.info(f"Found {len(record_types)} record types")
@@ -1446,7 +1441,7 @@ class TestHistory(BaseTest):
             rebate_info_list = []
 
             create_downline_api = CREDENTIALS['CreateDownline'].format(BO_base_url = CREDENTIALS["BO_base_url"], userID=self.userID)
-            response = requests.get(create_downline_api)
+            response = http_client.get(create_downline_api)
             if response.status_code != 200:
                 self.fail(f"Failed to create downline: {response.status_code}")
             else:
@@ -1458,10 +1453,10 @@ class TestHistory(BaseTest):
                 }
                 self.logger.info(f"Downline Users: {downline_users}")
 
-                # Process each user tier
+                # Submit every tier user's deposit first, then approve them all in one back-office call
+                deposit_amounts = {}
                 for user_tier in downline_users:
                     for tier_user in downline_users[user_tier]:
-                        self.logger.info(f"Processing Tier User: {tier_user['id']}")
                         deposit_result = self.test_init.submit_deposit_api(
                             username=tier_user['username'], password=tier_user['password'], check_history_amount=True,
                             amount=random.randint(250, 2000)
@@ -1478,15 +1473,18 @@ class TestHistory(BaseTest):
                                 self.logger.error("Deposit failed, but continuing with default amount")
 
                         self.logger.info(f"Deposit Amount: {user_amount}")
-                        self.handleDeposit(tier_user['id'])
-                        rebate_percentage = 0
+                        deposit_amounts[tier_user['id']] = user_amount
 
-                        check_rebate_percentage = CREDENTIALS['CheckRebatePercentage'].format(BO_base_url = CREDENTIALS["BO_base_url"])
-                        response = requests.get(check_rebate_percentage)
-                        if response.status_code != 200:
-                            self.fail(f"Failed to check rebate percentage: {response.status_code}")
+                self.handleDeposits(list(deposit_amounts))
+
+                # Process each user tier
+                for user_tier in downline_users:
+                    for tier_user in downline_users[user_tier]:
+                        self.logger.info(f"Processing Tier User: {tier_user['id']}")
+                        user_amount = deposit_amounts[tier_user['id']]
+                        rebate_percentage = 0
 
-                        rebate_data = response.json()
+                        rebate_data = self.get_rebate_percentages()
                         tier_level = "2" if user_tier == "t2_users" else "3"
 
                         eligible_providers = []
@@ -1583,7 +1581,7 @@ class TestHistory(BaseTest):
 
                         # Place bet to generate rebate
                         place_bet_url = f"{CREDENTIALS['PlaceBet'].format(BO_base_url = CREDENTIALS["BO_base_url"], userID=tier_user['id'], transfer_amount=user_amount, type=1, game_id=transfer_details['target_id'], game_record_date=current_date)}"
-                        response = requests.get(place_bet_url)
+                        response = http_client.get(place_bet_url)
                         self.logger.info(f"userid: {tier_user['id']}")
                         self.logger.info(f"Response: {response.status_code}")
                         if response.status_code != 200:
@@ -1596,17 +1594,17 @@ class TestHistory(BaseTest):
             self.logger.info(f"Current user: {self.userID}")
             self.logger.info(f"Current month: {current_month}")
             rebate_simulation_url = f"{CREDENTIALS['CreateRebate'].format(BO_base_url = CREDENTIALS["BO_base_url"], userID=self.userID, current_month=current_month)}"
-            response = requests.get(rebate_simulation_url)
+            response = http_client.get(rebate_simulation_url)
             if response.status_code != 200:
                 self.fail(f"Failed to create rebate: {response.status_code}")
             else:
                 self.logger.info("Rebate created successfully")
 
             self.clear_selection()
-            time.sleep(2)
+            self.settle(max_wait=2)
             self.open_dropdown(0)
             record_type_value = self.choose_specific_record_type("rebate")
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             record_types = self.check_date_record(1)
             self.logger.info(f"Found {len(record_types)} record types")
@@ -1645,11 +1643,11 @@ class TestHistory(BaseTest):
 
             self.handleDeposit(self.userID)
             self.clear_selection()
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             self.open_dropdown(0)
             self.choose_specific_record_type("deposit")
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             self.choose_date_range_with_current_time(current_time, isoutofrange=True)
 
@@ -1659,17 +1657,16 @@ class TestHistory(BaseTest):
                 )
                 rows = table.find_elements(By.CSS_SELECTOR, "tbody.MuiTableBody-root tr")
                 if len(rows) > 0:
-                    first_row = rows[0]
-                    cells = first_row.find_elements(By.CSS_SELECTOR, "td.MuiTableCell-body")
+                    cells = self.table_cell_texts(rows[:1])[0]
 
                     no_record_message = LANGUAGE_SETTINGS[self.language]["history"]["no_record"]
                     self.logger.info(f"Expected 'no record' message: {no_record_message}")
-                    self.logger.info(f"Actual message: {cells[0].text}")
+                    self.logger.info(f"Actual message: {cells[0]}")
 
-                    if cells[0].text == no_record_message:
+                    if cells[0] == no_record_message:
                         self.logger.info("✓ 'No record' message displayed correctly for out-of-range dates")
                     else:
-                        self.fail(f"✗ Expected 'no record' message but found: {cells[0].text}")
+                        self.fail(f"✗ Expected 'no record' message but found: {cells[0]}")
                 else:
                     self.fail("✗ Table rows not found")
             except TimeoutException:
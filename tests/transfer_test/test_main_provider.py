@@ -4,22 +4,18 @@ import requests
 import json
 from tests.authentication_test.base_test import BaseTest
 from config.constant import LANGUAGE_SETTINGS, CREDENTIALS
-import pandas as pd
 from datetime import datetime
 import random
 from tests.transfer_test.transfer_base import TransferBase
+from tests.api_base import ApiTestBase
 
 
-class TestMainProvider(TransferBase):
+class TestMainProvider(ApiTestBase, TransferBase):
 
     def __init__(self, methodName="runTest", language=None, browser=None):
         super().__init__(methodName, language, browser)
         self.TRANSFER_AMOUNT = 2.0
 
-    def setUp(self):
-        #super().setUp()
-        pass
-
     def test_01_TransferToAllProviders(self):
         try:
             print("\n=== Main to Provider Transfer Test ===")
@@ -57,38 +53,9 @@ class TestMainProvider(TransferBase):
             )
 
             print("\n6. Generating report...")
-            df = pd.DataFrame(transfer_results['test_results'])
-            df = df[[
-                "Game ID", "Game Name", "Initial Balance", "Transfer Amount", "Expected Balance", "Final Balance",
-                "Status", "Response Code", "Error Message"
-            ]]
-
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             excel_path = f"test_results/main_provider_transfer_test_{timestamp}.xlsx"
-
-            with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-                success_count = len(transfer_results['successful_transfers'])
-                unique_errors = set(
-                    r["Error Message"] for r in transfer_results['test_results'] if r["Status"] == "Failed"
-                )
-
-                summary_data = {
-                    "Metric": [
-                        "Total Providers Tested", "Successful Transfers", "Failed Transfers", "Success Rate (%)",
-                        "Initial Main Balance", "Final Main Balance", "Total Amount Transferred",
-                        "Unique Error Messages"
-                    ],
-                    "Value": [
-                        len(transfer_results['test_results']), success_count,
-                        len(transfer_results['test_results']) - success_count,
-                        round(success_count * 100 /
-                              len(transfer_results['test_results']), 2) if transfer_results['test_results'] else 0,
-                        f"RM {transfer_results['initial_balance']}", f"RM {transfer_results['final_balance']}",
-                        f"RM {total_transferred}", "\n".join(unique_errors)
-                    ]
-                }
-                pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
-                df.to_excel(writer, sheet_name='Transfer Details', index=False)
+            success_count = self.write_transfer_report(excel_path, transfer_results, total_transferred)
 
             print(f"\nTest completed! Results saved to: {excel_path}")
             success_rate = round(success_count * 100 /
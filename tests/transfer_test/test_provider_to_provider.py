@@ -1,26 +1,28 @@
 import unittest
 import time
-import requests
+from utils import http_client
 import json
 import random
 from tests.authentication_test.base_test import BaseTest
 from tests.test_init import TestInit
+from tests.api_base import ApiTestBase
 from config.constant import LANGUAGE_SETTINGS, CREDENTIALS
-import pandas as pd
+from utils.report import ExcelReportWriter
 from datetime import datetime
 
 
-class TestProviderToProvider(BaseTest):
+class TestProviderToProvider(ApiTestBase):
 
     def __init__(self, methodName="runTest", language=None, browser=None):
         super().__init__(methodName, language, browser)
         self.test_init = TestInit(methodName="runTest", language=language, browser=browser)
 
     def setUp(self):
+        super().setUp()
         self.TRANSFER_AMOUNT = 2.0
 
     def get_main_account_balance(self, headers):
-        response = requests.get(f"{CREDENTIALS['BO_base_url']}/api/balance", headers=headers)
+        response = http_client.get(f"{CREDENTIALS['BO_base_url']}/api/balance", headers=headers)
         response.raise_for_status()
         return response.json().get("data")["balance"]
 
@@ -30,7 +32,7 @@ class TestProviderToProvider(BaseTest):
             "target_id": target_id,
             "amount": amount
         }
-        response = requests.post(f"{CREDENTIALS['BO_base_url']}/api/transfers", json=payload, headers=headers)
+        response = http_client.post(f"{CREDENTIALS['BO_base_url']}/api/transfers", json=payload, headers=headers)
         return response
 
     def print_game_data(self, label, game_data):
@@ -39,11 +41,11 @@ class TestProviderToProvider(BaseTest):
         print(formatted_data + "\n")
 
     def revert_all(self, headers):
-        response = requests.post(f"{CREDENTIALS['BO_base_url']}/api/revertAll", headers=headers)
+        response = http_client.post(f"{CREDENTIALS['BO_base_url']}/api/revertAll", headers=headers)
         return response
 
     def get_id_api(self, headers):
-        response = requests.get(f"{CREDENTIALS['BO_base_url']}/api/user", headers=headers)
+        response = http_client.get(f"{CREDENTIALS['BO_base_url']}/api/user", headers=headers)
         return response.json().get("data")["id"]
 
     def test_01_RandomProviderToProviderTransfer(self):
@@ -128,41 +130,38 @@ class TestProviderToProvider(BaseTest):
 
             print("\n\n6. Generating report...")
             # Create Excel report with additional sheet for failed initial transfers
-            df = pd.DataFrame(transfer_results)
-            failed_df = pd.DataFrame(failed_providers)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             excel_path = f"test_results/provider_to_provider_test_{timestamp}.xlsx"
 
-            with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
+            success_count = len([r for r in transfer_results if r["Status"] == "Success"])
+            unique_errors = set(r["Error Message"] for r in transfer_results if r["Status"] == "Failed")
+            detail_columns = list(transfer_results[0].keys()) if transfer_results else ["Status"]
+            sheets = {"Summary": ["Metric", "Value"], "Transfer Details": detail_columns}
+            if failed_providers:
+                sheets["Failed Initial Transfers"] = list(failed_providers[0].keys())
+
+            with ExcelReportWriter(excel_path, sheets) as report:
                 # Summary statistics
-                success_count = len([r for r in transfer_results if r["Status"] == "Success"])
-                unique_errors = set(r["Error Message"] for r in transfer_results if r["Status"] == "Failed")
-
-                summary_data = {
-                    "Metric": [
-                        "Total Providers", "Successfully Funded Providers", "Failed Funding Providers",
-                        "Total Transfers Attempted", "Successful Transfers", "Failed Transfers", "Success Rate (%)",
-                        "Unique Error Messages"
-                    ],
-                    "Value": [
-                        len(initial_game_data) - 1,  # Total providers (excluding main wallet)
-                        len(funded_providers),
-                        len(failed_providers),
-                        len(transfer_results),  # Total transfers attempted
-                        success_count,
-                        len(transfer_results) - success_count,
-                        round(success_count * 100 / len(transfer_results), 2) if transfer_results else 0,
-                        "\n".join(unique_errors)
-                    ]
-                }
-                pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
+                summary = [
+                    ("Total Providers", len(initial_game_data) - 1),  # Total providers (excluding main wallet)
+                    ("Successfully Funded Providers", len(funded_providers)),
+                    ("Failed Funding Providers", len(failed_providers)),
+                    ("Total Transfers Attempted", len(transfer_results)),
+                    ("Successful Transfers", success_count),
+                    ("Failed Transfers", len(transfer_results) - success_count),
+                    ("Success Rate (%)", round(success_count * 100 / len(transfer_results), 2) if transfer_results else 0),
+                    ("Unique Error Messages", "\n".join(unique_errors)),
+                ]
+                for metric, value in summary:
+                    report.add_row("Summary", [metric, value])
 
                 # Transfer details
-                df.to_excel(writer, sheet_name='Transfer Details', index=False)
+                for result in transfer_results:
+                    report.add_row("Transfer Details", [result.get(column) for column in detail_columns])
 
                 # Failed initial transfers
-                if failed_providers:
-                    failed_df.to_excel(writer, sheet_name='Failed Initial Transfers', index=False)
+                for provider in failed_providers:
+                    report.add_row("Failed Initial Transfers", list(provider.values()))
 
             print(f"\nTest completed! Results saved to: {excel_path}")
             success_rate = round(success_count * 100 / len(transfer_results), 2) if transfer_results else 0
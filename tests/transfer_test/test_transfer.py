@@ -1,7 +1,7 @@
 import unittest
 import time
 import random
-import requests
+from utils import http_client
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -27,7 +27,7 @@ class TestTransfer(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
 
     def switchToCompleteTurnoverAcc(self):
         self.logout()
@@ -77,13 +77,13 @@ class TestTransfer(BaseTest):
         try:
             if gameID is not None:
                 self.logger.info(f"Entering gameID verification mode with gameID: {gameID}")
-                time.sleep(6)
+                self.settle(max_wait=6)
                 self.open_dropdown(index)
-                time.sleep(3)
+                self.settle(max_wait=3)
 
                 if str(gameID) in ['0', '-1']:
                     self.logger.info("Verification: Found main wallet or bobolive")
-                    time.sleep(2)
+                    self.settle(max_wait=2)
                     credit_element = WebDriverWait(self.driver, 10).until(
                         EC.presence_of_element_located((By.ID, f"provider-credit-{gameID}"))
                     )
@@ -101,9 +101,9 @@ class TestTransfer(BaseTest):
                         expand_icon = provider.find_elements(By.CSS_SELECTOR, "[id^='expand-icon-']")
                         if expand_icon:
                             provider.click()
-                            time.sleep(3)
+                            self.settle(max_wait=3)
                             try:
-                                time.sleep(2)
+                                self.settle(max_wait=2)
                                 credit_element = WebDriverWait(self.driver, 10).until(
                                     EC.presence_of_element_located((By.ID, f"game-credit-{gameID}"))
                                 )
@@ -114,7 +114,7 @@ class TestTransfer(BaseTest):
                             except Exception as e:
                                 self.logger.warning(f"Credit element not found: {str(e)}")
                                 self.driver.execute_script("arguments[0].click();", provider)
-                                time.sleep(1)
+                                self.settle(max_wait=1)
                                 continue
                     except Exception as e:
                         self.logger.warning(f"Error with provider: {str(e)}")
@@ -257,7 +257,7 @@ class TestTransfer(BaseTest):
                         self.logger.info(f"Selected random credit game: {selected_game}")
 
                 self.open_dropdown(index)
-                time.sleep(3)
+                self.settle(max_wait=3)
 
                 self.logger.info(f"Selected game: {selected_game}")
 
@@ -279,7 +279,7 @@ class TestTransfer(BaseTest):
 
                     try:
                         self.driver.execute_script("arguments[0].scrollIntoView(true);", wallet)
-                        time.sleep(3)
+                        self.wait_until_stable(wallet, max_wait=3)
 
                         #credit_element = WebDriverWait(self.driver, 10).until(
                         #    EC.presence_of_element_located((By.ID, f"provider-credit-{selected_game['id']}"))
@@ -295,7 +295,7 @@ class TestTransfer(BaseTest):
                     except Exception as e:
                         self.logger.info(f"Failed to click wallet: {str(e)}")
 
-                    time.sleep(2)
+                    self.settle(max_wait=2)
                 else:
                     providers = WebDriverWait(driver, 20).until(
                         EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div[id^='provider-button-']"))
@@ -307,7 +307,7 @@ class TestTransfer(BaseTest):
                             expand_icon = provider.find_elements(By.CSS_SELECTOR, "[id^='expand-icon-']")
                             if expand_icon:
                                 provider.click()
-                                time.sleep(1)
+                                self.settle(max_wait=1)
 
                                 try:
                                     game_selector = f"li[id='game-item-{selected_game['id']}']"
@@ -323,7 +323,7 @@ class TestTransfer(BaseTest):
                                     else:
                                         wallet = wallet_elements[0]
                                     self.driver.execute_script("arguments[0].scrollIntoView(true);", wallet)
-                                    time.sleep(3)
+                                    self.wait_until_stable(wallet, max_wait=3)
                                     #credit_element = WebDriverWait(self.driver, 3).until(
                                     #    EC.presence_of_element_located((By.ID, f"game-credit-{selected_game['id']}"))
                                     #)
@@ -339,7 +339,7 @@ class TestTransfer(BaseTest):
                                 except Exception as e:
                                     self.logger.warning(f"Error clicking game item: {str(e)}")
                                     provider.click()
-                                    time.sleep(5)
+                                    self.settle(max_wait=5)
                                     continue
 
                         except Exception as e:
@@ -359,7 +359,7 @@ class TestTransfer(BaseTest):
 
         turnoverAPI = CREDENTIALS["CheckTurnover"].format(BO_base_url = CREDENTIALS["BO_base_url"], ID=userID, language=language)
         providerslist = set()
-        response = requests.get(turnoverAPI)
+        response = http_client.get(turnoverAPI)
         if response.status_code == 200:
             self.logger.info(f"Turnover API Response: {response.json()}")
             turnoverData = response.json()
@@ -391,7 +391,7 @@ class TestTransfer(BaseTest):
             credit_from_after = self.selectWalletByAmount(0, gameID=FromgameID)
             self.logger.info("done checking from wallet credit1")
             self.driver.refresh()
-            time.sleep(3)
+            self.settle(max_wait=3)
             credit_to_after = self.selectWalletByAmount(0, gameID=TogameID)
             self.logger.info("done checking to wallet credit2")
 
@@ -425,7 +425,7 @@ class TestTransfer(BaseTest):
             credit_from_after = self.selectWalletByAmount(0, gameID=from_game_id)
             self.logger.info("done checking from wallet credit1")
             self.driver.refresh()
-            time.sleep(3)
+            self.settle(max_wait=3)
             credit_to_after = self.selectWalletByAmount(0, gameID=to_game_id)
             self.logger.info("done checking to wallet credit2")
 
@@ -458,7 +458,7 @@ class TestTransfer(BaseTest):
         try:
             driver = self.driver
             self.open_dropdown(0)
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             searchField = WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".MuiInputBase-inputTypeSearch"))
@@ -468,7 +468,7 @@ class TestTransfer(BaseTest):
             searchField.send_keys(search_term)
             self.logger.info(f"Searching for: {search_term}")
 
-            time.sleep(2)
+            self.settle(max_wait=2)
 
             if expected_valid:
                 providers = WebDriverWait(driver, 20).until(
@@ -481,9 +481,9 @@ class TestTransfer(BaseTest):
                         expand_icon = provider.find_elements(By.CSS_SELECTOR, "[id^='expand-icon-']")
                         if expand_icon:
                             self.driver.execute_script("arguments[0].scrollIntoView(true);", provider)
-                            time.sleep(0.5)
+                            self.wait_until_stable(provider, max_wait=0.5)
                             provider.click()
-                            time.sleep(1)
+                            self.settle(max_wait=1)
 
                             game_names = driver.find_elements(By.CSS_SELECTOR, "div[id^='game-name-']")
                             self.logger.info(f"Found {len(game_names)} games in provider")
@@ -500,7 +500,7 @@ class TestTransfer(BaseTest):
                                 break
 
                             provider.click()
-                            time.sleep(0.5)
+                            self.settle(max_wait=0.5)
 
                     except Exception as e:
                         self.logger.warning(f"Error checking provider: {str(e)}")
@@ -587,9 +587,9 @@ class TestTransfer(BaseTest):
                                 EC.element_to_be_clickable((By.ID, "submit-transfer-button"))
                             )
                             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", submit_button)
-                            time.sleep(3)
+                            self.wait_until_stable(submit_button, max_wait=3)
                             submit_button.click()
-                            time.sleep(2)
+                            self.settle(max_wait=2)
 
                             error_icon = WebDriverWait(self.driver, 10).until(
                                 EC.presence_of_element_located((By.CLASS_NAME, "swal2-icon-error"))
@@ -645,7 +645,7 @@ class TestTransfer(BaseTest):
                 modify_url = CREDENTIALS["ModifyTurnover"].format(BO_base_url = CREDENTIALS["BO_base_url"], userID=userID, turnover_id=turnover_id, action=action)
                 self.logger.info(f"Attempting to {action_type} turnover ID: {turnover_id}")
 
-                response = requests.get(modify_url)
+                response = http_client.get(modify_url)
                 if response.status_code == 200:
                     self.logger.info(f"Successfully {action_type} turnover ID: {turnover_id}")
                 else:
@@ -665,7 +665,7 @@ class TestTransfer(BaseTest):
             turnoverAPI = CREDENTIALS["CheckTurnover"].format(BO_base_url = CREDENTIALS["BO_base_url"], ID=userID, language=language)
             turnover_ids = []
 
-            response = requests.get(turnoverAPI)
+            response = http_client.get(turnoverAPI)
             if response.status_code == 200:
                 turnoverData = response.json()
                 self.logger.info(f"Turnover data: {turnoverData}")
@@ -719,7 +719,7 @@ class TestTransfer(BaseTest):
 
                 self.logger.info(f"Attempting API transfer: {transfer_data}")
                 headers["Content-Type"] = "application/json"
-                response = requests.post(
+                response = http_client.post(
                     f"{CREDENTIALS['BO_base_url']}/api/transfers", headers=headers, json=transfer_data
                 )
 
@@ -745,7 +745,7 @@ class TestTransfer(BaseTest):
     def calculate_turnover_amounts_by_type(self, userID, language):
         try:
             turnoverAPI = CREDENTIALS["CheckTurnover"].format(BO_base_url = CREDENTIALS["BO_base_url"], ID=userID, language=language)
-            response = requests.get(turnoverAPI)
+            response = http_client.get(turnoverAPI)
 
             if response.status_code != 200:
                 self.logger.error(f"Failed to get turnover data. Status code: {response.status_code}")
@@ -808,9 +808,9 @@ class TestTransfer(BaseTest):
         submit_button = WebDriverWait(self.driver,
                                       10).until(EC.element_to_be_clickable((By.ID, "submit-transfer-button")))
         self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", submit_button)
-        time.sleep(3)
+        self.wait_until_stable(submit_button, max_wait=3)
         submit_button.click()
-        time.sleep(2)
+        self.settle(max_wait=2)
 
     def test_01_EmptyFields(self):
         driver = self.driver
@@ -845,7 +845,7 @@ class TestTransfer(BaseTest):
                 self.generic_submit(submit="submit-transfer-button")
 
                 try:
-                    time.sleep(1)
+                    self.settle(max_wait=1)
                     popup = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.ID, "swal2-title")))
                     popup_text = popup.text
 
@@ -864,7 +864,7 @@ class TestTransfer(BaseTest):
                     )
 
                     self.confirm_button()
-                    time.sleep(1)
+                    self.settle(max_wait=1)
 
                 except Exception as e:
                     self.logger.error(f"Failed to verify error message: {str(e)}")
@@ -880,7 +880,7 @@ class TestTransfer(BaseTest):
             FromgameID, credit_from = self.selectWalletByAmount(
                 0, mode='included_highest', username=self.username, password=self.password
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
             TogameID, credit_to = self.selectWalletByAmount(
                 1, mode='included_lowest', username=self.username, password=self.password
             )
@@ -899,7 +899,7 @@ class TestTransfer(BaseTest):
         credit_from, _ = self.selectWalletByAmount(
             0, mode='included_highest', username=self.username, password=self.password
         )
-        time.sleep(1)
+        self.settle(max_wait=1)
         _, _ = self.selectWalletByAmount(1, mode='included_lowest', username=self.username, password=self.password)
 
         max_amount = float(credit_from.replace(',', ''))
@@ -914,12 +914,12 @@ class TestTransfer(BaseTest):
             expected_result="failure", submit="submit-transfer-button", check_general_error=True,
             expected_error=LANGUAGE_SETTINGS[self.language]["errors"]["transfer_exceed_balance_limit"], id="swal2-title"
         )
-        time.sleep(5)
+        self.settle(max_wait=5)
 
     def test_04_ClearButton(self):
         initial_button_texts = [self.get_all_button_texts()[0], self.get_all_button_texts()[1]]
         _, _ = self.selectWalletByAmount(0, mode='included_highest', username=self.username, password=self.password)
-        time.sleep(1)
+        self.settle(max_wait=1)
         _, _ = self.selectWalletByAmount(1, mode='included_lowest', username=self.username, password=self.password)
 
         randomAmount = round(random.uniform(1, 9999), 2)
@@ -927,15 +927,15 @@ class TestTransfer(BaseTest):
         self.enter_amount(randomAmount)
 
         self.clear_details(clearButton="clear-text")
-        time.sleep(2)
+        self.settle(max_wait=2)
         self.verify_clear_functionality(initial_button_texts, [0, 1], transferChecking=True)
-        time.sleep(5)
+        self.settle(max_wait=5)
 
     #Test Invalid Amount Input (eg: amount with more than 2 dp, negative value, character, special characters, 0)
     def test_05_InvalidAmount(self):
         try:
             self.selectWalletByAmount(0, mode='included_highest', username=self.username, password=self.password)
-            time.sleep(1)
+            self.settle(max_wait=1)
             self.selectWalletByAmount(1, mode='included_lowest', username=self.username, password=self.password)
             self.check_invalid_amount(
                 amount_field_id="amount-input", submit_button_id="submit-transfer-button", transfer=True
@@ -946,7 +946,7 @@ class TestTransfer(BaseTest):
     #Transfer Same Wallet - display error message of "You cannot transfer between the same wallet."
     def test_06_TransferSameWallet(self):
         self.selectWalletByAmount(0, mode='included_highest', username=self.username, password=self.password)
-        time.sleep(1)
+        self.settle(max_wait=1)
         self.selectWalletByAmount(1, mode='included_highest', username=self.username, password=self.password)
         randomAmount = round(random.uniform(1, 9999), 2)
         self.enter_amount(randomAmount)
@@ -955,12 +955,12 @@ class TestTransfer(BaseTest):
             expected_result="failure", submit="submit-transfer-button", check_general_error=True,
             expected_error=LANGUAGE_SETTINGS[self.language]["errors"]["transfer_same_wallet"], id="swal2-title"
         )
-        time.sleep(5)
+        self.settle(max_wait=5)
 
     #Transfer with zero balance wallet
     def test_07_TransferFromZeroCredit(self):
         self.selectWalletByAmount(0, mode='included_lowest', username=self.username, password=self.password)
-        time.sleep(1)
+        self.settle(max_wait=1)
         self.selectWalletByAmount(1, mode='random', username=self.username, password=self.password)
         randomAmount = round(random.uniform(1, 9999), 2)
         self.enter_amount(randomAmount)
@@ -969,7 +969,7 @@ class TestTransfer(BaseTest):
             expected_result="failure", submit="submit-transfer-button", check_general_error=True,
             expected_error=LANGUAGE_SETTINGS[self.language]["errors"]["transfer_exceed_balance_limit"], id="swal2-title"
         )
-        time.sleep(5)
+        self.settle(max_wait=5)
 
     def test_08_SearchWithValidKeyword(self):
         try:
@@ -993,13 +993,13 @@ class TestTransfer(BaseTest):
             from_game_id, credit_from = self.selectWalletByAmount(
                 0, mode='included_highest', username=complete_turnover_username, password=complete_turnover_password
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             to_game_id, credit_to = self.selectWalletByAmount(
                 1, mode='specificID', username=complete_turnover_username, password=complete_turnover_password,
                 target_gameID=16
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             self.logger.info(f"From game ID: {from_game_id}")
             self.logger.info(f"To game ID: {to_game_id}")
@@ -1019,11 +1019,11 @@ class TestTransfer(BaseTest):
             game_id_from, credit_from = self.selectWalletByAmount(
                 0, mode='specificID', username=username, password=password, target_gameID=0
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
             game_id_to, credit_to = self.selectWalletByAmount(
                 1, mode='excluded_lowest', username=username, password=password
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             self.check_turnover_and_transfer(game_id_from, game_id_to, credit_from, credit_to)
 
@@ -1037,7 +1037,7 @@ class TestTransfer(BaseTest):
             game_id_from, credit_from = self.selectWalletByAmount(
                 0, mode='specificID', username=username, password=password, target_gameID=0
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
             game_id_to, credit_to = self.selectWalletByAmount(
                 1, mode='included_lowest', username=username, password=password
             )
@@ -1048,11 +1048,11 @@ class TestTransfer(BaseTest):
             game_id_from, credit_from = self.selectWalletByAmount(
                 0, mode='specificID', username=username, password=password, target_gameID=game_id_to
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
             game_id_to, credit_to = self.selectWalletByAmount(
                 1, mode='specificID', username=username, password=password, target_gameID=0
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             self.check_turnover_and_transfer(game_id_from, game_id_to, credit_from, credit_to)
 
@@ -1067,11 +1067,11 @@ class TestTransfer(BaseTest):
             game_id_from, credit_from = self.selectWalletByAmount(
                 0, mode='specificID', username=username, password=password, target_gameID=0
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
             game_id_to, credit_to = self.selectWalletByAmount(
                 1, mode='excluded_lowest', username=username, password=password
             )
-            time.sleep(5)
+            self.settle(max_wait=5)
 
             self.check_turnover_and_transfer(game_id_from, game_id_to, credit_from, credit_to)
 
@@ -1085,7 +1085,7 @@ class TestTransfer(BaseTest):
             game_id_from, credit_from = self.selectWalletByAmount(
                 0, mode='specificID', username=username, password=password, target_gameID=0
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
             game_id_to, credit_to = self.selectWalletByAmount(
                 1, mode='included_lowest', username=username, password=password
             )
@@ -1096,11 +1096,11 @@ class TestTransfer(BaseTest):
             from_game_id, credit_from = self.selectWalletByAmount(
                 0, mode='included_highest', username=username, password=password
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
             to_game_id, credit_to = self.selectWalletByAmount(
                 1, mode='included_lowest', username=username, password=password
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             self.transfer_and_verify(from_game_id, to_game_id, credit_from, credit_to)
 
@@ -1131,12 +1131,12 @@ class TestTransfer(BaseTest):
             game_id, credit_from = self.selectWalletByAmount(
                 0, mode='included_highest', username=self.username, password=self.password, nomain=True
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             game_id_to, credit_to = self.selectWalletByAmount(
                 1, mode='specificID', username=self.username, password=self.password, target_gameID=0
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             self.transfer_and_verify(game_id, game_id_to, credit_from, credit_to)
 
@@ -1175,12 +1175,12 @@ class TestTransfer(BaseTest):
             game_id, credit_from = self.selectWalletByAmount(
                 0, mode='included_highest', username=self.username, password=self.password, nomain=True
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             game_id_to, credit_to = self.selectWalletByAmount(
                 1, mode='excluded_lowest', username=self.username, password=self.password, provider_ids=provider_ids
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             self.transfer_and_verify(game_id, game_id_to, credit_from, credit_to)
 
@@ -1218,12 +1218,12 @@ class TestTransfer(BaseTest):
             game_id, credit_from = self.selectWalletByAmount(
                 0, mode='specificID', username=self.username, password=self.password, target_gameID=0
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             game_id_to, credit_to = self.selectWalletByAmount(
                 1, mode='excluded_lowest', username=self.username, password=self.password, provider_ids=provider_ids
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             self.transfer_and_verify(game_id, game_id_to, credit_from, credit_to)
 
@@ -1261,12 +1261,12 @@ class TestTransfer(BaseTest):
             game_id, credit_from = self.selectWalletByAmount(
                 0, mode='specificID', username=self.username, password=self.password, target_gameID=0
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             game_id_to, credit_to = self.selectWalletByAmount(
                 1, mode='excluded_lowest', username=self.username, password=self.password, provider_ids=provider_ids
             )
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             self.transfer_and_verify(game_id, game_id_to, credit_from, credit_to)
 
@@ -1288,7 +1288,7 @@ class TestTransfer(BaseTest):
 
             transfer_needed = self.check_and_transfer_to_empty_providers(provider_ids)
             if transfer_needed:
-                time.sleep(2)
+                self.settle(max_wait=2)
 
         turnoverIDs = self.get_turnover_ids(userID, self.language)
         if not turnoverIDs:
@@ -1306,12 +1306,12 @@ class TestTransfer(BaseTest):
         game_id_from, credit_from = self.selectWalletByAmount(
             0, mode='included_highest', username=self.username, password=self.password, nomain=True
         )
-        time.sleep(1)
+        self.settle(max_wait=1)
 
         game_id_to, credit_to = self.selectWalletByAmount(
             1, mode='excluded_lowest', username=self.username, password=self.password, provider_ids=provider_ids
         )
-        time.sleep(1)
+        self.settle(max_wait=1)
 
         self.check_turnover_and_transfer(game_id_from, game_id_to, credit_from, credit_to, turnoverList=turnoverList)
 
@@ -1329,7 +1329,7 @@ class TestTransfer(BaseTest):
 
             transfer_needed = self.check_and_transfer_to_empty_providers(provider_ids)
             if transfer_needed:
-                time.sleep(2)
+                self.settle(max_wait=2)
 
         turnoverIDs = self.get_turnover_ids(userID, self.language)
         if not turnoverIDs:
@@ -1347,12 +1347,12 @@ class TestTransfer(BaseTest):
         game_id, credit_from = self.selectWalletByAmount(
             0, mode='included_highest', username=self.username, password=self.password, nomain=True
         )
-        time.sleep(1)
+        self.settle(max_wait=1)
 
         game_id_to, credit_to = self.selectWalletByAmount(
             1, mode='specificID', username=self.username, password=self.password, target_gameID=0
         )
-        time.sleep(1)
+        self.settle(max_wait=1)
 
         self.transfer_and_verify(game_id, game_id_to, credit_from, credit_to)
 
@@ -1699,7 +1699,7 @@ class TestTransfer(BaseTest):
 
             self.transfer_and_verify(game_id_from, game_id_to, credit_from, credit_to)
             self.driver.refresh()
-            time.sleep(1)
+            self.settle(max_wait=1)
 
             game_id_from, credit_from = self.selectWalletByAmount(
                 0, mode='specificID', username=username, password=password, target_gameID=game_id_to
@@ -1,14 +1,22 @@
 from tests.authentication_test.base_test import BaseTest
 from tests.test_init import TestInit
-import requests
-from config.constant import CREDENTIALS
+from utils import http_client
+from config.constant import CREDENTIALS, TRANSFER_ENGINE
+from utils.report import ExcelReportWriter
+from utils.timing import instrument_helpers
 import random
-import pandas as pd
+import concurrent.futures
 from datetime import datetime
 import json
 import math
 
 
+TRANSFER_DETAIL_COLUMNS = [
+    "Game ID", "Game Name", "Initial Balance", "Transfer Amount", "Expected Balance", "Final Balance", "Status",
+    "Response Code", "Error Message"
+]
+
+
 class TransferBase(BaseTest):
 
     def __init__(self, methodName="runTest", language=None, browser=None):
@@ -17,7 +25,7 @@ class TransferBase(BaseTest):
         self.TRANSFER_AMOUNT = float(CREDENTIALS['transfer_amount']['amount'])
 
     def get_main_account_balance(self, headers):
-        response = requests.get(f"{CREDENTIALS['BO_base_url']}/api/balance", headers=headers)
+        response = http_client.get(f"{CREDENTIALS['BO_base_url']}/api/balance", headers=headers)
         response.raise_for_status()
         return response.json().get("data")["balance"]
 
@@ -27,16 +35,74 @@ class TransferBase(BaseTest):
             "target_id": target_id,
             "amount": amount
         }
-        response = requests.post(f"{CREDENTIALS['BO_base_url']}/api/transfers", json=payload, headers=headers)
+        response = http_client.post(f"{CREDENTIALS['BO_base_url']}/api/transfers", json=payload, headers=headers)
         return response
 
+    def transfer_in_batches(self, headers, games, amount, main_credit=None, concurrency=None):
+        """Transfer amount from the main wallet to every game, concurrency transfers at a time.
+
+        Credits are read back with one /api/transfers call per batch instead of one per provider. Yields
+        (game, response, final_credit) in the order of games.
+        """
+        concurrency = concurrency or TRANSFER_ENGINE["concurrency"]
+        main_after = main_credit
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for start in range(0, len(games), concurrency):
+                batch = games[start:start + concurrency]
+                print(f"\rProcessing providers {start + 1}-{start + len(batch)}/{len(games)}", end="")
+
+                main_before = main_after
+                responses = list(executor.map(
+                    lambda game: self.make_transfer(headers, source_id=0, target_id=game["id"], amount=amount), batch
+                ))
+
+                updated_game_data = self.get_game_ids(headers)
+                credits = {g["id"]: float(g.get("credit", 0)) for g in updated_game_data}
+                main_after = credits.get(0)
+
+                # The main wallet must drop by exactly the amount of the transfers that succeeded in this batch
+                transferred = amount * sum(1 for response in responses if response.status_code == 200)
+                if main_before is not None and main_after is not None and round(main_before - main_after, 2) != round(transferred, 2):
+                    self.logger.warning(
+                        f"Main wallet moved by {main_before - main_after:.2f} for a batch transferring {transferred:.2f}"
+                    )
+
+                for game, response in zip(batch, responses):
+                    yield game, response, credits.get(game["id"], 0)
+
     def print_game_data(self, label, game_data):
         print(f"{label}:\n")
         formatted_data = json.dumps(game_data, indent=4, ensure_ascii=False)
         print(formatted_data + "\n")
 
+    def write_transfer_report(self, excel_path, transfer_results, total_transferred):
+        """Stream the transfer summary and per-provider details to excel_path. Returns the success count."""
+        test_results = transfer_results['test_results']
+        success_count = len(transfer_results['successful_transfers'])
+        unique_errors = set(r["Error Message"] for r in test_results if r["Status"] == "Failed")
+
+        with ExcelReportWriter(
+            excel_path, {"Summary": ["Metric", "Value"], "Transfer Details": TRANSFER_DETAIL_COLUMNS}
+        ) as report:
+            summary = [
+                ("Total Providers Tested", len(test_results)),
+                ("Successful Transfers", success_count),
+                ("Failed Transfers", len(test_results) - success_count),
+                ("Success Rate (%)", round(success_count * 100 / len(test_results), 2) if test_results else 0),
+                ("Initial Main Balance", f"RM {transfer_results['initial_balance']}"),
+                ("Final Main Balance", f"RM {transfer_results['final_balance']}"),
+                ("Total Amount Transferred", f"RM {total_transferred}"),
+                ("Unique Error Messages", "\n".join(unique_errors)),
+            ]
+            for metric, value in summary:
+                report.add_row("Summary", [metric, value])
+            for result in test_results:
+                report.add_row("Transfer Details", [result.get(column) for column in TRANSFER_DETAIL_COLUMNS])
+
+        return success_count
+
     def get_id_api(self, headers):
-        response = requests.get(f"{CREDENTIALS['BO_base_url']}/api/user", headers=headers)
+        response = http_client.get(f"{CREDENTIALS['BO_base_url']}/api/user", headers=headers)
         return response.json().get("data")["id"]
 
     def transfer_to_all_providers(self, headers, initial_balance=None, provider_count=None, revert_mode=False, part=1):
@@ -91,23 +157,18 @@ class TransferBase(BaseTest):
         test_results = []
         total_expected_credit = 0
 
-        current = 0
-        for game in initial_game_data:
-            game_id = game.get("id")
-            if game_id < 1:
-                continue
-
-            current += 1
-            print(f"\rProcessing provider {current}/{provider_count}: {game.get('name')}", end="")
+        games = [game for game in initial_game_data if game.get("id") >= 1]
+        for game in games:
+            self.processed_providers.add(str(game.get("id")))
 
-            self.processed_providers.add(str(game_id))
+        main_wallet = next((g for g in all_games if g["id"] == 0), None)
+        main_credit = float(main_wallet.get("credit", 0)) if main_wallet else None
 
+        for game, response, final_credit in self.transfer_in_batches(
+            headers, games, self.TRANSFER_AMOUNT, main_credit=main_credit
+        ):
+            game_id = game.get("id")
             initial_credit = float(game.get("credit"))
-            response = self.make_transfer(headers, source_id=0, target_id=game_id, amount=self.TRANSFER_AMOUNT)
-
-            updated_game_data = self.get_game_ids(headers)
-            updated_game = next((g for g in updated_game_data if g["id"] == game_id), None)
-            final_credit = float(updated_game.get("credit", 0)) if updated_game else 0
 
             if response.status_code == 200:
                 total_expected_credit += self.TRANSFER_AMOUNT
@@ -147,7 +208,11 @@ class TransferBase(BaseTest):
     def setup_deposit_transfer(self, provider_count=None, revert_mode=False, part=1):
         print("1. Setting up test account...")
 
-        username, password = self.test_init.register_new_account()
+        account = self.test_init.lease_account("deposited")
+        if account:
+            username, password = account["username"], account["password"]
+        else:
+            username, password = self.test_init.create_new_account()
         token = self.login(username, password)
 
         if not token:
@@ -159,10 +224,11 @@ class TransferBase(BaseTest):
             "Content-Type": "application/json"
         }
 
-        print("2. Making initial deposit...")
-        userID = self.get_id_api(headers)
-        self.test_init.submit_deposit_api(username=username, password=password, amount=random.randint(5001, 10000))
-        self.test_init.handleDeposit(userID)
+        if not account:
+            print("2. Making initial deposit...")
+            userID = self.get_id_api(headers)
+            self.test_init.submit_deposit_api(username=username, password=password, amount=random.randint(5001, 10000))
+            self.test_init.handleDeposit(userID)
 
         initial_balance = self.get_main_account_balance(headers)
 
@@ -171,47 +237,21 @@ class TransferBase(BaseTest):
             headers, initial_balance, provider_count, revert_mode=revert_mode, part=part
         )
 
-        game_details = []
-        for game_id in transfer_results['successful_transfers']:
-            game_data = next((g for g in self.get_game_ids(headers) if g["id"] == game_id), None)
-            if game_data:
-                game_details.append({
-                    'id': game_id,
-                    'name': game_data.get('name'),
-                    'credit': game_data.get('credit')
-                })
+        # Final credits were already read once per batch by transfer_in_batches; no per-provider refetch
+        game_details = [
+            {
+                'id': result["Game ID"],
+                'name': result["Game Name"],
+                'credit': result["Final Balance"]
+            }
+            for result in transfer_results['test_results'] if result["Status"] == "Success"
+        ]
 
         print("\n6. Generating report...")
         total_transferred = len(transfer_results['successful_transfers']) * self.TRANSFER_AMOUNT
-        df = pd.DataFrame(transfer_results['test_results'])
-        df = df[[
-            "Game ID", "Game Name", "Initial Balance", "Transfer Amount", "Expected Balance", "Final Balance", "Status",
-            "Response Code", "Error Message"
-        ]]
-
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         excel_path = f"test_results/main_provider_transfer_test_{timestamp}.xlsx"
-
-        with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-            success_count = len(transfer_results['successful_transfers'])
-            unique_errors = set(r["Error Message"] for r in transfer_results['test_results'] if r["Status"] == "Failed")
-
-            summary_data = {
-                "Metric": [
-                    "Total Providers Tested", "Successful Transfers", "Failed Transfers", "Success Rate (%)",
-                    "Initial Main Balance", "Final Main Balance", "Total Amount Transferred", "Unique Error Messages"
-                ],
-                "Value": [
-                    len(transfer_results['test_results']), success_count,
-                    len(transfer_results['test_results']) - success_count,
-                    round(success_count * 100 /
-                          len(transfer_results['test_results']), 2) if transfer_results['test_results'] else 0,
-                    f"RM {transfer_results['initial_balance']}", f"RM {transfer_results['final_balance']}",
-                    f"RM {total_transferred}", "\n".join(unique_errors)
-                ]
-            }
-            pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
-            df.to_excel(writer, sheet_name='Transfer Details', index=False)
+        success_count = self.write_transfer_report(excel_path, transfer_results, total_transferred)
 
         print(f"\nTest completed! Results saved to: {excel_path}")
         success_rate = round(success_count * 100 /
@@ -227,3 +267,6 @@ class TransferBase(BaseTest):
             'transfer_results': transfer_results,
             'total_expected_credit': transfer_results['total_expected_credit']
         }
+
+
+instrument_helpers(TransferBase)
@@ -0,0 +1,72 @@
+import unittest
+from utils.latency import LatencyHistogram, normalize_endpoint
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Bucketing and percentiles of LatencyHistogram; needs neither a browser nor the back office."""
+
+    def test_bucket_round_trip(self):
+        for micros in (1, 63, 64, 100, 999, 1_000, 12_345, 250_000, 1_000_000, 30_000_000):
+            value = LatencyHistogram.bucket_value(LatencyHistogram.bucket(micros))
+            self.assertLessEqual(abs(value - micros) / micros, 0.015, f"{micros}us comes back as {value}us")
+
+    def test_buckets_are_ordered(self):
+        indexes = [LatencyHistogram.bucket(micros) for micros in range(0, 100_000, 7)]
+        self.assertEqual(indexes, sorted(indexes))
+
+    def test_merge_adds_counts(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        for seconds in (0.010, 0.010, 0.200):
+            first.record(seconds)
+        for seconds in (0.010, 1.500):
+            second.record(seconds)
+
+        merged = first.merge(second)
+        self.assertEqual(merged.count, 5)
+        self.assertEqual(merged.counts[LatencyHistogram.bucket(10_000)], 3)
+        self.assertEqual(sum(merged.counts.values()), 5)
+        self.assertAlmostEqual(merged.total, 1.730)
+        self.assertEqual(merged.max_value, 1.500)
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.record(ms / 1000)
+
+        self.assertAlmostEqual(histogram.percentile(50), 50, delta=50 * 0.015)
+        self.assertAlmostEqual(histogram.percentile(99), 99, delta=99 * 0.015)
+        # The top bucket is clamped to the largest recorded value
+        self.assertLessEqual(histogram.percentile(100), 100)
+        self.assertIsNone(LatencyHistogram().percentile(50))
+
+    def test_json_round_trip(self):
+        histogram = LatencyHistogram()
+        for seconds in (0.003, 0.040, 0.040, 2.0):
+            histogram.record(seconds)
+        restored = LatencyHistogram.from_json(histogram.to_json())
+        self.assertEqual(restored.counts, histogram.counts)
+        self.assertEqual(restored.stats((50, 99)), histogram.stats((50, 99)))
+
+
+class TestNormalizeEndpoint(unittest.TestCase):
+
+    def test_query_is_dropped(self):
+        base = "https://staging.example.com/whitelabel-staging-2/public"
+        self.assertEqual(
+            normalize_endpoint("get", f"{base}/api/recharge/approve?user_ids[]=1"),
+            normalize_endpoint("GET", f"{base}/api/recharge/approve?user_ids[]=2"),
+        )
+        self.assertEqual(normalize_endpoint("get", f"{base}/api/recharge/approve?user_ids[]=1"),
+                         "GET /api/recharge/approve")
+
+    def test_id_segments(self):
+        self.assertEqual(normalize_endpoint("POST", "http://localhost/api/user/123/rebate"), "POST /api/user/{id}/rebate")
+        self.assertEqual(
+            normalize_endpoint("GET", "http://localhost/api/order/123e4567-e89b-12d3-a456-426614174000/"),
+            "GET /api/order/{id}"
+        )
+        self.assertEqual(normalize_endpoint("GET", "http://localhost/api/v3/register"), "GET /api/v3/register")
+
+
+if __name__ == "__main__":
+    unittest.main()
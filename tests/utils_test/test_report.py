@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+from openpyxl import load_workbook
+from utils.report import ExcelReportWriter, recover_reports, JOURNAL_SUFFIX
+
+
+class TestReportRecovery(unittest.TestCase):
+    """Journal recovery of ExcelReportWriter; needs neither a browser nor the back office."""
+
+    SHEETS = {"Results": ["Test", "Status", "Message"], "Errors": ["Endpoint", "Count"]}
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+        self.filepath = os.path.join(self.directory, "report.xlsx")
+
+    def test_recover_abandoned_journal(self):
+        writer = ExcelReportWriter(self.filepath, self.SHEETS)
+        # The run dies without close(); only the open file handle is tidied up after the test
+        self.addCleanup(writer._journal.close)
+        rows = [[f"test_{index:02d}", "PASS" if index % 3 else "FAIL", "line 1\nline 2" if index == 4 else None]
+                for index in range(10)]
+        for row in rows:
+            writer.add_row("Results", row, style="pass" if row[1] == "PASS" else "fail")
+        writer.add_row("Errors", ["GET /api/user", 3])
+
+        with open(writer.journal_path, "a", encoding="utf-8") as journal:
+            journal.write('{"sheet": "Results", "values": ["test_10", "PA')
+
+        with self.assertLogs("utils.report", "WARNING"):
+            self.assertEqual(recover_reports(self.directory), [os.path.abspath(self.filepath)])
+        self.assertFalse(os.path.exists(writer.journal_path))
+        self.assertEqual([name for name in os.listdir(self.directory) if name.endswith(JOURNAL_SUFFIX)], [])
+
+        wb = load_workbook(self.filepath)
+        self.assertEqual(wb.sheetnames, list(self.SHEETS))
+        results = [list(row) for row in wb["Results"].iter_rows(values_only=True)]
+        self.assertEqual(results[0], self.SHEETS["Results"])
+        # Empty cells read back as None, which is what add_row was given
+        self.assertEqual(results[1:], rows)
+        self.assertEqual([list(row) for row in wb["Errors"].iter_rows(values_only=True)][1:], [["GET /api/user", 3]])
+
+    def test_closed_writer_leaves_no_journal(self):
+        with ExcelReportWriter(self.filepath, self.SHEETS) as writer:
+            writer.add_row("Results", ["test_01", "PASS", ""], style="pass")
+
+        self.assertFalse(os.path.exists(writer.journal_path))
+        self.assertEqual(recover_reports(self.directory), [])
+        self.assertEqual(load_workbook(self.filepath)["Results"].max_row, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
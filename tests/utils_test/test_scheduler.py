@@ -0,0 +1,76 @@
+import unittest
+from utils.scheduler import balance_shards, build_units
+from utils import scheduler
+
+
+class OrderedSteps(unittest.TestCase):
+    ORDERED_TESTS = True
+
+    def step_1(self):
+        pass
+
+    def step_2(self):
+        pass
+
+    def step_3(self):
+        pass
+
+
+class IndependentSteps(unittest.TestCase):
+
+    def step_1(self):
+        pass
+
+    def step_2(self):
+        pass
+
+
+class TestScheduler(unittest.TestCase):
+    """Unit grouping and shard balancing of the parallel scheduler; needs neither a browser nor the back office."""
+
+    def make_suite(self):
+        return unittest.TestSuite([
+            IndependentSteps("step_1"),
+            OrderedSteps("step_1"),
+            unittest.TestSuite([OrderedSteps("step_2"), IndependentSteps("step_2")]),
+            OrderedSteps("step_3"),
+        ])
+
+    def test_ordered_classes_stay_in_one_unit(self):
+        units = build_units(self.make_suite())
+        self.assertEqual(units, [
+            [scheduler.test_key(IndependentSteps("step_1"))],
+            [scheduler.test_key(OrderedSteps(name)) for name in ("step_1", "step_2", "step_3")],
+            [scheduler.test_key(IndependentSteps("step_2"))],
+        ])
+
+    def test_longest_units_are_balanced(self):
+        durations = {"a": 50, "b": 40, "c": 30, "d": 20, "e": 10, "f": 10}
+        units = [[key] for key in durations]
+        shards = balance_shards(units, 2, durations)
+
+        loads = sorted(sum(durations[key] for unit in shard for key in unit) for shard in shards)
+        self.assertEqual(loads, [80, 80])
+        self.assertCountEqual([unit for shard in shards for unit in shard], units)
+
+    def test_unknown_durations_use_the_default(self):
+        units = [["a", "b"], ["c"], ["d"]]
+        shards = balance_shards(units, 2, {"c": 100}, default_duration=30)
+        self.assertEqual(sorted(shards, key=len), [[["c"]], [["a", "b"], ["d"]]])
+
+    def test_shards_keep_suite_order(self):
+        durations = {"a": 1, "b": 1, "c": 1, "d": 1, "e": 100}
+        units = [[key] for key in durations]
+        for shard in balance_shards(units, 2, durations):
+            keys = [unit[0] for unit in shard]
+            self.assertEqual(keys, sorted(keys))
+
+    def test_more_workers_than_units(self):
+        units = [["a"], ["b", "c"]]
+        shards = balance_shards(units, 8, {"a": 5, "b": 5, "c": 5})
+        self.assertEqual(len(shards), 2)
+        self.assertTrue(all(shards))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 import time
 import logging
-import requests
+from utils import http_client
 import random
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -28,7 +28,7 @@ class TestWithdrawTransfer(BaseTest):
 
     def tearDown(self):
         if hasattr(self, "driver"):
-            self.driver.quit()
+            self.release_browser()
 
     def navigate_to_bank_transfer(self):
         self.navigate_to_reload_page("withdraw")
@@ -45,7 +45,7 @@ class TestWithdrawTransfer(BaseTest):
         else:
             url = CREDENTIALS["ApproveWithdrawRequest"].format(BO_base_url = CREDENTIALS["BO_base_url"], ID=ID)
 
-        response = requests.get(url)
+        response = http_client.get(url)
 
         if isReject:
             if response.status_code == 200:
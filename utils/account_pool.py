@@ -0,0 +1,137 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from config.constant import ACCOUNT_POOL
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ACCOUNT_STATES = ("fresh", "deposited", "promo", "vip")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    state TEXT NOT NULL,
+    base_url TEXT NOT NULL,
+    username TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL,
+    user_id INTEGER,
+    data TEXT NOT NULL DEFAULT '{}',
+    created_at REAL NOT NULL,
+    leased_by TEXT,
+    leased_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_accounts_available ON accounts (state, base_url, leased_at);
+"""
+
+
+class AccountPool:
+    """SQLite store of pre-provisioned accounts, each handed out to exactly one worker.
+
+    Accounts are never returned to the pool: tests deposit, transfer and withdraw on them, so a leased
+    account is no longer in the state it was provisioned in. Leased rows are kept for lease_history_days
+    for troubleshooting and then purged.
+    """
+
+    def __init__(self, path, max_age_days=7, lease_history_days=3):
+        self.path = path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+        self.max_age = max_age_days * 86400
+        self.lease_history = lease_history_days * 86400
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # isolation_level=None so BEGIN IMMEDIATE below controls the transaction explicitly
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def add(self, state, base_url, username, password, user_id=None, data=None):
+        if state not in ACCOUNT_STATES:
+            raise ValueError(f"Unknown account state: {state}")
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO accounts (state, base_url, username, password, user_id, data, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (state, base_url, username, password, user_id, json.dumps(data or {}), time.time())
+            )
+
+    def lease(self, state, base_url, worker=None):
+        """Atomically claim the oldest unleased account in state, or return None if the pool is empty."""
+        worker = worker or f"{os.getpid()}:{threading.get_ident()}"
+        with closing(self._connect()) as conn:
+            # BEGIN IMMEDIATE takes the write lock up front, so two workers can never select the same row
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT * FROM accounts WHERE state = ? AND base_url = ? AND leased_at IS NULL "
+                    "AND created_at > ? ORDER BY created_at LIMIT 1",
+                    (state, base_url, time.time() - self.max_age)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE accounts SET leased_by = ?, leased_at = ? WHERE id = ?",
+                        (worker, time.time(), row["id"])
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+
+        account = {
+            "username": row["username"],
+            "password": row["password"],
+            "user_id": row["user_id"],
+            "state": row["state"],
+            "data": json.loads(row["data"]),
+        }
+        logger.info(f"Leased {state} account {account['username']} to {worker}")
+        return account
+
+    def available(self, base_url):
+        """Return {state: count} of accounts that can still be leased."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT state, COUNT(*) AS n FROM accounts WHERE base_url = ? AND leased_at IS NULL "
+                "AND created_at > ? GROUP BY state",
+                (base_url, time.time() - self.max_age)
+            ).fetchall()
+        counts = {state: 0 for state in ACCOUNT_STATES}
+        counts.update({row["state"]: row["n"] for row in rows})
+        return counts
+
+    def purge(self):
+        """Drop expired accounts and old lease history."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "DELETE FROM accounts WHERE (leased_at IS NULL AND created_at <= ?) OR leased_at <= ?",
+                (now - self.max_age, now - self.lease_history)
+            )
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_account_pool():
+    """Return the pool for the current process; all processes share the same SQLite file."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = AccountPool(
+                ACCOUNT_POOL["path"], max_age_days=ACCOUNT_POOL["max_age_days"],
+                lease_history_days=ACCOUNT_POOL["lease_history_days"]
+            )
+            _pool_pid = os.getpid()
+        return _pool
@@ -0,0 +1,103 @@
+import logging
+from config.constant import CREDENTIALS, APPROVAL_BATCH
+from utils import http_client
+
+logger = logging.getLogger(__name__)
+
+# (kind, action) -> CREDENTIALS key of the back-office URL; every one of them takes user_ids[]
+APPROVAL_URLS = {
+    ("deposit", "approve"): "ApproveDepositRequest",
+    ("deposit", "reject"): "RejectDepositRequest",
+    ("deposit", "process"): "ProcessingDepositRequest",
+    ("withdraw", "approve"): "ApproveWithdrawRequest",
+    ("withdraw", "reject"): "RejectWithdrawRequest",
+    ("withdraw", "process"): "ProcessingWithdrawRequest",
+}
+
+
+def action_for(isReject=False, isProcessing=False):
+    if isReject:
+        return "reject"
+    if isProcessing:
+        return "process"
+    return "approve"
+
+
+def batch_url(kind, action, ids):
+    # The templates end in user_ids[]={ID}, so the remaining IDs are chained on as extra user_ids[] parameters
+    joined = "&user_ids[]=".join(str(user_id) for user_id in ids)
+    return CREDENTIALS[APPROVAL_URLS[(kind, action)]].format(BO_base_url=CREDENTIALS["BO_base_url"], ID=joined)
+
+
+def map_results(ids, response):
+    """Map a batch response back to {user_id: succeeded}.
+
+    A non-200 response fails the whole batch. Otherwise every ID succeeds unless the body lists it under
+    data.failed / data.failed_ids.
+    """
+    succeeded = response is not None and response.status_code == 200
+    results = {user_id: succeeded for user_id in ids}
+    if not succeeded:
+        return results
+
+    try:
+        data = response.json().get("data")
+    except (ValueError, AttributeError):
+        return results
+    if isinstance(data, dict):
+        failed = data.get("failed_ids") or data.get("failed") or []
+        failed = {str(item.get("user_id", item.get("id")) if isinstance(item, dict) else item) for item in failed}
+        for user_id in ids:
+            if str(user_id) in failed:
+                results[user_id] = False
+    return results
+
+
+class ApprovalBatch:
+    """Collects deposit/withdraw approvals for many users and sends one request per (kind, action).
+
+    Use as a context manager to flush on exit, or call flush() and inspect the per-ID results.
+    """
+
+    def __init__(self, max_batch_size=None):
+        self.max_batch_size = max_batch_size or APPROVAL_BATCH["max_batch_size"]
+        self.pending = {}
+        self.results = {}
+
+    def add(self, kind, user_id, action="approve"):
+        if (kind, action) not in APPROVAL_URLS:
+            raise ValueError(f"Unsupported approval: {kind} {action}")
+        ids = self.pending.setdefault((kind, action), [])
+        if user_id not in ids:
+            ids.append(user_id)
+
+    def flush(self):
+        """Send every pending batch. Returns {(kind, action): {user_id: succeeded}} for this flush."""
+        flushed = {}
+        pending, self.pending = self.pending, {}
+        for (kind, action), ids in pending.items():
+            results = flushed.setdefault((kind, action), {})
+            for start in range(0, len(ids), self.max_batch_size):
+                chunk = ids[start:start + self.max_batch_size]
+                try:
+                    response = http_client.request_with_retry("GET", batch_url(kind, action, chunk))
+                except Exception as e:
+                    logger.error(f"Batch {action} {kind} failed for {chunk}: {str(e)}")
+                    response = None
+                results.update(map_results(chunk, response))
+                logger.info(f"Batch {action} {kind} for {len(chunk)} users: {results}")
+
+        for key, results in flushed.items():
+            self.results.setdefault(key, {}).update(results)
+        return flushed
+
+    def failed(self):
+        return {key: [user_id for user_id, ok in results.items() if not ok] for key, results in self.results.items()
+                if not all(results.values())}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
@@ -0,0 +1,139 @@
+import atexit
+import logging
+import os
+import threading
+from selenium.common.exceptions import WebDriverException
+from config.constant import BROWSER_POOL
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPool:
+    """Per-process pool of warm WebDriver sessions keyed by browser and option set."""
+
+    def __init__(self, max_idle=1, max_leases=50, window_size=(375, 812)):
+        self.max_idle = max_idle
+        self.max_leases = max_leases
+        self.window_size = window_size
+        self._idle = {}
+        self._leased = {}
+        self._lease_counts = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key, factory):
+        """Return a healthy driver for key, reusing an idle one when possible."""
+        while True:
+            with self._lock:
+                idle = self._idle.get(key, [])
+                driver = idle.pop() if idle else None
+
+            if driver is None:
+                logger.info(f"Starting new browser for {key}")
+                driver = factory()
+                break
+
+            if self._is_alive(driver):
+                logger.info(f"Reusing warm browser for {key}")
+                break
+
+            logger.warning(f"Discarding crashed browser for {key}")
+            self.discard(driver)
+
+        with self._lock:
+            self._leased[id(driver)] = key
+            self._lease_counts[id(driver)] = self._lease_counts.get(id(driver), 0) + 1
+        return driver
+
+    def release(self, driver):
+        """Reset the driver and return it to the pool, or quit it if it cannot be reused."""
+        with self._lock:
+            key = self._leased.pop(id(driver), None)
+            lease_count = self._lease_counts.get(id(driver), 0)
+
+        if key is None:
+            self._quit(driver)
+            return
+
+        if lease_count >= self.max_leases:
+            logger.info(f"Recycling browser for {key} after {lease_count} leases")
+            self.discard(driver)
+            return
+
+        try:
+            self._reset(driver)
+        except WebDriverException as e:
+            logger.warning(f"Browser reset failed for {key}, discarding: {str(e)}")
+            self.discard(driver)
+            return
+
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(driver)
+                return
+
+        self.discard(driver)
+
+    def discard(self, driver):
+        with self._lock:
+            self._leased.pop(id(driver), None)
+            self._lease_counts.pop(id(driver), None)
+        self._quit(driver)
+
+    def close_all(self):
+        with self._lock:
+            drivers = [driver for idle in self._idle.values() for driver in idle]
+            self._idle.clear()
+            self._lease_counts.clear()
+        for driver in drivers:
+            self._quit(driver)
+
+    def _reset(self, driver):
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        # localStorage and cookies are scoped to the current origin, so clear them before leaving the page
+        if driver.current_url.startswith("http"):
+            driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            )
+            driver.delete_all_cookies()
+
+        driver.get("about:blank")
+        driver.set_window_size(*self.window_size)
+
+    def _is_alive(self, driver):
+        try:
+            driver.window_handles
+            return True
+        except WebDriverException:
+            return False
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting browser: {str(e)}")
+
+
+_pool = None
+_pool_pid = None
+
+
+def get_browser_pool():
+    """Return the pool for the current process, creating one after fork if needed."""
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        _pool = BrowserPool(max_idle=BROWSER_POOL["max_idle"], max_leases=BROWSER_POOL["max_leases"])
+        _pool_pid = os.getpid()
+        atexit.register(_pool.close_all)
+    return _pool
+
+
+def close_browser_pool():
+    """Quit this process's idle browsers. Worker processes exit without running atexit, so they call this."""
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.close_all()
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import closing
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlparse
+import requests
+from requests.structures import CaseInsensitiveDict
+from config.constant import CASSETTE, CREDENTIALS
+from utils.timing import RUN_ID
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS interactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    match_key TEXT NOT NULL,
+    method TEXT NOT NULL,
+    path TEXT NOT NULL,
+    request TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    content_type TEXT,
+    body BLOB NOT NULL,
+    elapsed REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_interactions_key ON interactions (match_key, run_id, id);
+"""
+
+
+class CassetteMiss(Exception):
+    """Replay found no recording for a request. Deliberately not a RequestException, so retry loops fail fast."""
+
+
+class Cassette:
+    """Records back-office request/response pairs into a SQLite file and replays them.
+
+    Requests match on method, path, query (sorted, without ignore_params), body, the match_headers and the
+    user behind the bearer token, which is learned from login responses so tokens may differ between runs.
+    A request made several times replays its recordings in order (the last one repeats), so a balance read
+    before and after a transfer gets both answers. Only the latest recording run of each request is used.
+    """
+
+    def __init__(self, path, mode, replay_timing=0, allow_passthrough=False, ignore_params=(), match_headers=()):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+        self.mode = mode
+        self.replay_timing = replay_timing
+        self.allow_passthrough = allow_passthrough
+        self.ignore_params = set(ignore_params)
+        self.match_headers = [name.lower() for name in match_headers]
+        self._identities = {}
+        self._played = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def request(self, session, method, url, **kwargs):
+        key, description = self.match_key(method, url, kwargs)
+        if self.mode == "replay":
+            response = self.play(key, method, url)
+            if response is None:
+                if not self.allow_passthrough:
+                    raise CassetteMiss(f"No recording for {description}")
+                logger.info(f"Cassette miss, passing through: {description}")
+                response = session.request(method, url, **kwargs)
+        else:
+            started = time.perf_counter()
+            response = session.request(method, url, **kwargs)
+            self.record(key, method, url, description, response, time.perf_counter() - started)
+        self._learn_identity(kwargs, response)
+        return response
+
+    def match_key(self, method, url, kwargs):
+        parsed = urlparse(url)
+        query = sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if k not in self.ignore_params)
+        query.extend(sorted((str(k), str(v)) for k, v in (kwargs.get("params") or {}).items()))
+        headers = {str(name).lower(): value for name, value in (kwargs.get("headers") or {}).items()}
+        parts = {
+            "method": method.upper(),
+            "path": parsed.path,
+            "query": query,
+            "body": self._body(kwargs),
+            "headers": {name: headers.get(name) for name in self.match_headers if headers.get(name) is not None},
+            "user": self._identity(headers.get("authorization")),
+        }
+        description = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha1(description.encode("utf-8")).hexdigest(), description
+
+    @staticmethod
+    def _body(kwargs):
+        if kwargs.get("json") is not None:
+            return kwargs["json"]
+        data = kwargs.get("data")
+        if isinstance(data, dict):
+            data = {str(k): "" if v is None else str(v) for k, v in data.items()}
+        elif isinstance(data, bytes):
+            data = hashlib.sha1(data).hexdigest()
+        # Uploaded files match on field and file name; the multipart boundary changes on every request
+        files = kwargs.get("files") or {}
+        files = files.items() if isinstance(files, dict) else files
+        uploads = sorted(
+            f"{field}={upload[0] if isinstance(upload, (tuple, list)) else getattr(upload, 'name', '')}"
+            for field, upload in files
+        )
+        return {"data": data, "files": uploads} if uploads else data
+
+    def _identity(self, authorization):
+        if not authorization:
+            return None
+        token = authorization.removeprefix("Bearer ").strip()
+        return self._identities.get(token) or f"token:{hashlib.sha1(token.encode('utf-8')).hexdigest()[:12]}"
+
+    def _learn_identity(self, kwargs, response):
+        """Remember whose token a login response carried, so later requests match by user rather than token."""
+        body = kwargs.get("json") or kwargs.get("data")
+        if not isinstance(body, dict) or "username" not in body or "password" not in body:
+            return
+        try:
+            token = response.json()["data"]["token"]
+        except (ValueError, KeyError, TypeError):
+            return
+        with self._lock:
+            self._identities[token] = f"user:{body['username']}"
+
+    def record(self, key, method, url, description, response, elapsed):
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO interactions (run_id, match_key, method, path, request, status, content_type, body, "
+                "elapsed, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    RUN_ID, key, method.upper(), urlparse(url).path, description, response.status_code,
+                    response.headers.get("Content-Type"), zlib.compress(response.content), elapsed, time.time()
+                )
+            )
+
+    def play(self, key, method, url):
+        with self._lock:
+            index = self._played.get(key, 0)
+            self._played[key] = index + 1
+        with closing(self._connect()) as conn:
+            latest = conn.execute(
+                "SELECT run_id FROM interactions WHERE match_key = ? ORDER BY id DESC LIMIT 1", (key,)
+            ).fetchone()
+            if latest is None:
+                return None
+            rows = conn.execute(
+                "SELECT status, content_type, body, elapsed FROM interactions WHERE match_key = ? AND run_id = ? "
+                "ORDER BY id", (key, latest["run_id"])
+            ).fetchall()
+        row = rows[min(index, len(rows) - 1)]
+        if self.replay_timing:
+            time.sleep(row["elapsed"] * self.replay_timing)
+
+        response = requests.Response()
+        response.status_code = row["status"]
+        response._content = zlib.decompress(row["body"])
+        response.headers = CaseInsensitiveDict({"Content-Type": row["content_type"] or "application/json"})
+        response.encoding = "utf-8"
+        response.url = url
+        response.reason = "Replayed"
+        response.elapsed = timedelta(seconds=row["elapsed"])
+        response.request = requests.Request(method, url).prepare()
+        return response
+
+    def applies_to(self, url):
+        return url.startswith(CREDENTIALS["BO_base_url"])
+
+    def summary(self):
+        """Recorded requests per (method, path) in this cassette."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT method, path, COUNT(*) AS n FROM interactions GROUP BY method, path ORDER BY n DESC"
+            ).fetchall()
+        return {f"{row['method']} {row['path']}": row["n"] for row in rows}
+
+
+_cassette = None
+_cassette_pid = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette():
+    """Return the cassette for the current process, or None when recording and replay are off."""
+    global _cassette, _cassette_pid
+    if CASSETTE["mode"] == "off":
+        return None
+    with _cassette_lock:
+        if _cassette is None or _cassette_pid != os.getpid():
+            _cassette = Cassette(
+                CASSETTE["path"], CASSETTE["mode"], replay_timing=CASSETTE["replay_timing"],
+                allow_passthrough=CASSETTE["allow_passthrough"], ignore_params=CASSETTE["ignore_params"],
+                match_headers=CASSETTE["match_headers"]
+            )
+            _cassette_pid = os.getpid()
+        return _cassette
@@ -0,0 +1,139 @@
+import logging
+import mimetypes
+import os
+import struct
+import threading
+import zlib
+from urllib.parse import urlparse
+from config.constant import FIXTURES
+from utils import http_client
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def generate_png(width=120, height=200):
+    """Render a plain grey-gradient PNG, used when none of a fixture's URLs can be downloaded."""
+    rows = b"".join(b"\x00" + bytes([200 - y * 100 // height] * 3 * width) for y in range(height))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b"")
+
+
+class ImageFixture:
+    """An image held in memory once per process. Multipart uploads send the shared bytes directly;
+    path() writes a copy to disk only for Selenium file inputs, which need a real file."""
+
+    def __init__(self, name, content, filename, content_type, directory):
+        self.name = name
+        self.content = content
+        self.filename = filename
+        self.content_type = content_type
+        self.directory = directory
+        self._path = None
+        self._lock = threading.Lock()
+
+    def upload(self, filename=None):
+        """Return a requests files tuple. Unlike an open file, bytes can be re-sent when the request is retried."""
+        return (filename or self.filename, self.content, self.content_type)
+
+    def path(self):
+        with self._lock:
+            if self._path is None or not os.path.exists(self._path):
+                os.makedirs(self.directory, exist_ok=True)
+                path = os.path.join(self.directory, f"{self.name}{os.path.splitext(self.filename)[1]}")
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(self.content)
+                # World-readable, since the browser may run as another user
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+                self._path = path
+            return self._path
+
+
+class FixtureStore:
+    """Loads each configured image once per process: from the on-disk copy if an earlier worker or run already
+    downloaded it, else from its URLs in order, else the generated fallback (which is never saved)."""
+
+    def __init__(self, images, directory):
+        self.images = images
+        self.directory = directory if os.path.isabs(directory) else os.path.join(PROJECT_ROOT, directory)
+        self._fixtures = {}
+        self._lock = threading.Lock()
+        self._name_locks = {}
+
+    def get(self, name):
+        fixture = self._fixtures.get(name)
+        if fixture is not None:
+            return fixture
+        with self._name_lock(name):
+            fixture = self._fixtures.get(name)
+            if fixture is None:
+                fixture = self._load(name)
+                self._fixtures[name] = fixture
+            return fixture
+
+    def _load(self, name):
+        settings = self.images[name]
+        urls = settings.get("urls", [])
+        filename = settings.get("filename") or (os.path.basename(urlparse(urls[0]).path) if urls else f"{name}.jpg")
+        content_type = settings.get("content_type") or mimetypes.guess_type(filename)[0] or "image/jpeg"
+        disk_path = os.path.join(self.directory, f"{name}{os.path.splitext(filename)[1]}")
+
+        if os.path.exists(disk_path):
+            with open(disk_path, "rb") as f:
+                content = f.read()
+            logger.info(f"Loaded {name} fixture from {disk_path} ({len(content)} bytes)")
+            return self._fixture(name, content, filename, content_type, disk_path)
+
+        for url in urls:
+            try:
+                response = http_client.get(url, timeout=30)
+                response.raise_for_status()
+                if not response.headers.get("content-type", "").startswith("image/"):
+                    raise ValueError(f"Response is not an image. Content-Type: {response.headers.get('content-type')}")
+                logger.info(f"Downloaded {name} fixture from {url} ({len(response.content)} bytes)")
+                fixture = self._fixture(name, response.content, filename, content_type, None)
+                # Keep a copy for the other workers and later runs
+                fixture.path()
+                return fixture
+            except Exception as e:
+                logger.warning(f"Could not download {name} fixture from {url}: {str(e)}")
+
+        if not settings.get("fallback", True):
+            raise RuntimeError(f"No image could be loaded for the {name} fixture")
+        logger.info(f"Using a generated image for {name}")
+        return self._fixture(name, generate_png(), f"{os.path.splitext(filename)[0]}.png", "image/png", None)
+
+    def _fixture(self, name, content, filename, content_type, path):
+        fixture = ImageFixture(name, content, filename, content_type, self.directory)
+        fixture._path = path
+        return fixture
+
+    def _name_lock(self, name):
+        with self._lock:
+            return self._name_locks.setdefault(name, threading.Lock())
+
+
+_store = None
+_store_pid = None
+_store_lock = threading.Lock()
+
+
+def get_fixture_store():
+    """Return the store for the current process."""
+    global _store, _store_pid
+    with _store_lock:
+        if _store is None or _store_pid != os.getpid():
+            _store = FixtureStore(FIXTURES["images"], FIXTURES["directory"])
+            _store_pid = os.getpid()
+        return _store
+
+
+def get_image(name):
+    return get_fixture_store().get(name)
@@ -0,0 +1,187 @@
+import functools
+import logging
+import os
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from config.constant import HTTP_CLIENT
+from utils.cassette import get_cassette
+from utils.latency import track_call
+from utils.timing import measure
+from utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClient:
+    """Shared keep-alive session for back-office calls with pooled connections, timeouts and retries."""
+
+    def __init__(self, settings=HTTP_CLIENT):
+        self.settings = settings
+        self.session = self._make_session(Retry(
+            total=settings["max_retries"], backoff_factor=settings["backoff_factor"],
+            status_forcelist=settings["status_forcelist"], raise_on_status=False
+        ))
+        # For no_retry_paths: only a failed connect is retried, since then the request never reached the server
+        self.no_retry_session = self._make_session(Retry(
+            total=None, connect=settings["max_retries"], read=0, status=0, other=0,
+            backoff_factor=settings["backoff_factor"], raise_on_status=False
+        ))
+
+    def _make_session(self, retry_strategy):
+        session = requests.Session()
+        # Tokens travel in headers; never let one user's login cookies ride along on another user's calls
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(
+            pool_connections=self.settings["pool_connections"], pool_maxsize=self.settings["pool_maxsize"],
+            max_retries=retry_strategy
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def can_resend(self, url):
+        """False for endpoints that change data, which must not be sent twice (see no_retry_paths)."""
+        path = urlparse(url).path
+        return not any(endpoint in path for endpoint in self.settings["no_retry_paths"])
+
+    def timeout_for(self, url):
+        path = urlparse(url).path
+        for endpoint, timeout in self.settings["timeouts"].items():
+            if endpoint in path:
+                return timeout
+        return self.settings["default_timeout"]
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout_for(url))
+        response = self._send(method, url, **kwargs)
+
+        # A cached token can die early (logout, revocation, back-office restart); log in again and re-send once
+        token = rejected_token(kwargs.get("headers"), response)
+        if token and _unauthorized_handler is not None:
+            fresh = _unauthorized_handler(token)
+            if fresh and fresh != token:
+                headers = {
+                    name: f"Bearer {fresh}" if str(name).lower() == "authorization" else value
+                    for name, value in kwargs["headers"].items()
+                }
+                response = self._send(method, url, **dict(kwargs, headers=headers))
+        return response
+
+    def _send(self, method, url, **kwargs):
+        session = self.session if self.can_resend(url) else self.no_retry_session
+        with measure("network"), span(f"{method.upper()} {urlparse(url).path}", "http"):
+            cassette = get_cassette()
+            if cassette is not None and cassette.applies_to(url):
+                if cassette.mode == "replay":
+                    # Replayed responses say nothing about back-office latency, so they stay out of the histograms
+                    return cassette.request(session, method, url, **kwargs)
+                send = functools.partial(cassette.request, session, method, url, **kwargs)
+            else:
+                send = functools.partial(session.request, method, url, **kwargs)
+            with track_call(method, url) as call:
+                call.response = send()
+            return call.response
+
+    def request_with_retry(self, method, url, accept=None, attempts=None, **kwargs):
+        """Repeat the call until accept(response) is true, backing off exponentially between attempts.
+
+        Transport errors and retryable status codes are already retried by the adapter; this covers
+        application-level failures such as a 200 response carrying {"code": 500}. For no_retry_paths, only
+        answers the server gave after refusing the request (a body code, or a status in status_forcelist) and
+        failed connects are tried again; a timeout or 5xx may mean the change was already made. Returns the last
+        response, or re-raises the last error if no attempt got a response.
+        """
+        accept = accept or (lambda response: response.status_code == 200)
+        attempts = attempts or self.settings["max_retries"]
+        can_resend = self.can_resend(url)
+        path = urlparse(url).path
+        response = None
+        last_error = None
+
+        for attempt in range(attempts):
+            try:
+                response = self.request(method, url, **kwargs)
+                try:
+                    if accept(response):
+                        return response
+                except ValueError:
+                    pass
+                logger.warning(f"{method} {path} attempt {attempt + 1} rejected with status {response.status_code}")
+                if not can_resend and response.status_code not in [200] + self.settings["status_forcelist"]:
+                    return response
+            except requests.RequestException as e:
+                response = None
+                last_error = e
+                logger.warning(f"{method} {path} attempt {attempt + 1} failed: {str(e)}")
+                if not can_resend and not isinstance(e, requests.ConnectTimeout):
+                    raise
+
+            if attempt < attempts - 1:
+                time.sleep(self.settings["backoff_factor"] * (2**attempt))
+
+        if response is None and last_error is not None:
+            raise last_error
+        return response
+
+
+def rejected_token(headers, response):
+    """The bearer token of a call the back office answered with 401 (as HTTP status or body code), else None."""
+    authorization = next((value for name, value in (headers or {}).items() if str(name).lower() == "authorization"), None)
+    if not authorization or not str(authorization).startswith("Bearer "):
+        return None
+    if response.status_code != 401:
+        # Cheap check before parsing: most bodies never mention 401
+        if response.status_code != 200 or b"401" not in response.content:
+            return None
+        try:
+            body = response.json()
+        except ValueError:
+            return None
+        if not isinstance(body, dict) or body.get("code") != 401:
+            return None
+    return authorization[len("Bearer "):].strip()
+
+
+_unauthorized_handler = None
+
+
+def set_unauthorized_handler(handler):
+    """Install handler(token), which returns a fresh token for one the back office rejected, or None."""
+    global _unauthorized_handler
+    _unauthorized_handler = handler
+
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Return the client for the current process, creating a fresh one after fork."""
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = HttpClient()
+            _client_pid = os.getpid()
+        return _client
+
+
+def request(method, url, **kwargs):
+    return get_http_client().request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return get_http_client().request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return get_http_client().request("POST", url, **kwargs)
+
+
+def request_with_retry(method, url, **kwargs):
+    return get_http_client().request_with_retry(method, url, **kwargs)
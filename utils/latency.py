@@ -0,0 +1,282 @@
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from urllib.parse import urlparse
+from config.constant import API_LATENCY
+from utils.report import ExcelReportWriter
+from utils.timing import RUN_ID
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Buckets per power of two; 64 keeps every recorded value within about 1.5% of the true latency
+SUB_BUCKETS = 64
+SUB_BUCKET_BITS = 6
+
+ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{16,}|[0-9a-fA-F-]{36})$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS api_latency (
+    run_id TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    endpoint TEXT NOT NULL,
+    histogram TEXT NOT NULL,
+    errors INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_id, scope, pid, endpoint)
+);
+"""
+
+
+def normalize_endpoint(method, url):
+    """Group calls by route: "GET /api/recharge/approve?user_ids[]=123" -> "GET /api/recharge/approve".
+
+    The query and the deployment prefix before /api/ are dropped, and numeric or hex id segments become {id}.
+    """
+    path = urlparse(url).path
+    index = path.find("/api/")
+    if index > 0:
+        path = path[index:]
+    segments = ["{id}" if ID_SEGMENT.match(segment) else segment for segment in path.rstrip("/").split("/")]
+    return f"{method.upper()} {'/'.join(segments) or '/'}"
+
+
+class LatencyHistogram:
+    """HDR-style latency histogram: log-linear buckets counted in microseconds.
+
+    Memory depends on the range of latencies rather than the number of calls, and histograms from different
+    processes merge by adding counts.
+    """
+
+    def __init__(self, counts=None, count=0, total=0.0, max_value=0.0):
+        self.counts = counts or {}
+        self.count = count
+        self.total = total
+        self.max_value = max_value
+
+    @staticmethod
+    def bucket(micros):
+        if micros < SUB_BUCKETS:
+            return micros
+        shift = micros.bit_length() - 1 - SUB_BUCKET_BITS
+        return SUB_BUCKETS + shift * SUB_BUCKETS + (micros >> shift) - SUB_BUCKETS
+
+    @staticmethod
+    def bucket_value(index):
+        """Midpoint of the bucket, in microseconds."""
+        if index < SUB_BUCKETS:
+            return index
+        shift, sub = divmod(index - SUB_BUCKETS, SUB_BUCKETS)
+        low = (SUB_BUCKETS + sub) << shift
+        return low + ((1 << shift) - 1) / 2
+
+    def record(self, seconds):
+        micros = max(0, int(seconds * 1_000_000))
+        index = self.bucket(micros)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max_value = max(self.max_value, seconds)
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max_value = max(self.max_value, other.max_value)
+        return self
+
+    def percentile(self, p):
+        """Latency in milliseconds below which p percent of the calls fall."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return round(min(self.bucket_value(index) / 1000, self.max_value * 1000), 1)
+
+    def stats(self, percentiles):
+        stats = {"count": self.count, "mean": round(self.total / self.count * 1000, 1) if self.count else None}
+        for p in percentiles:
+            stats[f"p{p}"] = self.percentile(p)
+        stats["max"] = round(self.max_value * 1000, 1)
+        return stats
+
+    def to_json(self):
+        return json.dumps({"counts": self.counts, "count": self.count, "total": self.total, "max": self.max_value})
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        return cls({int(index): count for index, count in data["counts"].items()}, data["count"], data["total"],
+                   data["max"])
+
+
+class ApiLatency:
+    """Histograms of every back-office call made by this process, written to a SQLite file shared by the
+    processes of a run so the run's summary covers all of its workers."""
+
+    def __init__(self, path, run_id=RUN_ID, history_days=7):
+        self.path = path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+        self.run_id = run_id
+        self.histograms = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+            conn.execute("DELETE FROM api_latency WHERE updated_at < ?", (time.time() - history_days * 86400,))
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def record(self, endpoint, seconds, error=False):
+        with self._lock:
+            histogram = self.histograms.get(endpoint)
+            if histogram is None:
+                histogram = self.histograms[endpoint] = LatencyHistogram()
+            histogram.record(seconds)
+            if error:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def flush(self, scope):
+        """Store this process's histograms; later flushes from the same process replace earlier ones."""
+        with self._lock:
+            rows = [
+                (self.run_id, scope, os.getpid(), endpoint, histogram.to_json(), self.errors.get(endpoint, 0),
+                 time.time())
+                for endpoint, histogram in self.histograms.items()
+            ]
+        with closing(self._connect()) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO api_latency (run_id, scope, pid, endpoint, histogram, errors, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def load(self, scope):
+        """Merged {endpoint: histogram} and {endpoint: errors} of every process of this run in scope."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT endpoint, histogram, errors FROM api_latency WHERE run_id = ? AND scope = ?",
+                (self.run_id, scope)
+            ).fetchall()
+        histograms, errors = {}, {}
+        for row in rows:
+            histograms.setdefault(row["endpoint"], LatencyHistogram()).merge(LatencyHistogram.from_json(row["histogram"]))
+            errors[row["endpoint"]] = errors.get(row["endpoint"], 0) + row["errors"]
+        return histograms, errors
+
+
+def check_slos(histograms, slos=None, min_samples=None):
+    """Return the SLO breaches as {endpoint, metric, limit, value} dicts.
+
+    slos maps an endpoint to limits in milliseconds, e.g. {"POST /api/v2/login": {"p95": 1500, "max": 10000}}.
+    Endpoints with fewer than min_samples calls are not judged.
+    """
+    slos = API_LATENCY["slo"] if slos is None else slos
+    min_samples = API_LATENCY["min_samples"] if min_samples is None else min_samples
+    breaches = []
+    for endpoint, limits in slos.items():
+        histogram = histograms.get(endpoint)
+        if histogram is None or histogram.count < min_samples:
+            continue
+        for metric, limit in limits.items():
+            value = round(histogram.max_value * 1000, 1) if metric == "max" else histogram.percentile(float(metric[1:]))
+            if value > limit:
+                breaches.append({"endpoint": endpoint, "metric": metric, "limit": limit, "value": value})
+    return breaches
+
+
+def write_report(filepath, histograms, errors, breaches, percentiles):
+    columns = ["Endpoint", "Calls", "Errors", "Mean (ms)"] + [f"p{p} (ms)" for p in percentiles] + ["Max (ms)", "SLO"]
+    breached = {}
+    for breach in breaches:
+        breached.setdefault(breach["endpoint"], []).append(f"{breach['metric']} {breach['value']} > {breach['limit']}")
+
+    with ExcelReportWriter(filepath, {"API Latency": columns}) as report:
+        for endpoint, histogram in sorted(histograms.items(), key=lambda item: -item[1].count):
+            stats = histogram.stats(percentiles)
+            slo = "; ".join(breached.get(endpoint, [])) or ("OK" if endpoint in API_LATENCY["slo"] else "")
+            row = [endpoint, stats["count"], errors.get(endpoint, 0), stats["mean"]]
+            row += [stats[f"p{p}"] for p in percentiles] + [stats["max"], slo]
+            report.add_row("API Latency", row, style="fail" if endpoint in breached else None)
+
+
+_latency = None
+_latency_pid = None
+_latency_lock = threading.Lock()
+_scope = "default"
+
+
+def get_api_latency():
+    """Return the recorder for the current process; a forked worker starts with empty histograms."""
+    global _latency, _latency_pid
+    with _latency_lock:
+        if _latency is None or _latency_pid != os.getpid():
+            _latency = ApiLatency(API_LATENCY["path"], history_days=API_LATENCY["history_days"])
+            _latency_pid = os.getpid()
+        return _latency
+
+
+def set_scope(language, browser):
+    """Name the (language, browser) run this process and the workers it forks belong to."""
+    global _scope
+    _scope = f"{language}_{browser}"
+
+
+@contextmanager
+def track_call(method, url):
+    """Time one call into the endpoint's histogram. Exceptions and 5xx responses also count as errors."""
+    if not API_LATENCY["enabled"]:
+        yield _Call()
+        return
+    call = _Call()
+    started = time.perf_counter()
+    try:
+        yield call
+    except Exception:
+        call.error = True
+        raise
+    finally:
+        response = call.response
+        error = call.error or (response is not None and response.status_code >= 500)
+        get_api_latency().record(normalize_endpoint(method, url), time.perf_counter() - started, error)
+
+
+class _Call:
+    __slots__ = ("response", "error")
+
+    def __init__(self):
+        self.response = None
+        self.error = False
+
+
+def flush_api_latency():
+    if API_LATENCY["enabled"] and _latency is not None and _latency_pid == os.getpid():
+        _latency.flush(_scope)
+
+
+def report_api_latency(filepath, log=logger):
+    """Log and write the merged latencies of this (language, browser) run. Returns the SLO breaches;
+    any breach marks the run as degraded."""
+    percentiles = API_LATENCY["percentiles"]
+    histograms, errors = get_api_latency().load(_scope)
+    if not histograms:
+        return []
+    for endpoint, histogram in sorted(histograms.items(), key=lambda item: -item[1].count):
+        log.info(f"{endpoint}: {histogram.stats(percentiles)}, errors {errors.get(endpoint, 0)}")
+    breaches = check_slos(histograms)
+    write_report(filepath, histograms, errors, breaches, percentiles)
+    return breaches
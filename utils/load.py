@@ -0,0 +1,273 @@
+import asyncio
+import concurrent.futures
+import logging
+import math
+import random
+import threading
+import time
+from config.constant import LOAD_TEST
+from utils.report import ExcelReportWriter
+
+logger = logging.getLogger(__name__)
+
+ERROR_COLUMNS = ["Endpoint", "Error", "Count"]
+
+
+class LoadProfile:
+    """Open-loop arrival rate: ramps from 0 to rate over ramp_up seconds, holds it for steady seconds, then
+    ramps back down to 0 over ramp_down seconds."""
+
+    def __init__(self, rate, ramp_up=0, steady=60, ramp_down=0, arrivals="poisson"):
+        if arrivals not in ("poisson", "uniform"):
+            raise ValueError(f"Unknown arrival process: {arrivals}")
+        self.rate = rate
+        self.ramp_up = ramp_up
+        self.steady = steady
+        self.ramp_down = ramp_down
+        self.arrivals = arrivals
+
+    @property
+    def duration(self):
+        return self.ramp_up + self.steady + self.ramp_down
+
+    def rate_at(self, t):
+        if t < self.ramp_up:
+            return self.rate * t / self.ramp_up
+        if t < self.ramp_up + self.steady:
+            return self.rate
+        if t < self.duration:
+            return self.rate * (self.duration - t) / self.ramp_down
+        return 0
+
+    def expected_arrivals(self, t):
+        """Arrivals expected by time t: the integral of rate_at from 0 to t."""
+        t = min(max(t, 0), self.duration)
+        if t < self.ramp_up:
+            return self.rate * t * t / (2 * self.ramp_up)
+        expected = self.rate * self.ramp_up / 2
+        if t < self.ramp_up + self.steady:
+            return expected + self.rate * (t - self.ramp_up)
+        d = t - self.ramp_up - self.steady
+        expected += self.rate * self.steady
+        return expected + (self.rate * d - self.rate * d * d / (2 * self.ramp_down) if d else 0)
+
+    def time_of(self, n):
+        """Inverse of expected_arrivals: the time by which n arrivals are expected, or None past the end."""
+        if n < 0 or n > self.expected_arrivals(self.duration):
+            return None
+        ramp_up = self.rate * self.ramp_up / 2
+        if n < ramp_up:
+            return math.sqrt(2 * self.ramp_up * n / self.rate)
+        steady = ramp_up + self.rate * self.steady
+        if n <= steady:
+            return self.ramp_up + (n - ramp_up) / self.rate
+        remaining = (n - steady) / self.rate
+        d = self.ramp_down - math.sqrt(max(0.0, self.ramp_down * self.ramp_down - 2 * self.ramp_down * remaining))
+        return self.ramp_up + self.steady + d
+
+    def schedule(self, seed=None):
+        """Yield the intended start of every arrival, in seconds from the start of the run.
+
+        Arrivals are spaced 1 apart (uniform) or by unit-mean exponential gaps (poisson) on the expected_arrivals
+        scale and mapped back to time, so the arrival rate follows the ramps exactly, including their start.
+        """
+        if self.rate <= 0:
+            return
+        rng = random.Random(seed)
+        n = 0.0
+        while True:
+            n += rng.expovariate(1) if self.arrivals == "poisson" else 1
+            t = self.time_of(n)
+            if t is None or t >= self.duration:
+                return
+            yield t
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LatencyRecorder:
+    """Latencies and errors per endpoint, shared by every virtual user of a run."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds, error=None):
+        with self._lock:
+            self.latencies.setdefault(endpoint, []).append(seconds)
+            if error:
+                key = (endpoint, error)
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def summary(self, percentiles=(50, 95, 99)):
+        """{endpoint: {"requests", "errors", "p50", ..., "max"}} with latencies in milliseconds."""
+        with self._lock:
+            latencies = {endpoint: sorted(values) for endpoint, values in self.latencies.items()}
+            errors = dict(self.errors)
+        summary = {}
+        for endpoint, values in latencies.items():
+            stats = {
+                "requests": len(values),
+                "errors": sum(count for (name, _), count in errors.items() if name == endpoint),
+            }
+            for p in percentiles:
+                stats[f"p{p}"] = round(percentile(values, p) * 1000, 1)
+            stats["max"] = round(values[-1] * 1000, 1)
+            summary[endpoint] = stats
+        return summary
+
+    def write_report(self, filepath, percentiles=(50, 95, 99)):
+        columns = ["Endpoint", "Requests", "Errors"] + [f"p{p} (ms)" for p in percentiles] + ["Max (ms)"]
+        with ExcelReportWriter(filepath, {"Latency": columns, "Errors": ERROR_COLUMNS}) as report:
+            for endpoint, stats in self.summary(percentiles).items():
+                row = [endpoint, stats["requests"], stats["errors"]]
+                row += [stats[f"p{p}"] for p in percentiles] + [stats["max"]]
+                report.add_row("Latency", row, style="fail" if stats["errors"] else "pass")
+            for (endpoint, error), count in sorted(self.errors.items(), key=lambda item: -item[1]):
+                report.add_row("Errors", [endpoint, error, count], style="fail")
+
+    def log_summary(self, log=logger, percentiles=(50, 95, 99)):
+        for endpoint, stats in self.summary(percentiles).items():
+            log.info(f"{endpoint}: {stats}")
+        for (endpoint, error), count in sorted(self.errors.items(), key=lambda item: -item[1]):
+            log.warning(f"{endpoint}: {error} x{count}")
+
+
+class StepFailed(Exception):
+    """A journey step got an unusable answer; the message is the error category in the report."""
+
+
+def error_name(exc):
+    """Error category of exc in the report: the StepFailed message, else the exception type."""
+    return str(exc) if isinstance(exc, StepFailed) else type(exc).__name__
+
+
+class VirtualUser:
+    """One arrival of an open-loop run, handed to the journey function.
+
+    The first step is timed from the arrival's intended start rather than from when a thread picked it up, so
+    time spent waiting behind a saturated client or back office counts as latency (no coordinated omission).
+    Later steps of the same journey are timed from their own start.
+    """
+
+    def __init__(self, index, intended, recorder):
+        self.index = index
+        self.intended = intended
+        self.recorder = recorder
+        self.data = {}
+        self._next_start = intended
+
+    def step(self, endpoint):
+        return Step(self, endpoint)
+
+    @staticmethod
+    def check(response, code_field=True):
+        """Raise StepFailed unless response is HTTP 200 and, when code_field, its body carries code 200."""
+        if response.status_code != 200:
+            raise StepFailed(f"HTTP {response.status_code}")
+        if code_field:
+            try:
+                code = response.json().get("code")
+            except ValueError:
+                raise StepFailed("Invalid JSON")
+            if code != 200:
+                raise StepFailed(f"code {code}")
+        return response
+
+
+class Step:
+
+    def __init__(self, vu, endpoint):
+        self.vu = vu
+        self.endpoint = endpoint
+
+    def __enter__(self):
+        self.started = self.vu._next_start if self.vu._next_start is not None else time.perf_counter()
+        self.vu._next_start = None
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        error = error_name(exc) if exc is not None else None
+        self.vu.recorder.record(self.endpoint, time.perf_counter() - self.started, error)
+        return False
+
+
+class LoadRun:
+    """Drives journey(vu) at the profile's arrival rate from an asyncio loop.
+
+    Arrivals are dispatched on schedule whether or not earlier ones have finished (open loop). Journeys use the
+    blocking shared HTTP client, so they run on a thread pool of max_in_flight threads; arrivals beyond that
+    wait for a thread, and the wait is part of their measured latency.
+    """
+
+    def __init__(self, journey, profile, max_in_flight=None, seed=None):
+        self.journey = journey
+        self.profile = profile
+        self.max_in_flight = max_in_flight or LOAD_TEST["max_in_flight"]
+        self.seed = seed
+        self.recorder = LatencyRecorder()
+        self.arrivals = 0
+        self.completed = 0
+        self.max_lag = 0.0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def run(self):
+        asyncio.run(self._run())
+        return self
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        tasks = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="vu") as executor:
+            start = time.perf_counter()
+            for offset in self.profile.schedule(self.seed):
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    # The loop itself fell behind the schedule; recorded so a late generator is visible
+                    self.max_lag = max(self.max_lag, -delay)
+                self.arrivals += 1
+                vu = VirtualUser(self.arrivals, start + offset, self.recorder)
+                tasks.append(loop.run_in_executor(executor, self._run_journey, vu))
+            logger.info(f"All {self.arrivals} arrivals dispatched, waiting for in-flight journeys")
+            await asyncio.gather(*tasks)
+            self.elapsed = time.perf_counter() - start
+
+    def _run_journey(self, vu):
+        try:
+            self.journey(vu)
+            self.recorder.record("journey", time.perf_counter() - vu.intended)
+            with self._lock:
+                self.completed += 1
+        except Exception as e:
+            self.recorder.record("journey", time.perf_counter() - vu.intended, error_name(e))
+
+    def summary(self):
+        return {
+            "arrivals": self.arrivals,
+            "completed": self.completed,
+            "elapsed": round(self.elapsed, 1),
+            "achieved_rate": round(self.arrivals / self.profile.duration, 2) if self.profile.duration else 0,
+            "max_lag": round(self.max_lag, 3),
+            "endpoints": self.recorder.summary(LOAD_TEST["percentiles"]),
+        }
+
+    def write_report(self, filepath):
+        self.recorder.write_report(filepath, LOAD_TEST["percentiles"])
+
+    def log_summary(self, log=logger):
+        summary = self.summary()
+        log.info(
+            f"Load run: {summary['arrivals']} arrivals in {summary['elapsed']}s ({summary['achieved_rate']}/s), "
+            f"{summary['completed']} journeys completed, generator lag up to {summary['max_lag']}s"
+        )
+        self.recorder.log_summary(log, LOAD_TEST["percentiles"])
@@ -0,0 +1,164 @@
+import atexit
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from config.constant import LOGGING
+
+TEST_FORMAT = '%(asctime)s - %(name)s - [%(browser)s/%(language)s] - %(levelname)s - %(message)s'
+
+
+class TargetQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the background writer tagged with their output file. Unlike the stock QueueHandler it
+    does not format the message, so %-style arguments are only rendered on the writer thread."""
+
+    def __init__(self, log_queue, target):
+        super().__init__(log_queue)
+        self.target = target
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.qa_target = self.target
+        return record
+
+
+class Dispatcher(logging.Handler):
+    """Runs on the writer thread and passes each record to the shared handler of its output file."""
+
+    def __init__(self):
+        super().__init__()
+        self.targets = {}
+
+    def handle(self, record):
+        handler = self.targets.get(getattr(record, "qa_target", None))
+        if handler is not None:
+            handler.handle(record)
+        return True
+
+
+class TruncateFilter(logging.Filter):
+    """Cuts messages longer than max_chars, so full payload dumps cost one slice instead of a page of log."""
+
+    def __init__(self, max_chars):
+        super().__init__()
+        self.max_chars = max_chars
+
+    def filter(self, record):
+        message = record.getMessage()
+        if len(message) > self.max_chars:
+            record.msg = f"{message[:self.max_chars]}... [{len(message) - self.max_chars} more chars]"
+            record.args = None
+        return True
+
+
+class ContextFilter(logging.Filter):
+
+    def __init__(self, **context):
+        super().__init__()
+        self.context = context
+
+    def filter(self, record):
+        for key, value in self.context.items():
+            setattr(record, key, value)
+        return True
+
+
+class LogPipeline:
+    """One queue and one writer thread per process; every logger that writes to the same file shares one handler."""
+
+    def __init__(self):
+        self.queue = queue.SimpleQueue()
+        self.dispatcher = Dispatcher()
+        self.queue_handlers = {}
+        self.lock = threading.Lock()
+        self.listener = logging.handlers.QueueListener(self.queue, self.dispatcher)
+        self.listener.start()
+
+    def handler_for(self, filename, fmt):
+        target = (os.path.abspath(filename), fmt)
+        with self.lock:
+            if target not in self.queue_handlers:
+                file_handler = logging.FileHandler(filename, mode='a', encoding='utf-8')
+                file_handler.setFormatter(logging.Formatter(fmt))
+                file_handler.addFilter(TruncateFilter(LOGGING["max_message_chars"]))
+                self.dispatcher.targets[target] = file_handler
+                self.queue_handlers[target] = TargetQueueHandler(self.queue, target)
+            return self.queue_handlers[target]
+
+    def stop(self):
+        """Drain the queue and close the files."""
+        self.listener.stop()
+        for handler in self.dispatcher.targets.values():
+            handler.close()
+
+
+_pipeline = None
+_pipeline_pid = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline():
+    """Return this process's pipeline; a forked worker starts its own writer thread."""
+    global _pipeline, _pipeline_pid
+    with _pipeline_lock:
+        if _pipeline is None or _pipeline_pid != os.getpid():
+            _pipeline = LogPipeline()
+            _pipeline_pid = os.getpid()
+        return _pipeline
+
+
+def stop_logging():
+    """Flush everything still queued. Call before a worker process exits, since atexit does not run there."""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is not None and _pipeline_pid == os.getpid():
+            _pipeline.stop()
+            _pipeline = None
+
+
+atexit.register(stop_logging)
+
+
+def level_for(name):
+    """Level of the longest LOGGING["levels"] key that name starts with, else the default level."""
+    matches = [key for key in LOGGING["levels"] if name.startswith(key)]
+    return LOGGING["levels"][max(matches, key=len)] if matches else LOGGING["default_level"]
+
+
+def get_logger(name, filename, fmt=TEST_FORMAT, **context):
+    """Return a logger that writes to filename through the background writer.
+
+    Configured on first use only, so creating many test instances with the same logger name is cheap.
+    context values (e.g. browser, language) are set on every record for the format string.
+    """
+    logger = logging.getLogger(name)
+    pipeline = get_pipeline()
+    if getattr(logger, "_qa_pipeline", None) is pipeline:
+        return logger
+
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    for existing in logger.filters[:]:
+        if isinstance(existing, ContextFilter):
+            logger.removeFilter(existing)
+
+    logger.setLevel(level_for(name))
+    logger.addHandler(pipeline.handler_for(filename, fmt))
+    if context:
+        logger.addFilter(ContextFilter(**context))
+    logger.propagate = False
+    logger._qa_pipeline = pipeline
+    return logger
+
+
+def configure_root(filename, fmt='%(asctime)s - %(levelname)s - %(message)s'):
+    """Route the root logger (module loggers under utils/ and the run summary) through the pipeline too."""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.setLevel(LOGGING["default_level"])
+    root.addHandler(get_pipeline().handler_for(filename, fmt))
+    for name, level in LOGGING["levels"].items():
+        logging.getLogger(name).setLevel(level)
@@ -0,0 +1,143 @@
+import json
+import logging
+from selenium.common.exceptions import WebDriverException
+from config.constant import POPUP_DISMISSER
+
+logger = logging.getLogger(__name__)
+
+# Watches the document for known interstitials and clicks their close button as soon as it renders.
+# Observing `document` (not documentElement) lets the script run before the page has any markup.
+WATCHER_SCRIPT = """
+(function(rules) {
+    if (window.__qaPopupWatcher) {
+        window.__qaPopupWatcher.enabled = true;
+        return;
+    }
+    const watcher = {enabled: true, closed: [], scheduled: false};
+    window.__qaPopupWatcher = watcher;
+
+    const visible = element => !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length);
+    const sweep = () => {
+        watcher.scheduled = false;
+        if (!watcher.enabled) {
+            return;
+        }
+        for (const [name, selector] of Object.entries(rules)) {
+            const button = document.querySelector(selector);
+            if (button && visible(button) && !button.disabled) {
+                button.click();
+                watcher.closed.push({name: name, path: location.pathname, at: Date.now()});
+            }
+        }
+    };
+
+    new MutationObserver(() => {
+        if (!watcher.scheduled) {
+            watcher.scheduled = true;
+            setTimeout(sweep, 50);
+        }
+    }).observe(document, {childList: true, subtree: true});
+    sweep();
+})(%s);
+"""
+
+DRAIN_SCRIPT = """
+const watcher = window.__qaPopupWatcher;
+if (!watcher) {
+    return [];
+}
+return watcher.closed.splice(0, watcher.closed.length);
+"""
+
+STOP_SCRIPT = "if (window.__qaPopupWatcher) { window.__qaPopupWatcher.enabled = false; }"
+
+
+def keep_popups(test_method):
+    """Mark a test that asserts on the popups the watcher would otherwise close."""
+    test_method.keep_popups = True
+    return test_method
+
+
+class PopupDismisser:
+    """Closes announcement and check-in popups in the background and keeps a log of what it closed.
+
+    Chromium drivers get the watcher registered once per session through CDP so it runs on every new document.
+    Other drivers have driver.get wrapped to reinstall it after each navigation; in-app route changes keep
+    the same document, so the watcher survives them either way.
+    """
+
+    def __init__(self, driver, rules=None):
+        self.driver = driver
+        self.script = WATCHER_SCRIPT % json.dumps(rules or POPUP_DISMISSER["rules"])
+        self.enabled = False
+        self.script_id = None
+        self.closed = []
+        self.cdp = hasattr(driver, "execute_cdp_cmd")
+
+        get = driver.get
+
+        def get_and_watch(url):
+            self.drain()
+            get(url)
+            if self.enabled and not self.cdp:
+                self._install_on_page()
+
+        driver.get = get_and_watch
+
+    def _install_on_page(self):
+        try:
+            self.driver.execute_script(self.script)
+        except WebDriverException as e:
+            logger.debug(f"Could not install popup watcher on the current page: {str(e)}")
+
+    def enable(self):
+        if self.enabled:
+            return
+        if self.cdp:
+            try:
+                self.script_id = self.driver.execute_cdp_cmd(
+                    "Page.addScriptToEvaluateOnNewDocument", {"source": self.script}
+                )["identifier"]
+            except WebDriverException as e:
+                logger.warning(f"CDP unavailable, reinstalling the popup watcher after each navigation: {str(e)}")
+                self.cdp = False
+        self.enabled = True
+        self._install_on_page()
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.drain()
+        if self.script_id is not None:
+            try:
+                self.driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": self.script_id})
+            except WebDriverException as e:
+                logger.debug(f"Could not remove the popup watcher script: {str(e)}")
+            self.script_id = None
+        try:
+            self.driver.execute_script(STOP_SCRIPT)
+        except WebDriverException:
+            pass
+        self.enabled = False
+
+    def drain(self):
+        """Move what the watcher closed on the current page into self.closed and return the new entries."""
+        if not self.enabled:
+            return []
+        try:
+            entries = self.driver.execute_script(DRAIN_SCRIPT) or []
+        except WebDriverException:
+            return []
+        for entry in entries:
+            logger.info(f"Auto-dismissed {entry['name']} popup on {entry['path']}")
+        self.closed.extend(entries)
+        return entries
+
+
+def get_popup_dismisser(driver):
+    """Return the dismisser attached to driver, creating it on first use; pooled drivers keep theirs."""
+    dismisser = getattr(driver, "_qa_popups", None)
+    if dismisser is None:
+        dismisser = PopupDismisser(driver)
+        driver._qa_popups = dismisser
+    return dismisser
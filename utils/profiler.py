@@ -0,0 +1,80 @@
+import functools
+import logging
+import time
+from config.constant import PROFILER
+from utils.timing import current_timing
+
+logger = logging.getLogger(__name__)
+
+# Keeps the profiling wrapper out of test failure tracebacks
+__unittest = True
+
+TEST_BODY = "<test>"
+
+
+def instrument_connection(driver):
+    """Time every command sent over the driver's remote connection and tag it with the calling helper.
+
+    Commands are only kept while a timed test with profiling on is running (see TimedTestMixin), so a pooled
+    driver can stay instrumented between tests.
+    """
+    executor = driver.command_executor
+    if getattr(executor, "_qa_profiled", False):
+        return driver
+    execute = executor.execute
+
+    @functools.wraps(execute)
+    def profiled_execute(command, params):
+        timing = current_timing()
+        if timing is None or timing.commands is None:
+            return execute(command, params)
+        start = time.perf_counter()
+        try:
+            return execute(command, params)
+        finally:
+            helper = timing.helper_stack[-1] if timing.helper_stack else TEST_BODY
+            timing.commands.append((command, helper, time.perf_counter() - start))
+
+    executor.execute = profiled_execute
+    executor._qa_profiled = True
+    return driver
+
+
+def summarize(commands, top=None):
+    """Reduce (command, helper, seconds) records to totals plus the helpers with the most wire time."""
+    top = top or PROFILER["top_helpers"]
+    helpers = {}
+    by_command = {}
+    for command, helper, seconds in commands:
+        calls, total = helpers.get(helper, (0, 0.0))
+        helpers[helper] = (calls + 1, total + seconds)
+        calls, total = by_command.get(command, (0, 0.0))
+        by_command[command] = (calls + 1, total + seconds)
+
+    def ranked(totals):
+        items = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)[:top]
+        return [{"name": name, "commands": calls, "seconds": round(total, 3)} for name, (calls, total) in items]
+
+    return {
+        "commands": len(commands),
+        "wire_time": round(sum(seconds for _, _, seconds in commands), 3),
+        "helpers": ranked(helpers),
+        "command_types": ranked(by_command),
+    }
+
+
+def test_profile(test):
+    """Return the command summary of a test: replayed from a worker process, or built from its own timing."""
+    profile = getattr(test, "command_profile", None)
+    if profile is not None:
+        return profile
+    timing = getattr(test, "timing", None)
+    if timing is None or timing.commands is None:
+        return None
+    return summarize(timing.commands)
+
+
+def format_helpers(profile):
+    return "\n".join(
+        f"{helper['name']}: {helper['commands']} commands, {helper['seconds']:.2f}s" for helper in profile["helpers"]
+    )
@@ -0,0 +1,127 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from config.constant import REFERENCE_CACHE
+from utils.timing import RUN_ID
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reference_data (
+    run_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS idx_reference_data_name ON reference_data (run_id, name);
+"""
+
+
+class ReferenceCache:
+    """Slow-changing catalogs (VIP levels, rebate tiers, promotions, prizes, gifts, CMS content) fetched once
+    per run and shared by every worker process through a SQLite file.
+
+    Entries belong to the run that fetched them, so a new run always starts cold. Tests that change a catalog
+    call invalidate(name) so the next read in any worker goes back to the API.
+    """
+
+    def __init__(self, path, run_id=RUN_ID, default_ttl=900, ttl=None):
+        self.path = path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+        self.run_id = run_id
+        self.default_ttl = default_ttl
+        self.ttl = ttl or {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+            conn.execute("DELETE FROM reference_data WHERE expires_at < ?", (time.time(),))
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get(self, name, fetch, ttl=None, **params):
+        """Return the cached value of name for params, calling fetch() on a miss or after the TTL.
+
+        Values go through JSON, so each caller gets its own copy and may modify it. None is never cached.
+        """
+        key = self._key(name, params)
+        value = self._lookup(key)
+        if value is not None:
+            return value
+
+        # Threads asking for the same catalog wait for one fetch instead of all calling the API
+        with self._key_lock(key):
+            value = self._lookup(key)
+            if value is not None:
+                return value
+
+            value = fetch()
+            if value is None:
+                return None
+
+            now = time.time()
+            ttl = ttl if ttl is not None else self.ttl.get(name, self.default_ttl)
+            with closing(self._connect()) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO reference_data (run_id, key, name, value, fetched_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.run_id, key, name, json.dumps(value), now, now + ttl)
+                )
+            logger.info(f"Cached {name} {params or ''} for {ttl}s")
+            return json.loads(json.dumps(value))
+
+    def invalidate(self, *names):
+        """Drop every cached variant of the named catalogs for this run, in all workers."""
+        with closing(self._connect()) as conn:
+            for name in names:
+                conn.execute("DELETE FROM reference_data WHERE run_id = ? AND name = ?", (self.run_id, name))
+        logger.info(f"Invalidated reference data: {', '.join(names)}")
+
+    def clear(self):
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM reference_data WHERE run_id = ?", (self.run_id,))
+
+    def _lookup(self, key):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT value FROM reference_data WHERE run_id = ? AND key = ? AND expires_at > ?",
+                (self.run_id, key, time.time())
+            ).fetchone()
+        return json.loads(row["value"]) if row is not None else None
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _key(name, params):
+        return f"{name}|{json.dumps(params, sort_keys=True, default=str)}"
+
+
+_cache = None
+_cache_pid = None
+_cache_lock = threading.Lock()
+
+
+def get_reference_cache():
+    """Return the cache for the current process; workers of the same run share entries through the file."""
+    global _cache, _cache_pid
+    with _cache_lock:
+        if _cache is None or _cache_pid != os.getpid():
+            _cache = ReferenceCache(
+                REFERENCE_CACHE["path"], default_ttl=REFERENCE_CACHE["default_ttl"], ttl=REFERENCE_CACHE["ttl"]
+            )
+            _cache_pid = os.getpid()
+        return _cache
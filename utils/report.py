@@ -0,0 +1,153 @@
+import glob
+import json
+import logging
+import os
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill, Font
+from openpyxl.utils import get_column_letter
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = ".journal"
+LINE_HEIGHT = 15
+
+STYLES = {
+    "header": {"font": Font(bold=True)},
+    "pass": {"fill": PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")},
+    "fail": {"fill": PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid")},
+}
+
+
+class ExcelReportWriter:
+    """Streams report rows to an append-only journal next to the workbook and renders it with openpyxl's
+    write-only mode on close.
+
+    Column widths and row heights are tracked as running maxima while rows arrive, so rendering is a single pass
+    and memory stays constant however many rows a run produces. If the run dies before close(), the journal is
+    left on disk and recover_reports() turns it into a partial workbook.
+
+    The journal name carries journal_tag (the process id by default), so processes reporting to the same workbook
+    never share a journal.
+    """
+
+    def __init__(self, filepath, sheets, journal_tag=None):
+        """sheets maps sheet title to its header row, in the order the sheets should appear."""
+        self.filepath = filepath
+        self.journal_path = f"{filepath}.{journal_tag or os.getpid()}{JOURNAL_SUFFIX}"
+        os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+
+        self.sheets = {title: list(headers) for title, headers in sheets.items()}
+        self.widths = {title: [len(str(header)) for header in headers] for title, headers in self.sheets.items()}
+        self.row_count = 0
+
+        self._journal = open(self.journal_path, "w", encoding="utf-8")
+        self._write_line({"sheets": self.sheets, "filepath": os.path.abspath(filepath)})
+
+    def _write_line(self, entry):
+        self._journal.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        # Flush every row so a crash loses at most the row being written
+        self._journal.flush()
+
+    def add_row(self, sheet, values, style=None):
+        values = ["" if value is None else value for value in values]
+        self._track(self.widths, sheet, values)
+        self._write_line({"sheet": sheet, "values": values, "style": style})
+        self.row_count += 1
+
+    @staticmethod
+    def _track(widths, sheet, values):
+        sheet_widths = widths[sheet]
+        for index, value in enumerate(values):
+            length = max(len(line) for line in str(value).split("\n"))
+            if index >= len(sheet_widths):
+                sheet_widths.append(length)
+            elif length > sheet_widths[index]:
+                sheet_widths[index] = length
+
+    def close(self):
+        if self._journal.closed:
+            return
+        self._journal.close()
+        try:
+            render_journal(self.journal_path, self.filepath, self.widths)
+        except Exception as e:
+            # Runs from a finally block; the journal stays on disk for recover_reports() to retry
+            logger.error(f"Could not write report {self.filepath}, journal kept at {self.journal_path}: {str(e)}")
+            return
+        os.remove(self.journal_path)
+        logger.info(f"Report written to {self.filepath} ({self.row_count} rows)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _cell(ws, value, style):
+    cell = WriteOnlyCell(ws, value=value)
+    for attribute, setting in STYLES.get(style, {}).items():
+        setattr(cell, attribute, setting)
+    return cell
+
+
+def _read_journal(journal_path):
+    with open(journal_path, "r", encoding="utf-8") as journal:
+        for line in journal:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # A torn last line from a crash; everything before it is still valid
+                return
+
+
+def render_journal(journal_path, filepath, widths=None):
+    """Render a journal into a workbook at filepath. Without widths, they are computed in a first pass."""
+    entries = _read_journal(journal_path)
+    sheets = next(entries)["sheets"]
+
+    if widths is None:
+        widths = {title: [len(str(header)) for header in headers] for title, headers in sheets.items()}
+        for entry in entries:
+            ExcelReportWriter._track(widths, entry["sheet"], entry["values"])
+        entries = _read_journal(journal_path)
+        next(entries)
+
+    wb = Workbook(write_only=True)
+    worksheets = {}
+    for title, headers in sheets.items():
+        ws = wb.create_sheet(title=title)
+        for index, width in enumerate(widths[title], 1):
+            ws.column_dimensions[get_column_letter(index)].width = width + 2
+        ws.append([_cell(ws, header, "header") for header in headers])
+        worksheets[title] = [ws, 1]
+
+    for entry in entries:
+        ws, row_index = worksheets[entry["sheet"]]
+        row_index += 1
+        lines = max(str(value).count("\n") + 1 for value in entry["values"]) if entry["values"] else 1
+        if lines > 1:
+            ws.row_dimensions[row_index].height = LINE_HEIGHT * lines
+        ws.append([_cell(ws, value, entry.get("style")) for value in entry["values"]])
+        worksheets[entry["sheet"]][1] = row_index
+
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    wb.save(tmp_path)
+    os.replace(tmp_path, filepath)
+
+
+def recover_reports(directory):
+    """Render journals left behind by runs that crashed before closing their report."""
+    recovered = []
+    for journal_path in glob.glob(os.path.join(directory, f"*{JOURNAL_SUFFIX}")):
+        filepath = journal_path[:-len(JOURNAL_SUFFIX)]
+        try:
+            filepath = next(_read_journal(journal_path)).get("filepath", filepath)
+            render_journal(journal_path, filepath)
+            os.remove(journal_path)
+            recovered.append(filepath)
+            logger.warning(f"Recovered partial report {filepath}")
+        except Exception as e:
+            logger.error(f"Could not recover report from {journal_path}: {str(e)}")
+    return recovered
@@ -0,0 +1,113 @@
+import time
+import unittest
+from utils.profiler import test_profile
+
+
+def format_message(error_value):
+    """Report text for an exception: assertion messages as they are, anything else prefixed with "Test failed:"."""
+    message = str(error_value)
+    if not (isinstance(error_value, AssertionError) or "Test failed:" in message):
+        message = f"Test failed: {message}"
+    return message
+
+
+class TestRecord:
+    """Compact, picklable summary of one finished test.
+
+    Stands in for the TestCase in result lists, so the test (driver, logger, page data) and the traceback frames
+    can be freed as soon as the test has been reported. Provides the few TestCase methods TextTestResult uses
+    when it prints the error list at the end of a run.
+    """
+
+    __slots__ = (
+        "module", "test_class", "method", "status", "duration", "message", "traceback", "artifacts", "profile"
+    )
+
+    def __init__(
+        self, module, test_class, method, status, duration=None, message=None, traceback=None, artifacts=None,
+        profile=None
+    ):
+        self.module = module
+        self.test_class = test_class
+        self.method = method
+        self.status = status
+        self.duration = duration
+        self.message = message
+        self.traceback = traceback
+        self.artifacts = artifacts or []
+        self.profile = profile
+
+    @classmethod
+    def from_test(cls, test, status, err=None, traceback=None, duration=None):
+        message = format_message(err[1]) if err else None
+        if err:
+            # Errors replayed from a worker process carry the worker's traceback
+            traceback = getattr(err[1], "remote_traceback", None) or traceback
+        if not isinstance(test, unittest.TestCase):
+            # Class or module fixture errors arrive as an _ErrorHolder rather than a TestCase
+            return cls("", str(test), "", status, duration, message, traceback)
+        # Tests replayed from a worker process carry the worker's measurements
+        reported = getattr(test, "reported_duration", None)
+        duration = reported if reported is not None else duration
+        return cls(
+            test.__class__.__module__, test.__class__.__qualname__, test._testMethodName, status,
+            round(duration, 3) if duration is not None else None, message, traceback,
+            list(getattr(test, "artifacts", [])), test_profile(test)
+        )
+
+    @property
+    def key(self):
+        return f"{self.module}.{self.test_class}.{self.method}" if self.method else self.test_class
+
+    def id(self):
+        return self.key
+
+    def shortDescription(self):
+        return None
+
+    def __str__(self):
+        return f"{self.method} ({self.module}.{self.test_class})" if self.method else self.test_class
+
+
+class RecordingResultMixin:
+    """TestResult mixin that turns each finished test into a TestRecord as soon as it is reported.
+
+    The TestCase in errors/failures/skipped is swapped for its record, so neither the test nor its traceback
+    stays alive until the end of the run. The list lengths are unchanged, which TimedTestMixin relies on to
+    tell the outcome of a test. Subclasses handle each record in on_record().
+    """
+
+    def startTest(self, test):
+        self._test_started = time.perf_counter()
+        super().startTest(test)
+
+    def _record(self, status, test, err=None, entries=None):
+        started = getattr(self, "_test_started", None)
+        duration = time.perf_counter() - started if started is not None and isinstance(test, unittest.TestCase) else None
+        detail = entries[-1][1] if entries else None
+        record = TestRecord.from_test(test, status, err, detail if err else None, duration)
+        if status == "SKIP":
+            record.message = detail
+        if entries:
+            entries[-1] = (record, detail)
+        self.on_record(record)
+        return record
+
+    def on_record(self, record):
+        pass
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self._record("PASS", test)
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._record("ERROR", test, err, self.errors)
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._record("FAILURE", test, err, self.failures)
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._record("SKIP", test, entries=self.skipped)
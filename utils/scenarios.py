@@ -0,0 +1,140 @@
+import concurrent.futures
+import logging
+import random
+import threading
+import time
+from config.constant import SCENARIOS
+from utils.load import LatencyRecorder, VirtualUser, error_name
+
+logger = logging.getLogger(__name__)
+
+END = "end"
+
+
+class Scenario:
+    """A user journey as a weighted state machine. transitions maps each state to {next state: weight};
+    reaching "end" (or a state without transitions) finishes the journey."""
+
+    def __init__(self, name, start, transitions, weight=1):
+        self.name = name
+        self.start = start
+        self.transitions = transitions
+        self.weight = weight
+
+    @classmethod
+    def from_config(cls, name, settings):
+        return cls(name, settings["start"], settings["transitions"], settings.get("weight", 1))
+
+    def states(self):
+        states = {self.start} | set(self.transitions)
+        for targets in self.transitions.values():
+            states.update(targets)
+        states.discard(END)
+        return states
+
+    def next_state(self, state, rng):
+        options = self.transitions.get(state)
+        if not options:
+            return END
+        return rng.choices(list(options), weights=list(options.values()))[0]
+
+
+class ScenarioUser:
+    """One member of the population. context (e.g. a TestInit with the user's account) and data outlive a
+    journey, so a later journey can pick up the account an earlier one registered and funded."""
+
+    def __init__(self, index, context, rng):
+        self.index = index
+        self.context = context
+        self.rng = rng
+        self.data = {}
+        self.vu = None
+        self.scenario = None
+
+
+class ScenarioEngine:
+    """Runs population users for duration seconds. Each user repeatedly picks a scenario by weight and walks it,
+    calling actions[state](user) for every state and waiting a think time between actions.
+
+    Unlike LoadRun this is a closed model: the traffic mix comes from the weights and the load from the
+    population and think times. Every user is a thread, since the actions are blocking BaseTest helpers.
+    """
+
+    def __init__(self, scenarios, actions, population=None, duration=None, ramp_up=None, think_time=None,
+                 make_context=None, seed=None):
+        self.scenarios = scenarios
+        self.actions = actions
+        self.population = population or SCENARIOS["population"]
+        self.duration = duration or SCENARIOS["duration"]
+        self.ramp_up = ramp_up if ramp_up is not None else SCENARIOS["ramp_up"]
+        self.think_time = think_time or SCENARIOS["think_time"]
+        self.make_context = make_context or (lambda index: None)
+        self.seed = seed
+        self.recorder = LatencyRecorder()
+        self.visits = {}
+        self.journeys = {}
+        self._lock = threading.Lock()
+        self.deadline = None
+
+        missing = {state for scenario in scenarios for state in scenario.states()} - set(actions)
+        if missing:
+            raise ValueError(f"No action for scenario states: {', '.join(sorted(missing))}")
+
+    def run(self):
+        self.deadline = time.perf_counter() + self.duration
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.population, thread_name_prefix="user") as executor:
+            futures = [executor.submit(self._live, index) for index in range(self.population)]
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+        return self
+
+    def _live(self, index):
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        # Users join evenly over the ramp-up instead of all arriving at once
+        time.sleep(index * self.ramp_up / self.population)
+        user = ScenarioUser(index, self.make_context(index), rng)
+        weights = [scenario.weight for scenario in self.scenarios]
+        while time.perf_counter() < self.deadline:
+            self._journey(user, rng.choices(self.scenarios, weights=weights)[0])
+
+    def _journey(self, user, scenario):
+        started = time.perf_counter()
+        user.scenario = scenario
+        user.vu = VirtualUser(user.index, started, self.recorder)
+        state = scenario.start
+        error = None
+        try:
+            while state != END and time.perf_counter() < self.deadline:
+                with user.vu.step(state):
+                    self.actions[state](user)
+                self._count(self.visits, (scenario.name, state))
+                state = scenario.next_state(state, user.rng)
+                if state != END:
+                    time.sleep(user.rng.uniform(*self.think_time))
+        except Exception as e:
+            error = error_name(e)
+            logger.debug(f"User {user.index} {scenario.name} failed at {state}: {str(e)}")
+        if error is None and state != END:
+            # Cut short by the end of the run; neither a completion nor a journey latency
+            self._count(self.journeys, (scenario.name, "truncated"))
+            return
+        self._count(self.journeys, (scenario.name, "failed" if error else "completed"))
+        self.recorder.record(f"journey:{scenario.name}", time.perf_counter() - started, error)
+
+    def _count(self, counter, key):
+        with self._lock:
+            counter[key] = counter.get(key, 0) + 1
+
+    def log_summary(self, log=logger):
+        log.info(f"Scenario run: {self.population} users for {self.duration}s")
+        for (name, outcome), count in sorted(self.journeys.items()):
+            log.info(f"{name}: {count} {outcome}")
+        log.info(f"State visits: {dict(sorted(self.visits.items()))}")
+        self.recorder.log_summary(log, SCENARIOS["percentiles"])
+
+    def write_report(self, filepath):
+        self.recorder.write_report(filepath, SCENARIOS["percentiles"])
+
+
+def configured_scenarios():
+    return [Scenario.from_config(name, settings) for name, settings in SCENARIOS["journeys"].items()]
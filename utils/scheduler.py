@@ -0,0 +1,209 @@
+import heapq
+import importlib
+import logging
+import multiprocessing
+import queue
+import unittest
+from config.constant import SCHEDULER
+from utils.results import RecordingResultMixin, TestRecord
+from utils.logs import stop_logging
+from utils.browser_pool import close_browser_pool
+from utils.latency import flush_api_latency, set_scope
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteTestError(Exception):
+    """Stands in for an exception raised in a worker process; carries the formatted worker traceback."""
+
+    def __init__(self, message, remote_traceback=None):
+        super().__init__(message)
+        self.remote_traceback = remote_traceback
+
+
+def iter_tests(suite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iter_tests(test)
+        else:
+            yield test
+
+
+def test_key(test):
+    return f"{test.__class__.__module__}.{test.__class__.__qualname__}.{test._testMethodName}"
+
+
+def build_units(suite):
+    """Group a suite into schedulable units.
+
+    Classes with ORDERED_TESTS = True share state between their numbered tests, so all of their methods stay in
+    one unit and run in suite order on the same worker. Every other test method is a unit of its own.
+    """
+    units = []
+    ordered = {}
+    for test in iter_tests(suite):
+        cls = test.__class__
+        if getattr(cls, "ORDERED_TESTS", False):
+            if cls not in ordered:
+                ordered[cls] = []
+                units.append(ordered[cls])
+            ordered[cls].append(test_key(test))
+        else:
+            units.append([test_key(test)])
+    return units
+
+
+def balance_shards(units, workers, durations=None, default_duration=None):
+    """Split units across workers longest-first (LPT), using historical durations in seconds where known."""
+    durations = durations or {}
+    default_duration = default_duration if default_duration is not None else SCHEDULER["default_duration"]
+
+    def cost(unit):
+        return sum(durations.get(key, default_duration) for key in unit)
+
+    shards = [[] for _ in range(max(1, min(workers, len(units))))]
+    loads = [(0.0, index) for index in range(len(shards))]
+    heapq.heapify(loads)
+    for unit in sorted(units, key=cost, reverse=True):
+        load, index = heapq.heappop(loads)
+        shards[index].append(unit)
+        heapq.heappush(loads, (load + cost(unit), index))
+
+    # Within a shard, keep the original suite order so reports and logs read naturally
+    order = {key: position for position, key in enumerate(key for unit in units for key in unit)}
+    return [sorted(shard, key=lambda unit: order[unit[0]]) for shard in shards]
+
+
+def load_test(key, language, browser):
+    module_name, class_name, method_name = key.rsplit(".", 2)
+    cls = getattr(importlib.import_module(module_name), class_name)
+    if hasattr(cls, "generate_test_methods"):
+        # Classes like TestRevert add their test methods at runtime
+        cls.generate_test_methods(browser=browser, language=language)
+    return cls(method_name, language=language, browser=browser)
+
+
+class ShardResult(RecordingResultMixin, unittest.TestResult):
+    """Sends one TestRecord per finished test back to the scheduler; the worker keeps nothing but the records."""
+
+    def __init__(self, results_queue, shard_index):
+        super().__init__()
+        self.results_queue = results_queue
+        self.shard_index = shard_index
+
+    def on_record(self, record):
+        self.results_queue.put(("result", self.shard_index, record))
+
+
+def run_shard(shard_index, units, language, browser, results_queue, worker_init=None):
+    if worker_init:
+        worker_init(language, browser, shard_index)
+    set_scope(language, browser)
+
+    result = ShardResult(results_queue, shard_index)
+    try:
+        for unit in units:
+            suite = unittest.TestSuite(load_test(key, language, browser) for key in unit)
+            suite.run(result)
+    finally:
+        # Stored before "done", so the parent's latency report includes this worker's calls
+        flush_api_latency()
+        results_queue.put(("done", shard_index, None))
+        # Worker processes skip atexit, so quit idle browsers and flush the background log writer before exiting
+        close_browser_pool()
+        stop_logging()
+
+
+class ParallelScheduler:
+    """Runs a suite across worker processes, each with its own browser, and merges results into one result object."""
+
+    def __init__(self, workers=None, durations=None, worker_init=None):
+        self.workers = workers or SCHEDULER["workers"]
+        self.durations = durations
+        self.worker_init = worker_init
+
+    def run(self, suite, result, language, browser):
+        tests = {test_key(test): test for test in iter_tests(suite)}
+        shards = balance_shards(build_units(suite), self.workers, self.durations)
+        logger.info(f"Running {len(tests)} tests in {len(shards)} shards for {language}/{browser}")
+
+        results_queue = multiprocessing.Queue()
+        processes = []
+        for index, units in enumerate(shards):
+            process = multiprocessing.Process(
+                target=run_shard, args=(index, units, language, browser, results_queue, self.worker_init)
+            )
+            process.start()
+            processes.append(process)
+
+        records = self._collect(results_queue, processes)
+
+        # Replay in suite order so the merged result matches a serial run, dropping each test once it is reported
+        for key in list(tests):
+            test = tests.pop(key)
+            record = records.pop(key, None) or TestRecord(
+                test.__class__.__module__, test.__class__.__qualname__, test._testMethodName, "ERROR",
+                message="Test did not run in its worker process; see the worker log"
+            )
+            self._replay(result, test, record)
+        return result
+
+    def _collect(self, results_queue, processes):
+        records = {}
+        running = set(range(len(processes)))
+        while running:
+            try:
+                kind, shard_index, record = results_queue.get(timeout=SCHEDULER["poll_interval"])
+            except queue.Empty:
+                for index in list(running):
+                    if not processes[index].is_alive():
+                        logger.error(f"Shard {index} exited with code {processes[index].exitcode}")
+                        running.discard(index)
+                continue
+
+            if kind == "done":
+                running.discard(shard_index)
+            else:
+                records[record.key] = record
+                if record.status in ("ERROR", "FAILURE"):
+                    logger.info(f"Shard {shard_index}: {record.key} {record.status}: {record.message}")
+
+        for process in processes:
+            process.join()
+        return records
+
+    def _replay(self, result, test, record):
+        # The worker's measurements, so the report can show them for the test instance replayed here
+        test.command_profile = record.profile
+        test.reported_duration = record.duration
+        test.artifacts = record.artifacts
+        result.startTest(test)
+        status = record.status
+        if status == "PASS":
+            result.addSuccess(test)
+        elif status == "SKIP":
+            result.addSkip(test, record.message)
+        elif status == "FAILURE":
+            error = AssertionError(record.message)
+            error.remote_traceback = record.traceback
+            result.addFailure(test, (AssertionError, error, None))
+        else:
+            error = RemoteTestError(record.message, record.traceback)
+            result.addError(test, (RemoteTestError, error, None))
+        result.stopTest(test)
+
+
+class ParallelSuite:
+    """Suite wrapper that TextTestRunner can run like a normal suite while the scheduler fans tests out."""
+
+    def __init__(self, suite, language, browser, scheduler=None):
+        self.suite = suite
+        self.language = language
+        self.browser = browser
+        self.scheduler = scheduler or ParallelScheduler()
+
+    def countTestCases(self):
+        return self.suite.countTestCases()
+
+    def __call__(self, result):
+        return self.scheduler.run(self.suite, result, self.language, self.browser)
@@ -0,0 +1,80 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Reads a whole list of rows in one WebDriver round-trip.
+# arguments[0]: CSS selector for the rows, or an array of row elements
+# arguments[1]: {field: {css|xpath, attr, all}}, or null to describe each row itself
+# arguments[2]: root element for a CSS rows selector, or null for the document
+SNAPSHOT_SCRIPT = """
+const [rows, fields, root] = arguments;
+const visible = element => !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length);
+// Like WebElement.text: hidden elements read as empty
+const text = element => visible(element) ? (element.innerText || '').trim() : '';
+
+const find = (row, spec) => {
+    if (!spec.css && !spec.xpath) {
+        return [row];
+    }
+    if (spec.css) {
+        return Array.from(row.querySelectorAll(spec.css));
+    }
+    const result = document.evaluate(spec.xpath, row, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    return Array.from({length: result.snapshotLength}, (_, index) => result.snapshotItem(index));
+};
+
+const read = (element, spec) => {
+    if (spec.attr === 'visible') {
+        return visible(element);
+    }
+    return spec.attr ? element.getAttribute(spec.attr) : text(element);
+};
+
+const elements = typeof rows === 'string' ? Array.from((root || document).querySelectorAll(rows)) : rows;
+return elements.map(row => {
+    if (!fields) {
+        return {id: row.id || null, text: text(row), visible: visible(row)};
+    }
+    const values = {};
+    for (const [name, spec] of Object.entries(fields)) {
+        const matches = find(row, spec);
+        values[name] = spec.all ? matches.map(match => read(match, spec)) : (matches.length ? read(matches[0], spec) : null);
+    }
+    return values;
+});
+"""
+
+
+def field_spec(spec):
+    """Normalise a field spec: a CSS selector, "xpath:<expr>", None for the row itself, or a dict.
+
+    Dict specs take css or xpath plus optional attr (an attribute name, or "visible") and all (every match
+    as a list instead of the first match's value).
+    """
+    if spec is None:
+        return {}
+    if isinstance(spec, dict):
+        return spec
+    if spec.startswith("xpath:"):
+        return {"xpath": spec[len("xpath:"):]}
+    return {"css": spec}
+
+
+def snapshot(driver, rows, fields=None, root=None):
+    """Return one dict per row with the requested fields, read in a single execute_script call.
+
+    Without fields, each row is described as {"id", "text", "visible"}. Missing fields come back as None.
+    """
+    if not isinstance(rows, str) and not rows:
+        return []
+    specs = {name: field_spec(spec) for name, spec in fields.items()} if fields else None
+    return driver.execute_script(SNAPSHOT_SCRIPT, rows, specs, root)
+
+
+def texts_by_id(driver, selector, root=None):
+    """Return {element id: text} for every element matching selector; the first element wins on duplicate ids."""
+    texts = {}
+    for row in snapshot(driver, selector, root=root):
+        if row["id"] and row["id"] not in texts:
+            texts[row["id"]] = row["text"]
+    return texts
@@ -0,0 +1,737 @@
+import atexit
+import email
+import email.policy
+import json
+import logging
+import os
+import random
+import re
+import secrets
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from config.constant import STANDIN
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QA_PASSES = {"123456", "99999"}
+
+# Provider catalog of the stand-in: category label -> [(provider id, name)]
+CATEGORIES = {
+    "Slots": [(1, "Pragmatic Play"), (2, "Jili"), (3, "Spadegaming"), (4, "Joker"), (5, "Mega888"), (32, "Red Tiger")],
+    "Live Casino": [(11, "Evolution"), (12, "Sexy Baccarat"), (13, "Dream Gaming"), (14, "WM Casino")],
+    "Sports": [(21, "SBOBET"), (22, "CMD368")],
+    "Lottery": [(31, "4D")],
+}
+
+VIP_LEVELS = [
+    {"id": 1, "vipname": "Bronze", "recharge": "0.00"},
+    {"id": 2, "vipname": "Silver", "recharge": "5000.00"},
+    {"id": 3, "vipname": "Gold", "recharge": "20000.00"},
+    {"id": 4, "vipname": "Platinum", "recharge": "50000.00"},
+    {"id": 5, "vipname": "Diamond", "recharge": "100000.00"},
+]
+
+# Promo code -> bonus percent of the deposit and turnover multiplier of deposit plus bonus
+PROMOTIONS = {
+    "10DSRB": {"optionName": "10% Daily Slot Reload Bonus", "bonus": 10, "turnover": 3},
+    "50WB": {"optionName": "50% Welcome Bonus", "bonus": 50, "turnover": 10},
+}
+
+# Provider id -> rebate percent per tier ("1" is the user's own bets, "2"/"3" those of its downlines)
+REBATE_PERCENTAGES = {
+    provider_id: {"1": 0.5, "2": 0.3, "3": 0.1} if label in ("Slots", "Live Casino") else {"1": 0.2, "2": 0.1, "3": 0}
+    for label, providers in CATEGORIES.items() for provider_id, _ in providers
+}
+
+MIN_DEPOSIT, MAX_DEPOSIT, MIN_WITHDRAW = 30, 50000, 50
+
+
+class StandInError(Exception):
+    """Rejected request; rendered as {"code": status, "message": message}."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def money(value):
+    return round(float(value), 2)
+
+
+class BackOffice:
+    """In-memory back office: users, wallets, deposits, withdrawals, turnover locks, downlines, bets, rebates
+    and 4D records. Every mutation runs under one lock, so concurrent transfers keep wallets consistent."""
+
+    def __init__(self, maintenance_providers=()):
+        self.lock = threading.RLock()
+        # Bumped by every request that changed state; the server saves when it moved since the last save
+        self.version = 0
+        self.users = {}
+        self.tokens = {}
+        self.next_id = 100001
+        self.maintenance_providers = set(maintenance_providers)
+        self.providers = {provider_id: name for providers in CATEGORIES.values() for provider_id, name in providers}
+
+    # State
+
+    def load(self, path):
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        with self.lock:
+            self.users = {int(user_id): user for user_id, user in state["users"].items()}
+            for user in self.users.values():
+                user["credits"] = {int(provider_id): credit for provider_id, credit in user["credits"].items()}
+            self.tokens = state["tokens"]
+            self.next_id = state["next_id"]
+        logger.info(f"Loaded stand-in state for {len(self.users)} users from {path}")
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self.lock:
+            version = self.version
+            state = json.dumps({"users": self.users, "tokens": self.tokens, "next_id": self.next_id})
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(state)
+        os.replace(tmp_path, path)
+        return version
+
+    def _new_id(self):
+        self.next_id += 1
+        return self.next_id - 1
+
+    def create_user(self, username, password, realname=None, phone=None, upline=None):
+        with self.lock:
+            if any(user["username"].lower() == username.lower() for user in self.users.values()):
+                raise StandInError("The username has already been taken.", 422)
+            user_id = self._new_id()
+            self.users[user_id] = {
+                "id": user_id, "username": username, "password": password, "realname": realname or username,
+                "phone": phone or "", "upline": upline, "main": 0.0, "credits": {}, "paysum": 0.0,
+                "deposits": [], "withdrawals": [], "turnovers": [], "bets": [], "rebates": [],
+                "fourd_cards": 0.0, "fourd_records": [],
+            }
+            return self.users[user_id]
+
+    def user(self, user_id):
+        try:
+            return self.users[int(user_id)]
+        except (KeyError, TypeError, ValueError):
+            raise StandInError(f"User {user_id} not found", 404)
+
+    def authenticate(self, headers):
+        token = (headers.get("Authorization") or "").removeprefix("Bearer ").strip()
+        user_id = self.tokens.get(token)
+        if user_id is None:
+            raise StandInError("Unauthenticated.", 401)
+        return self.users[user_id]
+
+    def vip_level(self, user):
+        return max((level for level in VIP_LEVELS if float(level["recharge"]) <= user["paysum"]),
+                   key=lambda level: float(level["recharge"]))
+
+    def downlines(self, user_id):
+        return [user for user in self.users.values() if user["upline"] == user_id]
+
+    # Turnover
+
+    def add_turnover(self, user, amount, locked_by):
+        user["turnovers"].append({
+            "id": self._new_id(), "progress": 0.0, "target": money(amount), "lockedby": locked_by,
+        })
+
+    def add_bet(self, user, amount):
+        for turnover in user["turnovers"]:
+            turnover["progress"] = money(min(turnover["target"], turnover["progress"] + amount))
+
+    @staticmethod
+    def incomplete_turnover(user):
+        return any(turnover["progress"] < turnover["target"] for turnover in user["turnovers"])
+
+    # Wallet
+
+    def transfer(self, user, source_id, target_id, amount):
+        amount = money(amount)
+        if amount <= 0:
+            raise StandInError("The amount must be greater than 0.", 422)
+        if source_id == target_id:
+            raise StandInError("Source and target must be different.", 422)
+        for wallet_id in (source_id, target_id):
+            if wallet_id != 0 and wallet_id not in self.providers:
+                raise StandInError(f"Wallet {wallet_id} not found", 404)
+            if wallet_id in self.maintenance_providers:
+                # Not a 5xx, which the HTTP client would retry with backoff
+                raise StandInError(f"{self.providers[wallet_id]} is under maintenance", 400)
+        with self.lock:
+            available = user["main"] if source_id == 0 else user["credits"].get(source_id, 0.0)
+            if available < amount:
+                raise StandInError("Insufficient balance", 422)
+            self._credit(user, source_id, -amount)
+            self._credit(user, target_id, amount)
+
+    @staticmethod
+    def _credit(user, wallet_id, amount):
+        if wallet_id == 0:
+            user["main"] = money(user["main"] + amount)
+        else:
+            user["credits"][wallet_id] = money(user["credits"].get(wallet_id, 0.0) + amount)
+
+    def account_list(self, user):
+        accounts = [{"id": 0, "label": "Main Wallet", "credit": user["main"], "games": []}]
+        for index, (label, providers) in enumerate(CATEGORIES.items(), start=1):
+            accounts.append({
+                "id": index * 1000, "label": label,
+                "credit": money(sum(user["credits"].get(provider_id, 0.0) for provider_id, _ in providers)),
+                "games": [
+                    {"id": provider_id, "name": name, "credit": user["credits"].get(provider_id, 0.0),
+                     "has_failed_transfer": False}
+                    for provider_id, name in providers
+                ],
+            })
+        return accounts
+
+    # Deposits and withdrawals
+
+    def settle(self, kind, user_ids, action):
+        """Approve, reject or mark as processing the open requests of each user. Returns the failed IDs."""
+        failed = []
+        with self.lock:
+            for user_id in user_ids:
+                try:
+                    user = self.user(user_id)
+                except StandInError:
+                    failed.append(user_id)
+                    continue
+                open_requests = [r for r in user[f"{kind}s"] if r["status"] in ("pending", "processing")]
+                if not open_requests:
+                    failed.append(user_id)
+                    continue
+                for request in open_requests:
+                    self._settle_one(user, kind, request, action)
+        return failed
+
+    def _settle_one(self, user, kind, request, action):
+        if action == "process":
+            request["status"] = "processing"
+        elif action == "reject":
+            request["status"] = "rejected"
+            if kind == "withdrawal":
+                # The amount was held when the withdrawal was requested
+                user["main"] = money(user["main"] + request["amount"])
+        else:
+            request["status"] = "approved"
+            if kind == "deposit":
+                bonus = 0.0
+                promo = PROMOTIONS.get(request["promoCode"] or "")
+                if promo:
+                    bonus = money(request["amount"] * promo["bonus"] / 100)
+                    self.add_turnover(user, (request["amount"] + bonus) * promo["turnover"], f"Promo:{request['promoCode']}")
+                user["main"] = money(user["main"] + request["amount"] + bonus)
+                user["paysum"] = money(user["paysum"] + request["amount"])
+
+    # Rebates
+
+    def calculate_rebate(self, user, month):
+        """Rebate of user for month: tier 1 on its own bets, tiers 2 and 3 on its downlines' bets."""
+        tiers = [("1", [user])]
+        t2_users = self.downlines(user["id"])
+        tiers.append(("2", t2_users))
+        tiers.append(("3", [t3 for t2 in t2_users for t3 in self.downlines(t2["id"])]))
+
+        amount = 0.0
+        for tier, tier_users in tiers:
+            for tier_user in tier_users:
+                for bet in tier_user["bets"]:
+                    if bet["date"].startswith(month):
+                        percent = REBATE_PERCENTAGES.get(bet["provider_id"], {}).get(tier, 0)
+                        amount += bet["amount"] * percent / 100
+        user["rebates"] = [r for r in user["rebates"] if r["month"] != month or r["status"] == "approved"]
+        user["rebates"].append({"month": month, "amount": money(amount), "status": "pending"})
+
+    # 4D
+
+    def fourd_history(self, user, is_won="", four_d_number="", page="", per_page=""):
+        records = [r for r in reversed(user["fourd_records"]) if not four_d_number or r["bet_number"] == four_d_number]
+        if is_won != "":
+            records = [r for r in records if r["is_won"] == int(is_won)]
+        page = int(page or 1)
+        per_page = int(per_page or 10)
+        start = (page - 1) * per_page
+        return {"current_page": page, "per_page": per_page, "total": len(records), "data": records[start:start + per_page]}
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Serves the BackOffice over HTTP/1.1 keep-alive, delaying each response by the configured latency."""
+
+    daemon_threads = True
+
+    def __init__(self, settings=STANDIN):
+        self.settings = settings
+        self.state_path = settings.get("state_path")
+        if self.state_path and not os.path.isabs(self.state_path):
+            self.state_path = os.path.join(PROJECT_ROOT, self.state_path)
+        self.backoffice = BackOffice(settings.get("maintenance_providers", ()))
+        if self.state_path:
+            self.backoffice.load(self.state_path)
+        self._thread = None
+        self._saver = None
+        self._saved_version = 0
+        self._save_lock = threading.Lock()
+        self._stopped = threading.Event()
+        super().__init__((settings["host"], settings["port"]), StandInHandler)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def latency_for(self, path):
+        """Seconds to hold a response: the [min, max] ms range of the longest matching route, else the default."""
+        latency = self.settings.get("latency", {})
+        routes = latency.get("routes", {})
+        matches = [route for route in routes if path.startswith(route)]
+        low, high = routes[max(matches, key=len)] if matches else latency.get("default", (0, 0))
+        return random.uniform(low, high) / 1000
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="standin", daemon=True)
+        self._thread.start()
+        if self.state_path:
+            # Accounts registered by an interrupted run must outlive it, as the account pool and token cache do
+            self._saver = threading.Thread(target=self._save_periodically, name="standin-saver", daemon=True)
+            self._saver.start()
+            atexit.register(self.save)
+        logger.info(f"Back-office stand-in listening on {self.url}")
+        return self
+
+    def save(self):
+        """Write the state if a request changed it since the last save."""
+        with self._save_lock:
+            if self.state_path and self.backoffice.version != self._saved_version:
+                self._saved_version = self.backoffice.save(self.state_path)
+
+    def _save_periodically(self):
+        while not self._stopped.wait(self.settings.get("save_interval", 5)):
+            try:
+                self.save()
+            except OSError as e:
+                logger.warning(f"Could not save stand-in state: {str(e)}")
+
+    def stop(self):
+        self._stopped.set()
+        self.shutdown()
+        self.server_close()
+        if self.state_path:
+            atexit.unregister(self.save)
+            self.save()
+        logger.info("Back-office stand-in stopped")
+
+
+ROUTES = []
+
+
+def route(method, pattern):
+    def register(handler):
+        ROUTES.append((method, re.compile(f"^{pattern}$"), handler))
+        return handler
+    return register
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY delayed ACKs add ~40ms to every response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def dispatch(self, method):
+        parsed = urlparse(self.path)
+        path = parsed.path.rstrip("/")
+        params = {key: values if key.endswith("[]") else values[-1]
+                  for key, values in parse_qs(parsed.query, keep_blank_values=True).items()}
+        params.update(self.read_body())
+
+        time.sleep(self.server.latency_for(path))
+        for route_method, pattern, handler in ROUTES:
+            if route_method == method and pattern.match(path):
+                try:
+                    with self.server.backoffice.lock:
+                        status, body = handler(self.server.backoffice, params, self.headers)
+                        # Reads bump it too; one spare save per interval is cheaper than tracking which routes write
+                        self.server.backoffice.version += 1
+                except StandInError as e:
+                    status, body = e.status, {"code": e.status, "message": str(e)}
+                break
+        else:
+            status, body = 404, {"code": 404, "message": f"{method} {path} is not implemented by the stand-in"}
+        self.respond(status, body)
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        body = self.rfile.read(length)
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("application/json"):
+            return json.loads(body or b"{}")
+        if content_type.startswith("multipart/form-data"):
+            message = email.message_from_bytes(
+                f"Content-Type: {content_type}\r\n\r\n".encode() + body, policy=email.policy.HTTP
+            )
+            fields = {}
+            for part in message.iter_parts():
+                payload = part.get_payload(decode=True)
+                fields[part.get_param("name", header="content-disposition")] = (
+                    payload if part.get_filename() else payload.decode("utf-8")
+                )
+            return fields
+        return {key: values[-1] for key, values in parse_qs(body.decode("utf-8"), keep_blank_values=True).items()}
+
+    def respond(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+def ok(data=None, message="success"):
+    return 200, {"code": 200, "message": message, "data": data}
+
+
+def require_pass(params):
+    if str(params.get("pass", params.get("passcode"))) not in QA_PASSES:
+        raise StandInError("Invalid pass", 403)
+
+
+# Accounts
+
+@route("POST", r"/api/(v2/)?login")
+def login(office, params, headers):
+    user = next((u for u in office.users.values() if u["username"] == params.get("username")), None)
+    if user is None or user["password"] != params.get("password"):
+        # The real back office answers bad credentials with HTTP 200 and a code in the body
+        return 200, {"code": 401, "message": "Invalid username or password"}
+    token = secrets.token_hex(20)
+    office.tokens[token] = user["id"]
+    return ok({"token": token})
+
+
+@route("POST", r"/api/v3/register")
+def register(office, params, headers):
+    username, password = params.get("username", ""), params.get("password", "")
+    if not re.fullmatch(r"[A-Za-z0-9]{3,12}", username):
+        raise StandInError("The username format is invalid.", 422)
+    if len(password) < 8 or password != params.get("password_confirmation"):
+        raise StandInError("The password format is invalid.", 422)
+    user = office.create_user(username, password, params.get("realname"), params.get("phone"))
+    return ok({"id": user["id"]}, "Registration successful")
+
+
+@route("GET", r"/api/user")
+def user_info(office, params, headers):
+    user = office.authenticate(headers)
+    vip = office.vip_level(user)
+    next_vip = next((level for level in VIP_LEVELS if float(level["recharge"]) > user["paysum"]), None)
+    return ok({
+        "id": user["id"], "username": user["username"], "realname": user["realname"], "phone": user["phone"],
+        "vip": vip["id"], "vipname": vip["vipname"], "paysum": f"{user['paysum']:.2f}",
+        "next_vip": next_vip["vipname"] if next_vip else None, "balance": user["main"],
+    })
+
+
+@route("GET", r"/api/uservip")
+def user_vip(office, params, headers):
+    office.authenticate(headers)
+    return ok(VIP_LEVELS)
+
+
+@route("GET", r"/api/qa-generate-user")
+def generate_downlines(office, params, headers):
+    require_pass(params)
+    upline = office.user(params.get("user_id"))
+
+    def create(parent):
+        suffix = secrets.token_hex(3)
+        user = office.create_user(f"QA{suffix}", f"Qa{suffix}A1", upline=parent["id"])
+        return {"id": user["id"], "username": user["username"], "password": user["password"]}
+
+    t2_users = [create(upline) for _ in range(int(params.get("t2") or 0))]
+    # Tier 3 users are spread over the new tier 2 users (or hang off the upline when there are none)
+    parents = [office.user(t2["id"]) for t2 in t2_users] or [upline]
+    t3_users = [create(parents[i % len(parents)]) for i in range(int(params.get("t3") or 0))]
+    return ok({"t2_users": t2_users, "t3_users": t3_users})
+
+
+# Deposits and withdrawals
+
+@route("GET", r"/api/depositInfo")
+def deposit_info(office, params, headers):
+    office.authenticate(headers)
+    return ok({
+        "banks": [{"id": 9, "name": "Maybank"}, {"id": 10, "name": "CIMB"}],
+        "popoPromo": [
+            {"optionCode": code, "optionName": promo["optionName"], "optionValue": promo["optionName"]}
+            for code, promo in PROMOTIONS.items()
+        ],
+    })
+
+
+@route("POST", r"/api/recharge")
+def recharge(office, params, headers):
+    user = office.authenticate(headers)
+    amount = money(params.get("amount") or 0)
+    if amount < MIN_DEPOSIT or amount > MAX_DEPOSIT:
+        raise StandInError(f"Deposit must be between RM{MIN_DEPOSIT} and RM{MAX_DEPOSIT}", 422)
+    if not params.get("attachment"):
+        raise StandInError("The attachment field is required.", 422)
+    promo_code = params.get("promoCode") or None
+    if promo_code and promo_code not in PROMOTIONS:
+        raise StandInError("Invalid promo code", 422)
+    deposit = {
+        "id": office._new_id(), "amount": amount, "promoCode": promo_code, "status": "pending",
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    user["deposits"].append(deposit)
+    return ok({"id": deposit["id"]})
+
+
+@route("POST", r"/api/withdraw")
+def withdraw(office, params, headers):
+    user = office.authenticate(headers)
+    amount = money(params.get("amount") or 0)
+    if amount < MIN_WITHDRAW:
+        return 200, {"code": 422, "message": f"Minimum withdrawal is RM{MIN_WITHDRAW}"}
+    if office.incomplete_turnover(user):
+        return 200, {"code": 422, "message": "Turnover requirement not met"}
+    if user["main"] < amount:
+        return 200, {"code": 422, "message": "Insufficient balance"}
+    user["main"] = money(user["main"] - amount)
+    withdrawal = {
+        "id": office._new_id(), "amount": amount, "bank": params.get("bank"), "status": "pending",
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    user["withdrawals"].append(withdrawal)
+    return ok({"id": withdrawal["id"]})
+
+
+def settle_route(kind, action):
+    def handler(office, params, headers):
+        require_pass(params)
+        user_ids = params.get("user_ids[]") or []
+        return ok({"failed_ids": office.settle(kind, user_ids, action)})
+    return handler
+
+
+for _segment, _kind in (("recharge", "deposit"), ("withdraw", "withdrawal")):
+    route("GET", rf"/api/{_segment}/approve")(settle_route(_kind, "approve"))
+    route("GET", rf"/api/{_segment}/refuse/batch")(settle_route(_kind, "reject"))
+    route("GET", rf"/api/{_segment}/process/batch")(settle_route(_kind, "process"))
+
+
+# Wallets
+
+@route("GET", r"/api/balance")
+def balance(office, params, headers):
+    return ok({"balance": office.authenticate(headers)["main"]})
+
+
+@route("GET", r"/api/transfers")
+def transfer_list(office, params, headers):
+    return ok({"accountList": office.account_list(office.authenticate(headers))})
+
+
+@route("POST", r"/api/transfers")
+def transfer(office, params, headers):
+    user = office.authenticate(headers)
+    try:
+        source_id, target_id = int(params.get("source_id")), int(params.get("target_id"))
+    except (TypeError, ValueError):
+        raise StandInError("source_id and target_id are required", 422)
+    office.transfer(user, source_id, target_id, params.get("amount") or 0)
+    return ok({"balance": user["main"]}, "Transfer successful")
+
+
+@route("POST", r"/api/revertAll")
+def revert_all(office, params, headers):
+    user = office.authenticate(headers)
+    for provider_id, credit in list(user["credits"].items()):
+        if credit > 0 and provider_id not in office.maintenance_providers:
+            office.transfer(user, provider_id, 0, credit)
+    return ok({"balance": user["main"]})
+
+
+# Turnover, bets and rebates
+
+@route("GET", r"/api/check-turnover")
+def check_turnover(office, params, headers):
+    require_pass(params)
+    # Unlike the other endpoints this one returns a bare list
+    return 200, office.user(params.get("user_id"))["turnovers"]
+
+
+@route("GET", r"/api/modify-turnover")
+def modify_turnover(office, params, headers):
+    require_pass(params)
+    user = office.user(params.get("user_id"))
+    turnover = next((t for t in user["turnovers"] if str(t["id"]) == str(params.get("turnover_id"))), None)
+    if turnover is None:
+        raise StandInError("Turnover not found", 404)
+    match str(params.get("action")):
+        case "1":
+            turnover["progress"] = turnover["target"]
+        case "0":
+            turnover["progress"] = 0.0
+        case "-1":
+            user["turnovers"].remove(turnover)
+        case action:
+            raise StandInError(f"Unknown action {action}", 422)
+    return ok()
+
+
+@route("GET", r"/api/simulate-game-records")
+def simulate_game_records(office, params, headers):
+    require_pass(params)
+    user = office.user(params.get("user_id"))
+    amount = money(params.get("amount") or 0)
+    user["bets"].append({
+        "provider_id": int(params.get("provider_id") or 0), "amount": amount, "type": params.get("type"),
+        "date": params.get("game_record_date") or datetime.now().strftime("%Y-%m-%d"),
+    })
+    office.add_bet(user, amount)
+    return ok()
+
+
+@route("GET", r"/api/simulate-checkin")
+def simulate_checkin(office, params, headers):
+    require_pass(params)
+    user = office.user(params.get("user_id"))
+    user["checkin_days"] = int(params.get("days") or 0)
+    return ok({"days": user["checkin_days"]})
+
+
+@route("GET", r"/api/simulate-daily-mission")
+def simulate_daily_mission(office, params, headers):
+    require_pass(params)
+    office.user(params.get("user_id"))
+    return ok()
+
+
+@route("GET", r"/api/qa-rebate-list")
+def rebate_list(office, params, headers):
+    require_pass(params)
+    return ok([{"provider_id": provider_id, "rebate_percentage": percentages}
+               for provider_id, percentages in REBATE_PERCENTAGES.items()])
+
+
+@route("GET", r"/api/qa-calculate-rebate")
+def calculate_rebate(office, params, headers):
+    require_pass(params)
+    month = params.get("month") or datetime.now().strftime("%Y-%m")
+    for user_id in str(params.get("user_ids", "")).split(","):
+        office.calculate_rebate(office.user(user_id), month)
+    return ok()
+
+
+@route("GET", r"/api/qa-approve-rebate")
+def approve_rebate(office, params, headers):
+    require_pass(params)
+    for user_id in str(params.get("user_ids", "")).split(","):
+        user = office.user(user_id)
+        for rebate in user["rebates"]:
+            if rebate["status"] == "pending":
+                rebate["status"] = "approved"
+                user["main"] = money(user["main"] + rebate["amount"])
+    return ok()
+
+
+# 4D
+
+@route("POST", r"/api/qa-redeem-fourd-card")
+def redeem_fourd_card(office, params, headers):
+    require_pass(params)
+    user = office.user(params.get("user_id"))
+    user["fourd_cards"] = money(user["fourd_cards"] + float(params.get("amount") or 0))
+    return ok({"cards": user["fourd_cards"]})
+
+
+@route("POST", r"/api/qa-bet-fourd")
+def bet_fourd(office, params, headers):
+    require_pass(params)
+    user = office.user(params.get("user_id"))
+    stakes = {size: money(params.get(size) or 0) for size in ("B", "S", "SA", "SB", "SC", "SD", "SE")}
+    amount = money(sum(stakes.values()))
+    if amount <= 0:
+        raise StandInError("No bet amount", 422)
+    # 4D cards are spent first, the rest comes out of the main wallet
+    from_cards = min(user["fourd_cards"], amount)
+    if user["main"] < amount - from_cards:
+        raise StandInError("Insufficient balance", 422)
+    user["fourd_cards"] = money(user["fourd_cards"] - from_cards)
+    user["main"] = money(user["main"] - (amount - from_cards))
+    record = {
+        "id": office._new_id(), "bet_number": params.get("bet_number"), "bet_dates": params.get("bet_dates"),
+        "bet_platforms": params.get("bet_platforms"), "source": params.get("source"), "type": params.get("type"),
+        **stakes, "amount": amount, "is_won": 0, "win_amount": 0.0, "status": "pending",
+        "created_at": params.get("user_bet_time") or datetime.now().isoformat(timespec="seconds"),
+    }
+    user["fourd_records"].append(record)
+    return ok({"id": record["id"]})
+
+
+@route("POST", r"/api/qa-update-bet-result")
+def update_bet_result(office, params, headers):
+    require_pass(params)
+    user = next((u for u in office.users.values() if u["username"] == params.get("username")), None)
+    if user is None:
+        raise StandInError("User not found", 404)
+    record = next((r for r in user["fourd_records"] if str(r["id"]) == str(params.get("betRecordId"))), None)
+    if record is None:
+        raise StandInError("Bet record not found", 404)
+    won = params.get("action") == "win"
+    record.update(is_won=int(won), status="won" if won else "lost", win_amount=money(params.get("amount") or 0) if won else 0.0)
+    if won:
+        user["main"] = money(user["main"] + record["win_amount"])
+    return ok(record)
+
+
+@route("POST", r"/api/user-4d-records-history")
+def fourd_history(office, params, headers):
+    user = office.authenticate(headers)
+    return ok(office.fourd_history(
+        user, is_won=params.get("is_won", ""), four_d_number=params.get("four_d_number", ""),
+        page=params.get("page", ""), per_page=params.get("per_page", "")
+    ))
+
+
+def start_standin(settings=STANDIN):
+    """Start the stand-in on a background thread of this process; worker processes reach it over HTTP."""
+    return StandInServer(settings).start()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    server = StandInServer()
+    logger.info(f"Back-office stand-in listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.save()
@@ -0,0 +1,384 @@
+import functools
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import statistics
+import threading
+import time
+import uuid
+from contextlib import closing, contextmanager
+from config.constant import TIMING, PROFILER, TRACING
+from utils.tracing import Tracer, span, trace_scope
+
+logger = logging.getLogger(__name__)
+
+# Keeps the timing wrappers out of test failure tracebacks, like unittest's own frames
+__unittest = True
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CATEGORIES = ("browser", "network", "sleep")
+PHASES = ("setup", "body", "teardown")
+
+# One id per python process tree; workers inherit it through the environment so a sharded run shares it
+RUN_ID = os.environ.setdefault("QA_RUN_ID", uuid.uuid4().hex[:12])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS test_durations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    test_id TEXT NOT NULL,
+    language TEXT,
+    browser TEXT,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    setup REAL NOT NULL,
+    body REAL NOT NULL,
+    teardown REAL NOT NULL,
+    total REAL NOT NULL,
+    browser_time REAL NOT NULL,
+    network_time REAL NOT NULL,
+    sleep_time REAL NOT NULL,
+    helpers TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_test_durations_test ON test_durations (test_id, language, browser, started_at);
+"""
+
+
+class TestTiming:
+    """Wall-clock for one test, split by phase, by category (outermost wins, so nothing is counted twice)
+    and by top-level BaseTest helper."""
+
+    def __init__(self, test_id, language=None, browser=None):
+        self.test_id = test_id
+        self.language = language
+        self.browser = browser
+        self.started_at = time.time()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.categories = dict.fromkeys(CATEGORIES, 0.0)
+        self.helpers = {}
+        self.category_depth = 0
+        self.helper_depth = 0
+        # Innermost helper last; the command profiler tags wire commands with it
+        self.helper_stack = []
+        # (command, helper, seconds) per WebDriver wire command when the profiler is on, else None
+        self.commands = None
+
+    @property
+    def total(self):
+        return sum(self.phases.values())
+
+    def add_helper(self, name, elapsed):
+        calls, seconds = self.helpers.get(name, (0, 0.0))
+        self.helpers[name] = (calls + 1, seconds + elapsed)
+
+
+_local = threading.local()
+
+
+def current_timing():
+    return getattr(_local, "timing", None)
+
+
+@contextmanager
+def timing_scope(timing):
+    _local.timing = timing
+    try:
+        yield timing
+    finally:
+        _local.timing = None
+
+
+@contextmanager
+def measure_phase(phase):
+    timing = current_timing()
+    start = time.perf_counter()
+    try:
+        with span(phase, "phase"):
+            yield
+    finally:
+        if timing is not None:
+            timing.phases[phase] += time.perf_counter() - start
+
+
+@contextmanager
+def measure(category):
+    """Attribute the enclosed time to category unless an enclosing measure() already claims it."""
+    timing = current_timing()
+    if timing is None or timing.category_depth:
+        yield
+        return
+
+    timing.category_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.category_depth -= 1
+        timing.categories[category] += time.perf_counter() - start
+
+
+def timed_helper(func):
+    """Record the wall-clock of a helper when it is called directly from a test, not from another helper."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        timing = current_timing()
+        if timing is None:
+            return func(*args, **kwargs)
+
+        timing.helper_depth += 1
+        timing.helper_stack.append(func.__name__)
+        start = time.perf_counter()
+        try:
+            with span(func.__name__, "helper"):
+                return func(*args, **kwargs)
+        finally:
+            timing.helper_depth -= 1
+            timing.helper_stack.pop()
+            if not timing.helper_depth:
+                timing.add_helper(func.__name__, time.perf_counter() - start)
+
+    return wrapper
+
+
+def instrument_helpers(cls):
+    """Wrap the public, non-test methods defined on cls with timed_helper. Generators are left alone, since
+    their body runs after the wrapper has returned."""
+    for name, value in list(vars(cls).items()):
+        if (
+            inspect.isfunction(value) and not inspect.isgeneratorfunction(value)
+            and not name.startswith(("_", "test")) and name not in ("setUp", "tearDown", "run")
+        ):
+            setattr(cls, name, timed_helper(value))
+    return cls
+
+
+def instrument_driver(driver):
+    """Count time spent in WebDriver commands as browser time. Safe to call again on a pooled driver."""
+    if getattr(driver, "_qa_timed", False):
+        return driver
+    execute = driver.execute
+
+    @functools.wraps(execute)
+    def timed_execute(*args, **kwargs):
+        with measure("browser"):
+            return execute(*args, **kwargs)
+
+    driver.execute = timed_execute
+    driver._qa_timed = True
+    return driver
+
+
+_original_sleep = time.sleep
+
+
+def _timed_sleep(seconds):
+    with measure("sleep"), span("sleep", "sleep", {"seconds": seconds}):
+        _original_sleep(seconds)
+
+
+def instrument_sleep():
+    """Route time.sleep through measure("sleep"); calls outside a timed test pass straight through."""
+    time.sleep = _timed_sleep
+
+
+class DurationStore:
+    """Append-only SQLite history of test timings. Rows are only ever inserted; queries read recent history."""
+
+    def __init__(self, path):
+        self.path = path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def record(self, timing, status):
+        helpers = {name: {"calls": calls, "seconds": round(seconds, 3)} for name, (calls, seconds) in timing.helpers.items()}
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO test_durations (run_id, test_id, language, browser, status, started_at, setup, body, "
+                "teardown, total, browser_time, network_time, sleep_time, helpers) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    RUN_ID, timing.test_id, timing.language, timing.browser, status, timing.started_at,
+                    timing.phases["setup"], timing.phases["body"], timing.phases["teardown"], timing.total,
+                    timing.categories["browser"], timing.categories["network"], timing.categories["sleep"],
+                    json.dumps(helpers)
+                )
+            )
+
+    def _history(self, conn, language=None, browser=None, exclude_run=None):
+        query = "SELECT * FROM test_durations WHERE status = 'PASS'"
+        params = []
+        if language:
+            query += " AND language = ?"
+            params.append(language)
+        if browser:
+            query += " AND browser = ?"
+            params.append(browser)
+        if exclude_run:
+            query += " AND run_id != ?"
+            params.append(exclude_run)
+        return conn.execute(query + " ORDER BY started_at DESC", params).fetchall()
+
+    def median_durations(self, language=None, browser=None, last_n=None):
+        """Return {test_id: median total seconds} over the last_n passing runs of each test."""
+        last_n = last_n or TIMING["history_runs"]
+        samples = {}
+        with closing(self._connect()) as conn:
+            for row in self._history(conn, language, browser):
+                runs = samples.setdefault(row["test_id"], [])
+                if len(runs) < last_n:
+                    runs.append(row["total"])
+        return {test_id: statistics.median(runs) for test_id, runs in samples.items()}
+
+    def regressions(self, run_id=RUN_ID, language=None, browser=None, threshold=None, min_seconds=None):
+        """Return tests from run_id that took threshold times longer than their historical median."""
+        threshold = threshold or TIMING["regression_ratio"]
+        min_seconds = min_seconds if min_seconds is not None else TIMING["regression_min_seconds"]
+        with closing(self._connect()) as conn:
+            current = conn.execute(
+                "SELECT test_id, language, browser, total FROM test_durations WHERE run_id = ? AND status = 'PASS'",
+                (run_id,)
+            ).fetchall()
+            history = {}
+            for row in self._history(conn, language, browser, exclude_run=run_id):
+                runs = history.setdefault((row["test_id"], row["language"], row["browser"]), [])
+                if len(runs) < TIMING["history_runs"]:
+                    runs.append(row["total"])
+
+        slower = []
+        for row in current:
+            runs = history.get((row["test_id"], row["language"], row["browser"]))
+            if not runs:
+                continue
+            baseline = statistics.median(runs)
+            if row["total"] - baseline >= min_seconds and row["total"] >= baseline * threshold:
+                slower.append({
+                    "test_id": row["test_id"], "language": row["language"], "browser": row["browser"],
+                    "seconds": round(row["total"], 2), "baseline": round(baseline, 2),
+                    "ratio": round(row["total"] / baseline, 2) if baseline else None
+                })
+        return sorted(slower, key=lambda item: item["seconds"] - item["baseline"], reverse=True)
+
+    def helper_totals(self, since=None, limit=20):
+        """Return the BaseTest helpers with the largest total wall-clock since the given timestamp."""
+        since = since or time.time() - TIMING["helper_window_days"] * 86400
+        totals = {}
+        with closing(self._connect()) as conn:
+            for row in conn.execute("SELECT helpers FROM test_durations WHERE started_at >= ?", (since,)):
+                for name, stats in json.loads(row["helpers"]).items():
+                    total = totals.setdefault(name, {"calls": 0, "seconds": 0.0})
+                    total["calls"] += stats["calls"]
+                    total["seconds"] += stats["seconds"]
+        ranked = sorted(totals.items(), key=lambda item: item[1]["seconds"], reverse=True)
+        return [{"helper": name, "calls": stats["calls"], "seconds": round(stats["seconds"], 2)} for name, stats in ranked[:limit]]
+
+    def latest_run_id(self):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT run_id FROM test_durations ORDER BY started_at DESC LIMIT 1").fetchone()
+        return row["run_id"] if row else None
+
+    def category_totals(self, run_id=RUN_ID):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT SUM(total) AS total, SUM(browser_time) AS browser, SUM(network_time) AS network, "
+                "SUM(sleep_time) AS sleep FROM test_durations WHERE run_id = ?",
+                (run_id,)
+            ).fetchone()
+        return {key: round(row[key] or 0.0, 2) for key in ("total", "browser", "network", "sleep")}
+
+
+class TimedTestMixin:
+    """TestCase mixin that times setUp, the test body and tearDown and appends the result to the duration store."""
+
+    def run(self, result=None):
+        if not TIMING["enabled"] or result is None:
+            return super().run(result)
+
+        instrument_sleep()
+        counts = (len(result.errors), len(result.failures), len(result.skipped))
+        timing = TestTiming(self.id(), getattr(self, "language", None), getattr(self, "browser", None))
+        if PROFILER["enabled"]:
+            timing.commands = []
+        # Kept on the test so result handlers can read the breakdown while the test is being reported
+        self.timing = timing
+        tracer = Tracer(self.id(), timing.language, timing.browser, RUN_ID) if TRACING["enabled"] else None
+        if tracer is not None:
+            # Files written after the test, listed now so its result record can point at them
+            self.artifacts = list(tracer.paths().values())
+        with timing_scope(timing):
+            if tracer is None:
+                outcome = super().run(result)
+            else:
+                with trace_scope(tracer):
+                    outcome = super().run(result)
+
+        if len(result.errors) > counts[0]:
+            status = "ERROR"
+        elif len(result.failures) > counts[1]:
+            status = "FAILURE"
+        elif len(result.skipped) > counts[2]:
+            status = "SKIP"
+        else:
+            status = "PASS"
+
+        try:
+            get_duration_store().record(timing, status)
+        except Exception as e:
+            logger.warning(f"Failed to record duration for {self.id()}: {str(e)}")
+        if tracer is not None:
+            try:
+                tracer.export()
+            except OSError as e:
+                logger.warning(f"Failed to write trace for {self.id()}: {str(e)}")
+        return outcome
+
+    # unittest's per-phase hooks
+    def _callSetUp(self):
+        with measure_phase("setup"):
+            super()._callSetUp()
+
+    def _callTestMethod(self, method):
+        with measure_phase("body"):
+            super()._callTestMethod(method)
+
+    def _callTearDown(self):
+        with measure_phase("teardown"):
+            super()._callTearDown()
+
+
+_store = None
+_store_pid = None
+_store_lock = threading.Lock()
+
+
+def get_duration_store():
+    global _store, _store_pid
+    with _store_lock:
+        if _store is None or _store_pid != os.getpid():
+            _store = DurationStore(TIMING["path"])
+            _store_pid = os.getpid()
+        return _store
+
+
+if __name__ == "__main__":
+    store = get_duration_store()
+    print("Slowest tests (median seconds):")
+    for test_id, seconds in sorted(store.median_durations().items(), key=lambda item: item[1], reverse=True)[:20]:
+        print(f"  {seconds:8.1f}  {test_id}")
+    run_id = store.latest_run_id()
+    print(f"\nRegressions in run {run_id}:")
+    for item in store.regressions(run_id=run_id):
+        print(f"  {item['seconds']:8.1f}s vs {item['baseline']:.1f}s  {item['test_id']} [{item['language']}/{item['browser']}]")
+    print(f"\nTime split for run {run_id}: {store.category_totals(run_id)}")
+    print("\nHelpers by total wall-clock:")
+    for helper in store.helper_totals():
+        print(f"  {helper['seconds']:8.1f}s  {helper['calls']:5d} calls  {helper['helper']}")
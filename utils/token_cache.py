@@ -0,0 +1,217 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from config.constant import TOKEN_CACHE
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def token_expiry(token, issued_at, default_ttl):
+    """Return the token's expiry timestamp: the JWT "exp" claim when present, else issued_at + default_ttl."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        if exp:
+            return float(exp)
+    except (IndexError, ValueError, AttributeError):
+        pass
+    return issued_at + default_ttl
+
+
+class TokenCache:
+    """Auth tokens keyed by (base_url, username), shared between threads in memory and between
+    worker processes through a locked JSON file. Tokens are refreshed refresh_margin seconds before expiry."""
+
+    def __init__(self, path, default_ttl=3600, refresh_margin=300):
+        self.path = path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+        self.lock_path = f"{self.path}.lock"
+        self.user_lock_dir = f"{self.path}.locks"
+        self.default_ttl = default_ttl
+        self.refresh_margin = refresh_margin
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        # Token -> (base_url, username, password) of every token handed out, so a rejected one can be renewed
+        self._owners = {}
+        os.makedirs(self.user_lock_dir, exist_ok=True)
+
+    def get_token(self, base_url, username, password, fetch):
+        """Return a valid token for the user, calling fetch() to log in only on a miss or near expiry.
+
+        fetch must return the token string or None; None is never cached.
+        """
+        token = self._get_token(base_url, username, password, fetch)
+        if token:
+            with self._lock:
+                self._owners[token] = (base_url, username, password)
+        return token
+
+    def renew(self, stale_token, fetch_for):
+        """Replace a token the server rejected (401) with a fresh login of its owner.
+
+        fetch_for(base_url, username, password) returns the fetch for get_token. Returns the new token, or None
+        if this cache never handed out stale_token or the login fails. When several threads hit the same 401,
+        only the first logs in again; the others get its token.
+        """
+        with self._lock:
+            owner = self._owners.get(stale_token)
+        if owner is None:
+            return None
+        base_url, username, password = owner
+        logger.info(f"Token of {username} was rejected, logging in again")
+        self.invalidate(base_url, username, token=stale_token)
+        return self.get_token(base_url, username, password, fetch_for(base_url, username, password))
+
+    def _get_token(self, base_url, username, password, fetch):
+        key = self._key(base_url, username)
+        fingerprint = self._fingerprint(password)
+
+        token = self._lookup(key, fingerprint)
+        if token:
+            return token
+
+        # One login per user at a time: other threads wait on the key lock, other processes on the user's lock file
+        with self._key_lock(key), self._file_lock(self._user_lock_path(key)):
+            token = self._lookup(key, fingerprint)
+            if token:
+                return token
+
+            with self._file_lock(self.lock_path):
+                entry = self._read_file().get(key)
+            if self._is_fresh(entry, fingerprint):
+                with self._lock:
+                    self._entries[key] = entry
+                return entry["token"]
+
+            token = fetch()
+            if not token:
+                return None
+
+            entry = {
+                "token": token,
+                "password": fingerprint,
+                "expires_at": token_expiry(token, time.time(), self.default_ttl),
+            }
+            with self._file_lock(self.lock_path):
+                entries = self._read_file()
+                entries[key] = entry
+                self._write_file(entries)
+
+            with self._lock:
+                self._entries[key] = entry
+            logger.info(f"Cached token for {username}")
+            return token
+
+    def invalidate(self, base_url, username, token=None):
+        """Drop the user's token, e.g. after a 401 or a password change. With token, only drop it if it is
+        still the cached one, so a token another worker already renewed survives."""
+        key = self._key(base_url, username)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and token in (None, entry["token"]):
+                del self._entries[key]
+        with self._file_lock(self.lock_path):
+            entries = self._read_file()
+            entry = entries.get(key)
+            if entry is not None and token in (None, entry["token"]):
+                del entries[key]
+                self._write_file(entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        with self._file_lock(self.lock_path):
+            self._write_file({})
+
+    def _lookup(self, key, fingerprint):
+        with self._lock:
+            entry = self._entries.get(key)
+        if self._is_fresh(entry, fingerprint):
+            return entry["token"]
+        return None
+
+    def _is_fresh(self, entry, fingerprint):
+        return (
+            entry is not None and entry.get("password") == fingerprint
+            and entry["expires_at"] - self.refresh_margin > time.time()
+        )
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _user_lock_path(self, key):
+        return os.path.join(self.user_lock_dir, f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.lock")
+
+    @contextmanager
+    def _file_lock(self, path):
+        with open(path, "a+") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read_file(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_file(self, entries):
+        now = time.time()
+        entries = {key: entry for key, entry in entries.items() if entry["expires_at"] > now}
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _key(base_url, username):
+        return f"{base_url.rstrip('/')}|{username}"
+
+    @staticmethod
+    def _fingerprint(password):
+        # Only a hash is written to disk; a changed password must not be served the old user's token
+        return hashlib.sha256(str(password).encode("utf-8")).hexdigest()
+
+
+_cache = None
+_cache_pid = None
+_cache_lock = threading.Lock()
+
+
+def get_token_cache():
+    """Return the cache for the current process; tokens from other workers are picked up via the file."""
+    global _cache, _cache_pid
+    with _cache_lock:
+        if _cache is None or _cache_pid != os.getpid():
+            _cache = TokenCache(
+                TOKEN_CACHE["path"], default_ttl=TOKEN_CACHE["default_ttl"],
+                refresh_margin=TOKEN_CACHE["refresh_margin"]
+            )
+            _cache_pid = os.getpid()
+        return _cache
@@ -0,0 +1,124 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from config.constant import TRACING
+
+logger = logging.getLogger(__name__)
+
+# Keeps the span wrappers out of test failure tracebacks
+__unittest = True
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Tracer:
+    """Nested spans for one test. Exports Chrome trace-event JSON (chrome://tracing, Perfetto, speedscope)
+    and collapsed stacks for flamegraph.pl / speedscope."""
+
+    def __init__(self, test_id, language=None, browser=None, run_id=None):
+        self.test_id = test_id
+        self.language = language
+        self.browser = browser
+        self.run_id = run_id
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        # Completed spans as (stack, category, start, duration, args); stack is the tuple of names down to the span
+        self.spans = []
+        self.stack = []
+
+    @contextmanager
+    def span(self, name, category, args=None):
+        self.stack.append(name)
+        stack = tuple(self.stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((stack, category, start - self.origin, time.perf_counter() - start, args))
+            self.stack.pop()
+
+    def chrome_events(self):
+        tid = threading.get_ident()
+        events = [{"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": self.test_id}}]
+        for stack, category, start, duration, args in sorted(self.spans, key=lambda span: (span[2], -span[3])):
+            event = {
+                "name": stack[-1], "cat": category, "ph": "X", "pid": self.pid, "tid": tid,
+                "ts": round(start * 1e6, 1), "dur": round(duration * 1e6, 1)
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def collapsed_stacks(self):
+        """Self time per stack in milliseconds, one "a;b;c <ms>" line per distinct stack."""
+        self_time = {}
+        for stack, _, _, duration, _ in self.spans:
+            self_time[stack] = self_time.get(stack, 0.0) + duration
+            if len(stack) > 1:
+                self_time[stack[:-1]] = self_time.get(stack[:-1], 0.0) - duration
+        lines = []
+        for stack, seconds in sorted(self_time.items()):
+            milliseconds = round(seconds * 1000)
+            if milliseconds > 0:
+                lines.append(f"{';'.join(name.replace(';', ',') for name in stack)} {milliseconds}")
+        return "\n".join(lines) + "\n"
+
+    def paths(self, directory=None):
+        """The files export() writes, by format; known before the test ends so results can point at them.
+
+        Named after the test, language, browser and run, so the (language, browser) processes of a run and later
+        runs never overwrite each other's traces.
+        """
+        directory = directory or TRACING["directory"]
+        if not os.path.isabs(directory):
+            directory = os.path.join(PROJECT_ROOT, directory)
+        name = "_".join(part for part in (self.test_id, self.language, self.browser, self.run_id) if part)
+        base = os.path.join(directory, re.sub(r"[^\w.-]", "_", name))
+        suffixes = {"chrome": ".trace.json", "collapsed": ".folded"}
+        return {fmt: f"{base}{suffixes[fmt]}" for fmt in TRACING["formats"] if fmt in suffixes}
+
+    def export(self, directory=None):
+        paths = self.paths(directory)
+        if paths:
+            os.makedirs(os.path.dirname(next(iter(paths.values()))), exist_ok=True)
+
+        if "chrome" in paths:
+            with open(paths["chrome"], "w", encoding="utf-8") as f:
+                json.dump(self.chrome_events(), f)
+        if "collapsed" in paths:
+            with open(paths["collapsed"], "w", encoding="utf-8") as f:
+                f.write(self.collapsed_stacks())
+        return list(paths.values())
+
+
+_local = threading.local()
+
+
+def current_tracer():
+    return getattr(_local, "tracer", None)
+
+
+@contextmanager
+def trace_scope(tracer):
+    _local.tracer = tracer
+    try:
+        with tracer.span(tracer.test_id, "test"):
+            yield tracer
+    finally:
+        _local.tracer = None
+
+
+@contextmanager
+def span(name, category, args=None):
+    """Open a span on the current thread's tracer; a no-op outside a traced test."""
+    tracer = current_tracer()
+    if tracer is None:
+        yield
+        return
+    with tracer.span(name, category, args):
+        yield
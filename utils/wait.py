@@ -0,0 +1,110 @@
+import logging
+import time
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+from config.constant import WAIT_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+# Installed once per page: counts in-flight XHR/fetch calls and timestamps structural DOM changes.
+# Attribute mutations are ignored so banner carousels and spinners do not keep the page "busy".
+PAGE_STATE_SCRIPT = """
+if (!window.__qaWaitState) {
+    const state = {pending: 0, lastMutation: Date.now()};
+    window.__qaWaitState = state;
+    const done = () => { state.pending = Math.max(0, state.pending - 1); };
+
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        state.pending++;
+        this.addEventListener('loadend', done, {once: true});
+        return originalSend.apply(this, arguments);
+    };
+
+    if (window.fetch) {
+        const originalFetch = window.fetch;
+        window.fetch = function() {
+            state.pending++;
+            return originalFetch.apply(this, arguments).finally(done);
+        };
+    }
+
+    new MutationObserver(() => { state.lastMutation = Date.now(); })
+        .observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+}
+
+const state = window.__qaWaitState;
+const popup = document.querySelector('.swal2-popup');
+const swalAnimating = !!document.querySelector('.swal2-hide, .swal2-backdrop-hide') || !!(
+    popup && popup.getAnimations &&
+    popup.getAnimations({subtree: true}).some(animation => animation.playState === 'running')
+);
+
+return {
+    ready: document.readyState === 'complete',
+    pending: state.pending,
+    quiet_for: Date.now() - state.lastMutation,
+    swal_animating: swalAnimating
+};
+"""
+
+ELEMENT_RECT_SCRIPT = """
+const rect = arguments[0].getBoundingClientRect();
+return [rect.x, rect.y, rect.width, rect.height];
+"""
+
+
+class AdaptiveWait:
+    """Condition-based replacement for fixed sleeps, bounded by a timeout."""
+
+    def __init__(self, driver, quiet_ms=None, stable_ms=None, poll_interval=None):
+        self.driver = driver
+        self.quiet_ms = quiet_ms if quiet_ms is not None else WAIT_SETTINGS["dom_quiet_ms"]
+        self.stable_ms = stable_ms if stable_ms is not None else WAIT_SETTINGS["stable_ms"]
+        self.poll_interval = poll_interval if poll_interval is not None else WAIT_SETTINGS["poll_interval"]
+
+    def page_state(self):
+        return self.driver.execute_script(PAGE_STATE_SCRIPT)
+
+    def _is_settled(self, driver):
+        try:
+            state = self.page_state()
+        except WebDriverException:
+            # Page is mid-navigation or an alert is open; keep polling until the timeout
+            return False
+        return (
+            state["ready"] and state["pending"] == 0 and state["quiet_for"] >= self.quiet_ms
+            and not state["swal_animating"]
+        )
+
+    def settle(self, timeout):
+        """Wait until the document is loaded, no XHR/fetch is pending, the DOM is quiet
+        and no SweetAlert popup is animating. Returns the seconds spent waiting."""
+        start = time.monotonic()
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=self.poll_interval).until(self._is_settled)
+        except TimeoutException:
+            logger.debug(f"Page did not settle within {timeout}s, continuing")
+        return time.monotonic() - start
+
+    def element_stable(self, element, timeout):
+        """Wait until element keeps the same position and size for stable_ms. Returns the seconds spent waiting."""
+        start = time.monotonic()
+        last_rect = None
+        stable_since = None
+
+        while time.monotonic() - start < timeout:
+            try:
+                rect = self.driver.execute_script(ELEMENT_RECT_SCRIPT, element)
+            except WebDriverException:
+                break
+
+            now = time.monotonic()
+            if rect != last_rect:
+                last_rect = rect
+                stable_since = now
+            elif (now - stable_since) * 1000 >= self.stable_ms:
+                break
+            time.sleep(self.poll_interval)
+
+        return time.monotonic() - start